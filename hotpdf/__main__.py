@@ -0,0 +1,5 @@
+import sys
+
+from hotpdf.cli import main
+
+sys.exit(main())
@@ -0,0 +1,69 @@
+import io
+from mmap import mmap
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from _typeshed import WriteableBuffer
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over an in-memory buffer.
+
+    Reads slice a memoryview of the buffer, so the document is never copied as a whole:
+    only the chunks the parser asks for are materialised. Works with bytes, bytearray,
+    memoryview and mmap objects.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap]) -> None:
+        super().__init__()
+        self.__view = memoryview(buffer).cast("B")
+        self.__position = 0
+
+    def __len__(self) -> int:
+        return len(self.__view)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.__position + offset
+        elif whence == io.SEEK_END:
+            position = len(self.__view) + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self.__position = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        start = min(self.__position, len(self.__view))
+        end = len(self.__view) if size is None or size < 0 else min(start + size, len(self.__view))
+        self.__position = end
+        return self.__view[start:end].tobytes()
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer: "WriteableBuffer") -> int:
+        target = memoryview(buffer).cast("B")
+        start = min(self.__position, len(self.__view))
+        size = min(len(target), len(self.__view) - start)
+        target[:size] = self.__view[start : start + size]
+        self.__position = start + size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            # Release the view first so the underlying mmap can be closed by its owner.
+            self.__view.release()
+        super().close()
@@ -0,0 +1,248 @@
+"""hotpdf command-line tool.
+
+Runs one query over many PDF files and streams one JSON object per file to stdout (JSON Lines),
+in the order the files finish. Files are processed in parallel worker processes with --workers.
+With --timeout, --max-rss or --max-tasks-per-child, files run in supervised workers (see
+hotpdf.pool.DocumentPool) so a pathological file fails on its own instead of stalling the batch.
+
+Examples:
+    hotpdf text statements/ --pages 0-2 --workers 8 > text.jsonl
+    hotpdf find IBAN statements/ --take-span
+    hotpdf extract-bbox 0 0 300 100 statement.pdf
+    hotpdf spans 0 0 300 100 statement.pdf --laparam char_margin=1.5
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .hotpdf import HotPdf
+from .page_cache import PageCache
+from .pool import DocumentPool
+
+Record = dict[str, Any]
+
+
+def _parse_pages(value: str) -> list[int]:
+    """Parse a page selection such as "0,2,5-7" into page numbers (0-indexed)."""
+    pages: list[int] = []
+    try:
+        for part in value.split(","):
+            first, _, last = part.partition("-")
+            pages.extend(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid page range: {value}") from None
+    return pages
+
+
+def _parse_laparam(value: str) -> tuple[str, Union[float, bool]]:
+    """Parse a KEY=VALUE layout parameter. VALUE is a number, or true/false."""
+    key, separator, raw_value = value.partition("=")
+    if not separator or not key:
+        raise argparse.ArgumentTypeError(f"Invalid layout parameter: {value}")
+    if raw_value.lower() in ("true", "false"):
+        return key, raw_value.lower() == "true"
+    try:
+        return key, float(raw_value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid layout parameter: {value}") from None
+
+
+def _iter_pdf_files(paths: Iterable[str]) -> Iterator[str]:
+    """Yield the given files, and every .pdf file under the given directories in sorted order."""
+    for path in paths:
+        if Path(path).is_dir():
+            yield from (
+                str(pdf_file) for pdf_file in sorted(Path(path).rglob("*")) if pdf_file.suffix.lower() == ".pdf"
+            )
+        else:
+            yield path
+
+
+def _bbox(args: argparse.Namespace) -> tuple[int, int, int, int]:
+    return args.x0, args.y0, args.x1, args.y1
+
+
+def _text(hotpdf: HotPdf, page: int, args: argparse.Namespace) -> list[Record]:
+    return [{"text": hotpdf.extract_page_text(page, segment=args.segment)}]
+
+
+def _extract_bbox(hotpdf: HotPdf, page: int, args: argparse.Namespace) -> list[Record]:
+    return [{"text": hotpdf.extract_text(*_bbox(args), page=page)}]
+
+
+def _spans(hotpdf: HotPdf, page: int, args: argparse.Namespace) -> list[Record]:
+    records: list[Record] = []
+    for span in hotpdf.extract_spans(*_bbox(args), page=page):
+        dimension = span.get_element_dimension()
+        records.append({
+            "span_id": span.span_id,
+            "text": span.to_text(),
+            "x0": dimension.x0,
+            "y0": dimension.y0,
+            "x1": dimension.x1,
+            "y1": dimension.y1,
+        })
+    return records
+
+
+def _find(hotpdf: HotPdf, page: int, args: argparse.Namespace) -> list[Record]:
+    return [
+        {"text": match.text, "x0": match.x0, "y0": match.y0, "x1": match.x1, "y1": match.y1}
+        for match in hotpdf.find_matches(
+            args.query, pages=[page], take_span=args.take_span, case_sensitive=not args.ignore_case
+        )
+    ]
+
+
+_COMMANDS = {"text": _text, "find": _find, "extract-bbox": _extract_bbox, "spans": _spans}
+# Indexes each command reads, so files are loaded without the others.
+_INDEXES = {"text": {"grid"}, "find": {"search", "spans"}, "extract-bbox": {"grid"}, "spans": {"spans"}}
+# Pages shared by content fingerprint across the files processed by this process, with --dedupe-pages.
+# Bounded, since cached pages stay in memory after their file is done.
+_PAGE_CACHE = PageCache(max_pages=128)
+
+
+def _load_options(args: argparse.Namespace) -> dict[str, Any]:
+    return {
+        "password": args.password,
+        "page_numbers": args.pages,
+        "extraction_tolerance": args.extraction_tolerance,
+        "laparams": dict(args.laparams) or None,
+        "include_annotation_spaces": args.include_annotation_spaces,
+        "preserve_pdfminer_coordinates": args.preserve_pdfminer_coordinates,
+        "indexes": _INDEXES[args.command],
+        "page_cache": _PAGE_CACHE if args.dedupe_pages else None,
+    }
+
+
+def _command_results(hotpdf: HotPdf, args: argparse.Namespace) -> list[Record]:
+    command = _COMMANDS[args.command]
+    return [
+        {"page": page_number, **record}
+        for page, page_number in enumerate(hotpdf.page_numbers)
+        for record in command(hotpdf, page, args)
+    ]
+
+
+def process_file(file_name: str, args: argparse.Namespace) -> Record:
+    """Run the command on one file and return its JSON record. Errors are reported in the record."""
+    try:
+        results = _command_results(HotPdf(file_name, **_load_options(args)), args)
+    except Exception as e:
+        return {"file": file_name, "error": f"{type(e).__name__}: {e}"}
+    return {"file": file_name, "results": results}
+
+
+def _iter_supervised_records(files: list[str], args: argparse.Namespace) -> Iterator[Record]:
+    pool = DocumentPool(
+        workers=max(args.workers, 1),
+        timeout=args.timeout,
+        max_rss_bytes=args.max_rss * 2**20 if args.max_rss is not None else None,
+        max_tasks_per_child=args.max_tasks_per_child,
+    )
+    with pool:
+        # Workers get a pickled copy of the page cache, so --dedupe-pages dedupes within each file.
+        for result in pool.map(partial(_command_results, args=args), files, _load_options(args), ordered=False):
+            if result.ok:
+                yield {"file": result.source, "results": result.value}
+            else:
+                yield {"file": result.source, "error": result.error}
+
+
+def _iter_records(files: list[str], args: argparse.Namespace) -> Iterator[Record]:
+    if args.timeout is not None or args.max_rss is not None or args.max_tasks_per_child is not None:
+        yield from _iter_supervised_records(files, args)
+        return
+    if args.workers <= 1:
+        for file_name in files:
+            yield process_file(file_name, args)
+        return
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(process_file, file_name, args) for file_name in files]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _add_paths_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("paths", nargs="+", metavar="PATH", help="PDF files, or directories searched for PDF files")
+
+
+def _add_bbox_arguments(parser: argparse.ArgumentParser) -> None:
+    for coordinate in ("x0", "y0", "x1", "y1"):
+        parser.add_argument(coordinate, type=int, help=f"{coordinate} of the bounding box")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--pages", type=_parse_pages, help='pages to load, 0-indexed, e.g. "0,2,5-7" (default: all)')
+    common.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    common.add_argument("--password", default="", help="password of encrypted files")
+    common.add_argument(
+        "--laparam",
+        dest="laparams",
+        action="append",
+        type=_parse_laparam,
+        default=[],
+        metavar="KEY=VALUE",
+        help="pdfminer layout parameter, e.g. char_margin=1.5 or detect_vertical=true (repeatable)",
+    )
+    common.add_argument("--extraction-tolerance", type=int, default=4, help="bbox extraction tolerance (default: 4)")
+    common.add_argument("--include-annotation-spaces", action="store_true", help="add annotation spaces")
+    common.add_argument(
+        "--preserve-pdfminer-coordinates", action="store_true", help="keep pdfminer's bottom-up y coordinates"
+    )
+    common.add_argument(
+        "--dedupe-pages", action="store_true", help="parse pages repeated across the files (e.g. boilerplate) once"
+    )
+    common.add_argument("--timeout", type=float, metavar="SECONDS", help="fail a file that takes longer than this")
+    common.add_argument("--max-rss", type=int, metavar="MB", help="fail a file whose worker uses more memory than this")
+    common.add_argument(
+        "--max-tasks-per-child", type=int, metavar="N", help="replace each worker process after N files"
+    )
+
+    parser = argparse.ArgumentParser(prog="hotpdf", description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    text_parser = subparsers.add_parser("text", parents=[common], help="extract the text of every page")
+    text_parser.add_argument("--segment", action="store_true", help="read layout blocks instead of plain rows")
+    _add_paths_argument(text_parser)
+
+    find_parser = subparsers.add_parser("find", parents=[common], help="find text")
+    find_parser.add_argument("query", help="text to search for")
+    find_parser.add_argument("--take-span", action="store_true", help="return the full spans of the matches")
+    find_parser.add_argument("--ignore-case", action="store_true", help="case-insensitive search")
+    _add_paths_argument(find_parser)
+
+    for command, help_text in (("extract-bbox", "extract the text in a bounding box"), ("spans", "extract spans")):
+        bbox_parser = subparsers.add_parser(command, parents=[common], help=help_text)
+        _add_bbox_arguments(bbox_parser)
+        _add_paths_argument(bbox_parser)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of the hotpdf console script.
+
+    Returns:
+        int: 0 if every file was processed, 1 if any file failed.
+    """
+    args = build_parser().parse_args(argv)
+    failed = False
+    try:
+        for record in _iter_records(list(_iter_pdf_files(args.paths)), args):
+            failed = failed or "error" in record
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`). Point stdout at devnull so the interpreter's final
+        # flush does not raise again, and stop quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 1 if failed else 0
@@ -0,0 +1,101 @@
+"""Columnar export of the loaded pages' glyphs and spans, for analytics libraries.
+
+Numeric columns are int64 arrays (array.array, typecode "q"), which NumPy reads without copying
+(numpy.asarray(column)) and which back the Arrow columns of to_arrow directly. Text columns are
+lists of the page's own strings. pyarrow is only needed for to_arrow: pip install hotpdf[arrow].
+"""
+
+from array import array
+from collections.abc import Sequence
+from itertools import chain
+from typing import TYPE_CHECKING, Union
+
+from .memory_map import MemoryMap
+
+if TYPE_CHECKING:
+    import pyarrow
+
+Column = Union["array[int]", list[str]]
+Columns = dict[str, Column]
+
+# Column names of the glyph and span tables, in order.
+GLYPH_COLUMNS = ("page", "char", "x", "y", "x_end", "span_id")
+SPAN_COLUMNS = ("page", "span_id", "text", "x0", "y0", "x1", "y1")
+
+
+def to_arrays(pages: Sequence[MemoryMap], page_indexes: Sequence[int]) -> tuple[Columns, Columns]:
+    """Export the glyphs and spans of pages as columns.
+
+    Glyphs are the characters of the page's spans, span by span in reading order, each span's
+    characters by row then column. Each page's columns are read attribute by attribute into
+    int64 arrays, so the tables hold no object per glyph.
+
+    Args:
+        pages (Sequence[MemoryMap]): Pages to export.
+        page_indexes (Sequence[int]): Value of the page column for each page.
+
+    Returns:
+        tuple[Columns, Columns]: The glyph table (GLYPH_COLUMNS) and the span table (SPAN_COLUMNS),
+            each a dict of column name to column.
+    """
+    glyph_pages, xs, ys, x_ends, glyph_span_ids = (array("q") for _ in range(5))
+    values: list[str] = []
+    span_pages, span_ids, x0s, y0s, x1s, y1s = (array("q") for _ in range(6))
+    texts: list[str] = []
+    for page, page_index in zip(pages, page_indexes):
+        page_spans = page.span_map.spans()
+        hot_characters = list(chain.from_iterable(span.characters for span in page_spans))
+        glyph_pages.extend(array("q", [page_index]) * len(hot_characters))
+        values.extend([hot_character.value for hot_character in hot_characters])
+        xs.extend(array("q", [hot_character.x for hot_character in hot_characters]))
+        ys.extend(array("q", [hot_character.y for hot_character in hot_characters]))
+        x_ends.extend(array("q", [hot_character.x_end for hot_character in hot_characters]))
+        glyph_span_ids.extend(array("q", [hot_character.span_id for hot_character in hot_characters]))
+
+        # Finalised spans keep their text and bounding box, so these are lookups.
+        dimensions = [span.get_element_dimension() for span in page_spans]
+        span_pages.extend(array("q", [page_index]) * len(page_spans))
+        span_ids.extend(array("q", [span.span_id for span in page_spans]))
+        texts.extend([span.to_text() for span in page_spans])
+        x0s.extend(array("q", [dimension.x0 for dimension in dimensions]))
+        y0s.extend(array("q", [dimension.y0 for dimension in dimensions]))
+        x1s.extend(array("q", [dimension.x1 for dimension in dimensions]))
+        y1s.extend(array("q", [dimension.y1 for dimension in dimensions]))
+    glyphs: Columns = dict(zip(GLYPH_COLUMNS, (glyph_pages, values, xs, ys, x_ends, glyph_span_ids)))
+    spans: Columns = dict(zip(SPAN_COLUMNS, (span_pages, span_ids, texts, x0s, y0s, x1s, y1s)))
+    return glyphs, spans
+
+
+def _to_arrow_table(columns: Columns) -> "pyarrow.Table":
+    import pyarrow
+
+    arrays = [
+        pyarrow.array(column, type=pyarrow.string())
+        if isinstance(column, list)
+        else pyarrow.Array.from_buffers(pyarrow.int64(), len(column), [None, pyarrow.py_buffer(column)])
+        for column in columns.values()
+    ]
+    return pyarrow.Table.from_arrays(arrays, names=list(columns))
+
+
+def to_arrow(pages: Sequence[MemoryMap], page_indexes: Sequence[int]) -> tuple["pyarrow.Table", "pyarrow.Table"]:
+    """Export the glyphs and spans of pages as Arrow tables, like to_arrays.
+
+    The int64 columns of to_arrays become Arrow columns without being copied.
+
+    Args:
+        pages (Sequence[MemoryMap]): Pages to export.
+        page_indexes (Sequence[int]): Value of the page column for each page.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+
+    Returns:
+        tuple[pyarrow.Table, pyarrow.Table]: The glyph table and the span table.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("to_arrow requires pyarrow: pip install hotpdf[arrow]") from None
+    glyphs, spans = to_arrays(pages, page_indexes)
+    return _to_arrow_table(glyphs), _to_arrow_table(spans)
@@ -1,10 +1,17 @@
+import sys
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Optional
-from uuid import UUID
+from dataclasses import dataclass, field
+from io import IOBase
+from mmap import mmap
+from pathlib import PurePath
+from typing import Any, Optional, Union
 
+# Glyph records are created once per character on every page, so drop the per-instance __dict__
+# where the interpreter supports slotted dataclasses (3.10+).
+_DATACLASS_SLOTS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_SLOTS)
 class HotCharacter:
     """A hot character is a character on a page with certain attributes.
 
@@ -13,7 +20,7 @@ class HotCharacter:
         x (int): x position of the character - column number.
         y (int): y position of the character - row number.
         x_end (int): end x position of the character. x_end - x = width of character.
-        span_id (UUID): hash of parent span the character lies in.
+        span_id (int): id of parent span the character lies in.
         is_anno (bool, Optional): specify if a character is an annotation (default: False).
     """
 
@@ -21,11 +28,11 @@ class HotCharacter:
     x: int
     y: int
     x_end: int
-    span_id: UUID
+    span_id: int
     is_anno: Optional[bool] = False
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ElementDimension:
     """ElementDimension is the dimension of an element in hotpdf.
 
@@ -34,17 +41,17 @@ class ElementDimension:
         y0 (int): starting y position of the element (row).
         x1 (int): end x position of the element (column). x1 - x0 = width.
         y1 (int): end y position of the element (row) y1 - y0 = height.
-        span_id (UUID, Optional): hash of parent span the element lies in.
+        span_id (int, Optional): id of parent span the element lies in.
     """
 
     x0: int
     y0: int
     x1: int
     y1: int
-    span_id: Optional[UUID] = None
+    span_id: Optional[int] = None
 
 
-@dataclass(init=True)
+@dataclass(init=True, **_DATACLASS_SLOTS)
 class Span:
     """A span is a group of characters that are close to each other.
 
@@ -53,11 +60,27 @@ class Span:
         x0 (int): starting x position of the span (column).
         y0 (int): starting y position of the span (row).
         x_end (int): end x position of the span (column). x_end - x0 = width.
-        span_id (UUID, Optional): hash of the span.
+        span_id (int): id of the span, unique within its page.
+
+    A finalised span keeps its text and bounding box, so reading them again is a lookup.
     """
 
     characters: list[HotCharacter]
-    span_id: UUID
+    span_id: int
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _dimension: Optional[ElementDimension] = field(default=None, init=False, repr=False, compare=False)
+
+    def finalise(self) -> None:
+        """Sort the characters by row then column, and cache the span's text and bounding box.
+
+        Call it again after changing the characters.
+        """
+        self.characters.sort(key=lambda ch: (ch.y, ch.x))
+        self._text = None
+        self._dimension = None
+        self._text = self.to_text()
+        if self.characters:
+            self._dimension = self.get_element_dimension()
 
     def to_text(self) -> str:
         """Convert the span to text.
@@ -65,6 +88,8 @@ class Span:
         Returns:
             str: text representation of the span.
         """
+        if self._text is not None:
+            return self._text
         return "".join(char.value for char in self.characters)
 
     def get_element_dimension(self) -> ElementDimension:
@@ -78,6 +103,8 @@ class Span:
         """
         if not self.characters:
             raise ValueError("Span has no characters")
+        if self._dimension is not None:
+            return self._dimension
         x0 = self.characters[0].x
         y0 = self.characters[0].y
         x1 = self.characters[-1].x_end
@@ -85,6 +112,126 @@ class Span:
         return ElementDimension(x0, y0, x1, y1, self.span_id)
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class Match:
+    """A find_matches occurrence: where it is and what it reads, without a copy of its characters.
+
+    Attributes:
+        page (int): index of the page in the loaded pages.
+        x0 (int): starting x position of the match (column).
+        y0 (int): starting y position of the match (row).
+        x1 (int): end x position of the match (column).
+        y1 (int): end y position of the match (row).
+        text (str): text of the match, or of its span when searched with take_span.
+        span_id (int, Optional): id of the span the match starts in.
+
+    The match refers to the characters the search found, or to its span's characters, and only
+    hands them out when asked for through `characters`.
+    """
+
+    page: int
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    text: str
+    span_id: Optional[int] = None
+    _characters: list[HotCharacter] = field(default_factory=list, repr=False, compare=False)
+
+    @property
+    def characters(self) -> list[HotCharacter]:
+        """The characters of the match, as find_text returns them."""
+        return self._characters
+
+    def get_element_dimension(self) -> ElementDimension:
+        """Get the element dimension of the match.
+
+        Returns:
+            ElementDimension: bounding box of the match.
+        """
+        return ElementDimension(self.x0, self.y0, self.x1, self.y1, self.span_id)
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class PageStats:
+    """Profile of loading one page, collected when a load is profiled.
+
+    Attributes:
+        page_number (int): page number in the document (0-indexed).
+        glyphs (int): number of glyphs read from the page layout, after splitting ligatures.
+        spans (int): number of text lines and loose characters the glyphs were read from.
+        stage_seconds (dict[str, float]): wall time per load stage, in stage order:
+            "fingerprint" - hashing the page's content and resources, when loading with a page cache,
+            "interpret" - pdfminer parses and interprets the page's content stream,
+            "layout" - pdfminer layout analysis (laparams),
+            "traverse" - walking the layout tree and creating the HotCharacters,
+            "sort" - sorting the glyphs into reading order,
+            "place" - shifting overlapping glyphs and filling the grid row by row, with gap spaces,
+            "search" - building the search trie,
+            "spans" - building the span map.
+        allocated_bytes (int, Optional): memory still allocated after the page was loaded, if tracemalloc is tracing.
+        peak_allocated_bytes (int, Optional): peak memory allocated while loading the page, if tracemalloc is tracing.
+        cached (bool): the page was served from the page cache, so only "fingerprint" was timed
+            and the glyph and span counts are 0.
+    """
+
+    page_number: int = -1
+    glyphs: int = 0
+    spans: int = 0
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    allocated_bytes: Optional[int] = None
+    peak_allocated_bytes: Optional[int] = None
+    cached: bool = False
+
+    @property
+    def total_seconds(self) -> float:
+        """Wall time of all the stages.
+
+        Returns:
+            float: seconds spent loading the page.
+        """
+        return sum(self.stage_seconds.values())
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """Add wall time to a stage.
+
+        Args:
+            stage (str): stage name.
+            seconds (float): seconds to add.
+        """
+        self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one document processed by a DocumentPool.
+
+    Attributes:
+        index (int): position of the document in the submitted sources.
+        source (Any): the document as submitted.
+        value (Any): what the task returned, if it succeeded.
+        error (str, Optional): "ExceptionType: message" if the task failed.
+        failure (str, Optional): why the task failed, or None if it succeeded:
+            "error" - loading the document or running the task raised,
+            "timeout" - the task ran past the pool's timeout and its worker was killed,
+            "memory" - the worker went over the pool's memory cap,
+            "crashed" - the worker died.
+        seconds (float): wall time from sending the task to a worker to its outcome.
+    """
+
+    index: int
+    source: Any
+    value: Any = None
+    error: Optional[str] = None
+    failure: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task succeeded."""
+        return self.failure is None
+
+
 # All occurences of HotCharacters in a page
 # A list[HotCharacter] is the representation of a word split into "HotCharacters"
 # A list[list[HotCharacter]] is a list of multiple list[HotCharacter] found on a page
@@ -92,3 +239,6 @@ PageResult = list[list[HotCharacter]]
 
 # Complete PageResult with Page Number as the index
 SearchResult = defaultdict[int, PageResult]
+
+# Anything HotPdf can load a document from: a path, an open binary stream or an in-memory buffer
+PdfSource = Union[PurePath, str, IOBase, bytes, bytearray, memoryview, mmap]
@@ -1,2 +1,6 @@
 class HotPdfIsNoneError(Exception):
     pass
+
+
+class HotPdfFrozenError(Exception):
+    pass
@@ -1,33 +1,57 @@
+import gc
 import math
 import os
 from collections import defaultdict
-from io import IOBase
-from pathlib import PurePath
-from typing import Optional, Union
-
-from hotpdf import processor
-from hotpdf.exceptions.custom_exceptions import HotPdfIsNoneError
-from hotpdf.memory_map import MemoryMap
-from hotpdf.utils import filter_adjacent_coords, intersect
-
-from .data.classes import ElementDimension, HotCharacter, PageResult, SearchResult, Span
+from collections.abc import Callable, Collection, MutableSequence, Sequence
+from types import TracebackType
+from typing import TYPE_CHECKING, Optional, TypeVar, Union
+
+from hotpdf import columnar, processor
+from hotpdf.exceptions.custom_exceptions import HotPdfFrozenError, HotPdfIsNoneError
+from hotpdf.memory_map import INDEXES, MemoryMap
+from hotpdf.page_cache import PageCache
+from hotpdf.page_pool import PagePool
+from hotpdf.utils import filter_adjacent_coords, get_element_dimension, intersect
+
+from .data.classes import (
+    ElementDimension,
+    Match,
+    PageResult,
+    PageStats,
+    PdfSource,
+    SearchResult,
+    Span,
+)
+
+if TYPE_CHECKING:
+    import pyarrow
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 class HotPdf:
     def __init__(
         self,
-        pdf_file: Union[PurePath, str, IOBase, None] = None,
+        pdf_file: Optional[PdfSource] = None,
         password: str = "",
         page_numbers: Optional[list[int]] = None,
         extraction_tolerance: int = 4,
         laparams: Optional[dict[str, Union[float, bool]]] = None,
         include_annotation_spaces: bool = False,
         preserve_pdfminer_coordinates: bool = False,
+        max_memory_bytes: Optional[int] = None,
+        keep_open: bool = False,
+        profile: bool = False,
+        indexes: Optional[Collection[str]] = None,
+        page_cache: Optional[PageCache] = None,
+        previous: Optional["HotPdf"] = None,
     ) -> None:
         """Initialize the HotPdf class.
 
         Args:
-            pdf_file (PurePath | str | IOBytes): The path to the PDF file to be loaded, or a bytes object.
+            pdf_file (PurePath | str | IOBase | bytes | bytearray | memoryview | mmap): The path to the PDF file
+                to be loaded, an open binary stream, or the document's bytes. Buffers are read in place, not copied.
             password (str, optional): Password to use to unlock the pdf
             page_numbers (list[int], optional): Pages to be loaded into memory. (0-indexed).
                 If not provided, will load all pages (default).
@@ -37,14 +61,33 @@ class HotPdf:
             include_annotation_spaces (bool, optional): Add annotation spaces to the memory map. Default: False
             preserve_pdfminer_coordinates (bool, Optional): Preserve pdfminer y-coordinate values.
                 Default: False - use natural coords
+            max_memory_bytes (int, optional): Memory budget for the loaded pages. Least recently used
+                pages above the budget are spilled to a temporary file and reloaded on access.
+                Default: None - keep all pages in memory
+            keep_open (bool, optional): Keep the parsed document open so more pages can be added
+                with load_more. Default: False
+            profile (bool, optional): Record the per-stage timing, glyph and span counts of every
+                loaded page in load_stats. Default: False
+            indexes (Collection[str], optional): Indexes to build while loading, out of "grid", "search"
+                and "spans". Other indexes are built on first use. Default: None - build all of them
+            page_cache (PageCache, optional): Cache of pages by content fingerprint. Pages already in it
+                are reused instead of being parsed. Default: None - parse every page
+            previous (HotPdf, optional): An earlier load of a previous version of the document, loaded with
+                a page_cache or a previous. Only the pages that changed since are parsed. Default: None
         Raises:
             ValueError: If the page range is invalid.
+            ValueError: If previous was loaded without a page_cache or a previous.
             FileNotFoundError: If the file is not found.
             PermissionError: If the file is encrypted or the password is wrong.
             RuntimeError: If an unknown error is generated by transfotmer.
         """
-        self.pages: list[MemoryMap] = []
+        self.pages: MutableSequence[MemoryMap] = []
+        self.page_numbers: list[int] = []
+        self.load_stats: list[PageStats] = []
         self.extraction_tolerance: int = extraction_tolerance
+        self.__document: Optional[processor.OpenDocument] = None
+        self.frozen = False
+        self.__profile = False
         if pdf_file:
             self.load(
                 pdf_file,
@@ -53,8 +96,25 @@ class HotPdf:
                 laparams=laparams,
                 include_annotation_spaces=include_annotation_spaces,
                 preserve_pdfminer_coordinates=preserve_pdfminer_coordinates,
+                max_memory_bytes=max_memory_bytes,
+                keep_open=keep_open,
+                profile=profile,
+                indexes=indexes,
+                page_cache=page_cache,
+                previous=previous,
             )
 
+    def __enter__(self) -> "HotPdf":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
     def __check_file_exists(self, pdf_file: str) -> None:
         if not os.path.exists(pdf_file):
             raise FileNotFoundError(f"File {pdf_file} not found")
@@ -71,11 +131,15 @@ class HotPdf:
         for page in pages:
             self.__check_page_number(page)
 
+    def __check_not_frozen(self) -> None:
+        if self.frozen:
+            raise HotPdfFrozenError("HotPdf object is frozen")
+
     def __check_page_range(self, page_numbers: list[int]) -> None:
         if any(_page_num < 0 for _page_num in page_numbers):
             raise ValueError("Invalid page range")
 
-    def __prechecks(self, pdf_file: Union[PurePath, str, IOBase], page_numbers: list[int]) -> None:
+    def __prechecks(self, pdf_file: PdfSource, page_numbers: list[int]) -> None:
         if type(pdf_file) is str:
             self.__check_file_exists(pdf_file)
         self.__check_page_range(page_numbers)
@@ -100,21 +164,31 @@ class HotPdf:
         merged_hotpdf = HotPdf()
         for _hotpdf in hotpdfs:
             merged_hotpdf.pages.extend(_hotpdf.pages)
+            merged_hotpdf.page_numbers.extend(_hotpdf.page_numbers)
+            merged_hotpdf.load_stats.extend(_hotpdf.load_stats)
         return merged_hotpdf
 
     def load(
         self,
-        pdf_file: Union[PurePath, str, IOBase],
+        pdf_file: PdfSource,
         password: str = "",
         page_numbers: Optional[list[int]] = None,
         laparams: Optional[dict[str, Union[float, bool]]] = None,
         include_annotation_spaces: bool = False,
         preserve_pdfminer_coordinates: bool = False,
+        max_memory_bytes: Optional[int] = None,
+        keep_open: bool = False,
+        profile: bool = False,
+        indexes: Optional[Collection[str]] = None,
+        page_cache: Optional[PageCache] = None,
+        previous: Optional["HotPdf"] = None,
     ) -> None:
         """Load a PDF file into memory.
 
         Args:
-            pdf_file (str | Bytes): The path to the PDF file to be loaded, or a bytes object.
+            pdf_file (PurePath | str | IOBase | bytes | bytearray | memoryview | mmap): The path to the PDF file
+                to be loaded, an open binary stream, or the document's bytes. Paths are memory-mapped and
+                buffers are read in place, so the document is never copied as a whole.
             password (str, optional): Password to use to unlock the pdf
             page_numbers (list[int], optional): Pages to be loaded into memory. (0-indexed).
                 If not provided, will load all pages (default).
@@ -122,41 +196,241 @@ class HotPdf:
             include_annotation_spaces (bool, optional): Add annotation spaces to the memory map.
             preserve_pdfminer_coordinates (bool, Optional): Preserve pdfminer y-coordinate values.
                 Default: False - use natural coords
+            max_memory_bytes (int, optional): Memory budget for the loaded pages. Pages are admitted as
+                they are parsed, and least recently used pages above the budget are spilled to a temporary
+                file and reloaded transparently on access. Default: None - keep all pages in memory
+            keep_open (bool, optional): Keep the parsed document open so more pages can be added
+                with load_more, reusing the parser, xref and cached resources. Call close() when done.
+                Default: False
+            profile (bool, optional): Record a PageStats for every loaded page in load_stats, with the
+                wall time of each load stage (pdfminer interpretation and layout analysis, traversal, sort,
+                placement into the grid, search and span index construction) and the glyph and span counts.
+                Allocations are recorded too
+                while tracemalloc is tracing. load_more keeps profiling the pages it adds. Default: False
+            indexes (Collection[str], optional): Indexes to build while loading: "grid" (extract_text,
+                extract_page_text), "search" (find_text, find_value) and "spans" (extract_spans, take_span,
+                extract_tables). A query that needs an index that was not built builds it for its page on
+                first use, so a job that only extracts by bounding box can load with indexes={"grid"}
+                and never pay for the search trie. Default: None - build all of them
+            page_cache (PageCache, optional): Cache of pages by content fingerprint, shared across loads.
+                Every page is fingerprinted before it is parsed, and a page already in the cache is reused,
+                frozen, instead of being parsed again, so identical pages within the document and across
+                the loads sharing the cache (e.g. appended terms and conditions) are parsed and held once.
+                Default: None - parse every page
+            previous (HotPdf, optional): An earlier load of a previous version of the document, e.g. before
+                an incremental update appended a signature or annotations. Its pages are reused wherever the
+                page's content streams, resources and the load settings are unchanged, and only the pages
+                that changed are parsed. Reused pages are frozen, since both loads share them. previous must
+                itself have been loaded with a page_cache or a previous, so that its pages carry the
+                fingerprints this compares. Default: None
         Raises:
+            ValueError: If the memory budget is invalid.
+            ValueError: If previous was loaded without a page_cache or a previous.
+            ValueError: If an index name is invalid.
+            HotPdfFrozenError: If the HotPdf object is frozen.
             Exception: If an unknown error is generated by pdfminer.
         """
+        self.__check_not_frozen()
         page_numbers = page_numbers or []
         self.__prechecks(pdf_file, page_numbers)
+        if indexes is not None and not INDEXES.issuperset(indexes):
+            raise ValueError("Invalid indexes")
+        if previous is not None:
+            page_cache = self.__seed_page_cache(previous, page_cache)
+        self.close()
+        pages: MutableSequence[MemoryMap] = [] if max_memory_bytes is None else PagePool(max_memory_bytes)
+        loaded_page_numbers: list[int] = []
+        load_stats: list[PageStats] = []
         try:
-            self.pages = processor.process(
+            document = processor.open_document(
                 source=pdf_file,
                 password=password,
-                page_numbers=page_numbers,
                 laparams=laparams,
                 include_annotation_spaces=include_annotation_spaces,
                 preserve_pdfminer_coordinates=preserve_pdfminer_coordinates,
+                indexes=indexes,
+                page_cache=page_cache,
             )
+            try:
+                for page_number, parsed_page in document.iter_pages(
+                    page_numbers, on_page_stats=load_stats.append if profile else None
+                ):
+                    loaded_page_numbers.append(page_number)
+                    pages.append(parsed_page)
+            except BaseException:
+                document.close()
+                raise
         except Exception as e:
             raise e
+        self.pages = pages
+        self.page_numbers = loaded_page_numbers
+        self.load_stats = load_stats
+        self.__profile = profile
+        if keep_open:
+            self.__document = document
+        else:
+            document.close()
 
-    def __extract_full_text_span(
-        self,
-        hot_characters: list[HotCharacter],
-        page_num: int,
-    ) -> Union[list[HotCharacter], None]:
-        """Extract the full span of text that the given hot characters are a part of.
+    @staticmethod
+    def __seed_page_cache(previous: "HotPdf", page_cache: Optional[PageCache]) -> PageCache:
+        """Add the fingerprinted pages of an earlier load to a page cache, or to a new one."""
+        page_cache = page_cache if page_cache is not None else PageCache()
+        for page in previous.pages:
+            if page.fingerprint is None:
+                raise ValueError("Invalid previous load: load it with a page_cache to fingerprint its pages")
+            if page.fingerprint not in page_cache:
+                page_cache.put(page.fingerprint, page)
+        return page_cache
+
+    def load_more(self, page_numbers: list[int]) -> None:
+        """Load more pages of a document opened with keep_open=True.
+
+        The new pages are appended to pages in document order, so the indices of the pages already
+        loaded do not change. Pages that are already loaded are skipped. page_numbers maps every
+        index in pages to its page number in the document.
+
+        Args:
+            page_numbers (list[int]): Pages to be loaded into memory. (0-indexed).
+
+        Raises:
+            ValueError: If the page range is invalid.
+            ValueError: If no document is open.
+            HotPdfFrozenError: If the HotPdf object is frozen.
+        """
+        self.__check_not_frozen()
+        self.__check_page_range(page_numbers)
+        if self.__document is None:
+            raise ValueError("Invalid state: no open document, load it with keep_open=True")
+        loaded = set(self.page_numbers)
+        new_page_numbers = [page_number for page_number in page_numbers if page_number not in loaded]
+        if not new_page_numbers:
+            return
+        on_page_stats = self.load_stats.append if self.__profile else None
+        for page_number, parsed_page in self.__document.iter_pages(new_page_numbers, on_page_stats=on_page_stats):
+            self.page_numbers.append(page_number)
+            self.pages.append(parsed_page)
+
+    def close(self) -> None:
+        """Close the document kept open by keep_open=True. Loaded pages stay available."""
+        if self.__document is not None:
+            self.__document.close()
+            self.__document = None
+
+    def freeze(self, gc_freeze: bool = True) -> None:
+        """Make the loaded pages immutable so forked workers can share them.
+
+        Every lazy index is built up front and queries stop writing to the page structures, so a
+        query in a forked child does not copy the pages it reads. The open document, if any, is
+        closed, and loading more pages raises HotPdfFrozenError.
+
+        Reference counts are still updated by the objects a query touches, so the pages those
+        objects live on are copied on first access; everything a query does not touch stays shared.
 
         Args:
-            hot_characters (list[HotCharacter]): the list of hot characters to extract the span for.
-            page_num (int): the page number of the hot characters.
+            gc_freeze (bool, optional): Move every object tracked by the garbage collector, including
+                the pages, to the permanent generation with gc.freeze(), so collections in the children
+                do not write to them either. Call this right before forking. Defaults to True.
+
+        Raises:
+            ValueError: If the pages were loaded with a memory budget, since spilled pages are reloaded on access.
+        """
+        if isinstance(self.pages, PagePool):
+            raise ValueError("Invalid operation: pages loaded with max_memory_bytes cannot be frozen")
+        self.close()
+        for page in self.pages:
+            page.freeze()
+        self.frozen = True
+        if gc_freeze:
+            gc.collect()
+            gc.freeze()
+
+    def page_memory_usage(self) -> list[int]:
+        """Get the estimated in-memory size of every loaded page.
+
+        Sizes include the lazy indexes and cached layouts that queries have built so far. With a memory
+        budget they are reported whether the page is currently resident or spilled.
 
         Returns:
-            Union[list[HotCharacter], None]: the full span of text that the hot characters are a part of.
+            list[int]: Size in bytes per page, in page order.
         """
-        _span: Optional[Span] = None
-        if hot_characters[0].span_id:
-            _span = self.pages[page_num].span_map[hot_characters[0].span_id]
-        return _span.characters if _span else None
+        if isinstance(self.pages, PagePool):
+            return self.pages.page_sizes()
+        return [page.memory_usage() for page in self.pages]
+
+    @staticmethod
+    def __map_pages(function: Callable[[_T], _R], items: Sequence[_T], workers: int) -> list[_R]:
+        """Apply a read-only query to every item, fanned out over a thread pool when workers > 1."""
+        if workers < 1:
+            raise ValueError("Invalid number of workers")
+        if workers == 1 or len(items) <= 1:
+            return [function(item) for item in items]
+        # Imported here: concurrent.futures is slow to import and most queries run on one thread.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    def __find_matches_on_page(
+        self, page_num: int, query: str, take_span: bool, sort: bool, case_sensitive: bool
+    ) -> list[Match]:
+        found_characters, hot_character_occurences = self.pages[page_num].find_text(
+            query, case_sensitive=case_sensitive
+        )
+        groups: PageResult = filter_adjacent_coords(found_characters, hot_character_occurences)
+        # When every query character was found, each group is one trie hit per query character,
+        # so a case-sensitive group reads exactly the query and needs no re-check.
+        verified = case_sensitive and len(found_characters) == len(query)
+        normalized_query = query if case_sensitive else query.lower()
+        span_map = self.pages[page_num].span_map if take_span else None
+        found: list[Match] = []
+        for hot_characters in groups:
+            if verified:
+                text = query
+            else:
+                text = "".join(hc.value for hc in hot_characters)
+                if normalized_query not in (text if case_sensitive else text.lower()):
+                    continue
+            first = hot_characters[0]
+            span = span_map[first.span_id] if span_map is not None and first.span_id else None
+            if span and span.characters:
+                # The characters of a finalised span are already in (y, x) order.
+                dimension = get_element_dimension(span.characters)
+                match = Match(
+                    page_num,
+                    dimension.x0,
+                    dimension.y0,
+                    dimension.x1,
+                    dimension.y1,
+                    span.to_text(),
+                    dimension.span_id,
+                    span.characters,
+                )
+            else:
+                # Each neighbour was found on the same row, at or to the right of the previous one,
+                # so the characters are already in (y, x) order and the first one starts the match.
+                x1 = max(hc.x_end for hc in hot_characters)
+                match = Match(page_num, first.x, first.y, x1, first.y, text, first.span_id, hot_characters)
+            found.append(match)
+        if sort:
+            found.sort(key=lambda match: (match.characters[0].y, match.characters[0].x))
+        return found
+
+    def __find_on_pages(
+        self, query: str, pages: Optional[list[int]], take_span: bool, sort: bool, case_sensitive: bool, workers: int
+    ) -> tuple[list[int], list[list[Match]]]:
+        pages = pages or []
+
+        self.__check_page_numbers(pages)
+
+        # Pages listed twice are searched once.
+        query_pages = list(range(len(self.pages)) if len(pages) == 0 else dict.fromkeys(pages))
+
+        page_results = self.__map_pages(
+            lambda page_num: self.__find_matches_on_page(page_num, query, take_span, sort, case_sensitive),
+            query_pages,
+            workers,
+        )
+        return query_pages, page_results
 
     def find_text(
         self,
@@ -165,6 +439,7 @@ class HotPdf:
         take_span: bool = False,
         sort: bool = True,
         case_sensitive: bool = True,
+        workers: int = 1,
     ) -> SearchResult:
         """Find text within the loaded PDF pages.
 
@@ -174,61 +449,96 @@ class HotPdf:
             take_span (bool, optional): Take the full span of the text that it is a part of.
             sort (bool, Optional): Return elements sorted by their positions.
             case_sensitive (bool, optional): Whether the search should be case-sensitive. Defaults to True.
+            workers (int, optional): Search the pages on this many threads. Queries only read the pages,
+                so this scales across cores on free-threaded Python; with the GIL it mostly does not.
+                Defaults to 1.
         Raises:
             ValueError: If the page number is invalid.
+            ValueError: If the number of workers is invalid.
 
         Returns:
             SearchResult: A dictionary mapping page numbers to found text coordinates.
         """
-        pages = pages or []
+        query_pages, page_results = self.__find_on_pages(query, pages, take_span, sort, case_sensitive, workers)
+        final_found_page_map: SearchResult = defaultdict(PageResult)
+        for page_num, page_result in zip(query_pages, page_results):
+            final_found_page_map[page_num] = [match.characters for match in page_result]
+        return final_found_page_map
 
-        self.__check_page_numbers(pages)
+    def find_matches(
+        self,
+        query: str,
+        pages: Optional[list[int]] = None,
+        take_span: bool = False,
+        sort: bool = True,
+        case_sensitive: bool = True,
+        workers: int = 1,
+    ) -> list[Match]:
+        """Find text within the loaded PDF pages, like find_text, as compact Match results.
 
-        query_pages = (
-            {i: self.pages[i] for i in range(len(self.pages))} if len(pages) == 0 else {i: self.pages[i] for i in pages}
-        )
+        Every match carries its page, bounding box, text and span id, so callers that only need
+        those skip building and walking character lists. The characters of a match are still
+        available through Match.characters.
 
-        found_page_map = {}
+        Args:
+            query (str): The text to search for.
+            pages (list[int], optional): List of page numbers to search.
+            take_span (bool, optional): Take the full span of the text that it is a part of.
+            sort (bool, Optional): Return the matches of each page sorted by their positions.
+            case_sensitive (bool, optional): Whether the search should be case-sensitive. Defaults to True.
+            workers (int, optional): Search the pages on this many threads, as in find_text. Defaults to 1.
+        Raises:
+            ValueError: If the page number is invalid.
+            ValueError: If the number of workers is invalid.
 
-        normalized_query = query if case_sensitive else query.lower()
+        Returns:
+            list[Match]: The matches, page by page in the order the pages were searched.
+        """
+        _, page_results = self.__find_on_pages(query, pages, take_span, sort, case_sensitive, workers)
+        return [match for page_result in page_results for match in page_result]
 
-        for page_num in query_pages:
-            found_page_map[page_num] = filter_adjacent_coords(
-                *query_pages[page_num].find_text(query, case_sensitive=case_sensitive)
-            )
+    def find_value(
+        self,
+        label: str,
+        direction: str = "right",
+        max_distance: int = 200,
+        pages: Optional[list[int]] = None,
+        case_sensitive: bool = True,
+    ) -> SearchResult:
+        """Find the value next to a label, e.g. the amount to the right of "Total" or the IBAN below "IBAN".
 
-        final_found_page_map: SearchResult = defaultdict(PageResult)
+        The value is the text run nearest to each occurrence of the label in the given direction:
+        the characters of its span, extended across neighbouring spans on the same row that are
+        not separated by a gap.
 
-        for page_num in found_page_map:
-            hot_character_page_occurences: PageResult = found_page_map[page_num]
-            final_found_page_map[page_num] = []
-            for hot_characters in hot_character_page_occurences:
-                text = "".join(hc.value for hc in hot_characters)
-                comparable_text = text if case_sensitive else text.lower()
-                if normalized_query not in comparable_text:
-                    continue
-                full_span_dimension_hot_characters: Union[list[HotCharacter], None] = (
-                    self.__extract_full_text_span(
-                        hot_characters=hot_characters,
-                        page_num=page_num,
-                    )
-                    if take_span
-                    else None
-                )
-                chars_to_append = (
-                    full_span_dimension_hot_characters
-                    if (take_span and full_span_dimension_hot_characters)
-                    else hot_characters
-                )
-                if chars_to_append and sort:
-                    chars_to_append = sorted(chars_to_append, key=lambda ch: (ch.y, ch.x))
-                final_found_page_map[page_num].append(chars_to_append)
-        if sort:
-            for _page in final_found_page_map:
-                final_found_page_map[_page] = sorted(
-                    final_found_page_map[_page], key=lambda element: (element[0].y, element[0].x)
+        Args:
+            label (str): The label text to search for.
+            direction (str, optional): "right" to read on the label's line, "below" to read under it.
+                Defaults to "right".
+            max_distance (int, optional): Maximum distance between label and value, in columns for
+                "right" and in rows for "below". Defaults to 200.
+            pages (list[int], optional): List of page numbers to search.
+            case_sensitive (bool, optional): Whether the label search should be case-sensitive. Defaults to True.
+        Raises:
+            ValueError: If the direction is invalid.
+            ValueError: If the page number is invalid.
+
+        Returns:
+            SearchResult: A dictionary mapping page numbers to the values found, one per label occurrence.
+        """
+        if direction not in ("right", "below"):
+            raise ValueError("Invalid direction")
+
+        labels: SearchResult = self.find_text(label, pages=pages, case_sensitive=case_sensitive)
+        found_values: SearchResult = defaultdict(PageResult)
+        for page_num, label_occurences in labels.items():
+            found_values[page_num] = []
+            page_to_search: MemoryMap = self.pages[page_num]
+            for label_hot_characters in label_occurences:
+                found_values[page_num].extend(
+                    page_to_search.find_value(label_hot_characters, direction=direction, max_distance=max_distance)
                 )
-        return final_found_page_map
+        return found_values
 
     def extract_spans(self, x0: int, y0: int, x1: int, y1: int, page: int = 0, sort: bool = True) -> list[Span]:
         """Extract spans that intersect with the given bounding box.
@@ -253,14 +563,11 @@ class HotPdf:
         self.__check_coordinates(x0, y0, x1, y1)
         self.__check_page_number(page)
 
-        for _, span in self.pages[page].span_map.items():
-            if intersect(ElementDimension(x0, y0, x1, y1, None), span.get_element_dimension()):
-                span.characters = sorted(span.characters, key=lambda ch: (ch.y, ch.x))
+        bbox = ElementDimension(x0, y0, x1, y1, None)
+        # Spans are finalised at load, so their order, sorted characters and bounding boxes are lookups.
+        for span in self.pages[page].span_map.spans(ordered=sort):
+            if intersect(bbox, span.get_element_dimension()):
                 spans.append(span)
-                if sort:
-                    spans = sorted(
-                        spans, key=lambda span: (span.get_element_dimension().y0, span.get_element_dimension().x0)
-                    )
 
         return spans
 
@@ -300,6 +607,27 @@ class HotPdf:
         )
         return extracted_text
 
+    def extract_text_many(self, regions: Sequence[tuple[int, int, int, int, int]], workers: int = 1) -> list[str]:
+        """Extract text from many bounding boxes, like extract_text for each one.
+
+        Args:
+            regions (Sequence[tuple[int, int, int, int, int]]): Bounding boxes as (x0, y0, x1, y1, page).
+            workers (int, optional): Extract on this many threads. Queries only read the pages, so this
+                scales across cores on free-threaded Python; with the GIL it mostly does not. Defaults to 1.
+
+        Raises:
+            ValueError: If any coordinates are invalid.
+            ValueError: If any page number is invalid.
+            ValueError: If the number of workers is invalid.
+
+        Returns:
+            list[str]: Extracted text of every region, in order.
+        """
+        for x0, y0, x1, y1, page in regions:
+            self.__check_coordinates(x0, y0, x1, y1)
+            self.__check_page_number(page)
+        return self.__map_pages(lambda region: self.extract_text(*region), regions, workers)
+
     def extract_page_text(
         self,
         page: int,
@@ -331,6 +659,37 @@ class HotPdf:
         )
         return extracted_text
 
+    def extract_tables(
+        self,
+        page: int = 0,
+        bbox: Optional[ElementDimension] = None,
+        min_column_gap: int = 10,
+        max_row_gap: int = 30,
+    ) -> list[list[list[str]]]:
+        """Detect tables on a page and extract their cell text.
+
+        Rows are split into cells at wide horizontal gaps, and column gutters are found from the
+        occupancy of the table's cells across the page columns.
+
+        Args:
+            page (int, optional): The page number. Defaults to 0.
+            bbox (ElementDimension, optional): Only look for tables inside this bounding box. Defaults to the page.
+            min_column_gap (int, optional): Minimum horizontal gap between two cells of a row. Defaults to 10.
+            max_row_gap (int, optional): Maximum vertical distance between two rows of a table. Defaults to 30.
+
+        Raises:
+            ValueError: If the coordinates are invalid.
+            ValueError: If the page number is invalid.
+
+        Returns:
+            list[list[list[str]]]: Tables top to bottom, each a list of rows, each a list of cell texts.
+        """
+        if bbox is not None:
+            self.__check_coordinates(bbox.x0, bbox.y0, bbox.x1, bbox.y1)
+        self.__check_page_number(page)
+
+        return self.pages[page].extract_tables(region=bbox, min_column_gap=min_column_gap, max_row_gap=max_row_gap)
+
     def extract_spans_text(
         self,
         x0: int,
@@ -364,3 +723,43 @@ class HotPdf:
         for span in spans:
             extracted_text.append(span.to_text())
         return "".join(extracted_text)
+
+    def __export_pages(self, pages: Optional[list[int]]) -> tuple[list[MemoryMap], list[int]]:
+        pages = pages or []
+        self.__check_page_numbers(pages)
+        page_indexes = list(range(len(self.pages))) if len(pages) == 0 else list(dict.fromkeys(pages))
+        return [self.pages[page] for page in page_indexes], page_indexes
+
+    def to_arrays(self, pages: Optional[list[int]] = None) -> tuple[columnar.Columns, columnar.Columns]:
+        """Export the glyphs and spans of the loaded pages as columns, for NumPy, pandas or Polars.
+
+        The glyph table has the columns page, char, x, y, x_end and span_id, one row per character
+        of the pages' spans. The span table has page, span_id, text, x0, y0, x1 and y1, one row per
+        span. page is the index of the page in the loaded pages. Numeric columns are int64
+        array.array columns that numpy.asarray reads without copying; text columns are lists of str.
+
+        Args:
+            pages (list[int], optional): Pages to export. Defaults to all loaded pages.
+        Raises:
+            ValueError: If the page number is invalid.
+
+        Returns:
+            tuple[Columns, Columns]: The glyph table and the span table, as dicts of column name to column.
+        """
+        return columnar.to_arrays(*self.__export_pages(pages))
+
+    def to_arrow(self, pages: Optional[list[int]] = None) -> tuple["pyarrow.Table", "pyarrow.Table"]:
+        """Export the glyphs and spans of the loaded pages as Arrow tables, with the columns of to_arrays.
+
+        Requires pyarrow (pip install hotpdf[arrow]).
+
+        Args:
+            pages (list[int], optional): Pages to export. Defaults to all loaded pages.
+        Raises:
+            ValueError: If the page number is invalid.
+            ImportError: If pyarrow is not installed.
+
+        Returns:
+            tuple[pyarrow.Table, pyarrow.Table]: The glyph table and the span table.
+        """
+        return columnar.to_arrow(*self.__export_pages(pages))
@@ -0,0 +1,88 @@
+from bisect import bisect_left, bisect_right
+
+from .data.classes import ElementDimension
+from .sparse_matrix import SparseMatrix
+
+
+class LineMap:
+    """Row-ordered view of a SparseMatrix for fast region queries.
+
+    Every occupied row keeps its occupied columns in ascending order together with the
+    characters at those columns and the rendered line, and every occupied column keeps its
+    occupied rows in ascending order. These sorted coordinate lists act as cumulative
+    occupancy histograms: whether a row or column has text inside a region is answered with
+    a bisect instead of a cell-by-cell scan, and a bbox is read by slicing the cached lines.
+
+    Word separation already lives in the grid as synthesised space cells, so rendering is a
+    plain positional join.
+    """
+
+    def __init__(self, matrix: SparseMatrix) -> None:
+        by_row: dict[int, list[tuple[int, str]]] = {}
+        for (row_idx, column_idx), value in matrix:
+            if value:
+                by_row.setdefault(row_idx, []).append((column_idx, value))
+
+        self.rows: list[int] = sorted(by_row)
+        self.row_columns: dict[int, list[int]] = {}
+        self.row_characters: dict[int, list[str]] = {}
+        self.lines: dict[int, str] = {}
+        column_rows: dict[int, list[int]] = {}
+        for row_idx in self.rows:
+            cells = sorted(by_row[row_idx])
+            self.row_columns[row_idx] = [column_idx for column_idx, _ in cells]
+            self.row_characters[row_idx] = [value for _, value in cells]
+            self.lines[row_idx] = "".join(self.row_characters[row_idx])
+            for column_idx, _ in cells:
+                column_rows.setdefault(column_idx, []).append(row_idx)
+
+        self.columns: list[int] = sorted(column_rows)
+        self.column_rows: dict[int, list[int]] = column_rows
+        self.text: str = "\n".join(line for line in self.lines.values() if line)
+
+    @staticmethod
+    def __any_between(values: list[int], lo: int, hi: int) -> bool:
+        i = bisect_left(values, lo)
+        return i < len(values) and values[i] <= hi
+
+    def rows_in(self, region: ElementDimension) -> list[int]:
+        """Return the rows holding at least one character inside region, ascending."""
+        return [
+            row_idx
+            for row_idx in self.rows[bisect_left(self.rows, region.y0) : bisect_right(self.rows, region.y1)]
+            if self.__any_between(self.row_columns[row_idx], region.x0, region.x1)
+        ]
+
+    def columns_in(self, region: ElementDimension) -> list[int]:
+        """Return the columns holding at least one character inside region, ascending."""
+        return [
+            column_idx
+            for column_idx in self.columns[bisect_left(self.columns, region.x0) : bisect_right(self.columns, region.x1)]
+            if self.__any_between(self.column_rows[column_idx], region.y0, region.y1)
+        ]
+
+    def line(self, row_idx: int, column_lo: int, column_hi: int) -> str:
+        """Return the characters of a row between two columns (inclusive), left to right."""
+        columns = self.row_columns.get(row_idx)
+        if not columns:
+            return ""
+        if column_lo <= columns[0] and columns[-1] <= column_hi:
+            return self.lines[row_idx]
+        return "".join(self.row_characters[row_idx][bisect_left(columns, column_lo) : bisect_right(columns, column_hi)])
+
+    def render(self, region: ElementDimension) -> str:
+        """Render a region top-to-bottom, one grid row per line, skipping rows without text."""
+        if not self.rows:
+            return ""
+        if (
+            region.y0 <= self.rows[0]
+            and self.rows[-1] <= region.y1
+            and region.x0 <= self.columns[0]
+            and self.columns[-1] <= region.x1
+        ):
+            return self.text
+        lines = (
+            self.line(row_idx, region.x0, region.x1)
+            for row_idx in self.rows[bisect_left(self.rows, region.y0) : bisect_right(self.rows, region.y1)]
+        )
+        return "\n".join(line for line in lines if line)
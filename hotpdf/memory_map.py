@@ -1,22 +1,92 @@
 from __future__ import annotations
 
 import math
-from collections import defaultdict
-from collections.abc import Generator
-from uuid import UUID, uuid4
-
-from pdfminer.layout import LTAnno, LTChar, LTComponent, LTFigure, LTPage, LTText, LTTextContainer, LTTextLine
-
-from .data.classes import HotCharacter, PageResult
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Collection, Generator
+from itertools import accumulate
+from operator import attrgetter
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from .data.classes import ElementDimension, HotCharacter, PageResult, PageStats
+from .exceptions.custom_exceptions import HotPdfFrozenError
+from .line_map import LineMap
 from .span_map import SpanMap
 from .sparse_matrix import SparseMatrix
 from .trie import Trie
+from .utils import get_element_dimension
+
+# pdfminer is only needed while a page is loaded, so it is not imported with the package.
+if TYPE_CHECKING:
+    from pdfminer.layout import LTChar, LTComponent, LTFigure, LTPage, LTTextLine
+
+
+# Indexes a page can build: the character grid, the text search trie and the span map.
+INDEXES = frozenset({"grid", "search", "spans"})
+
+# Approximate resident bytes of a page's structures per element on 64-bit CPython, fitted to full
+# object-graph walks of the fixture pages. MemoryMap.memory_usage adds them up from counts the page
+# already keeps, so a page is sized without walking its objects.
+_PAGE_BYTES = 3600
+_GLYPH_BYTES = 120  # a HotCharacter and its coordinates
+_GLYPH_COLUMN_BYTES = 42  # a glyph kept in _GlyphColumns
+_GRID_CELL_BYTES = 120
+_TRIE_GLYPH_BYTES = 8
+_TRIE_NODE_BYTES = 300
+_SPAN_GLYPH_BYTES = 10
+_SPAN_BYTES = 270
+_SPAN_ROW_INDEX_GLYPH_BYTES = 17
+_SPAN_ROW_INDEX_ROW_BYTES = 200
+_LINE_MAP_CELL_BYTES = 27
+_LINE_MAP_ROW_BYTES = 340
+_LINE_MAP_COLUMN_BYTES = 130
+_LAYOUT_CACHE_ENTRY_BYTES = 360
+_LAYOUT_BLOCK_BYTES = 80
+
+
+class _GlyphColumns:
+    """Placed glyphs of a page kept in columns, to build the indexes a page was loaded without.
+
+    Much smaller than the HotCharacters themselves, which are recreated when an index is built.
+    """
+
+    __slots__ = ("values", "xs", "ys", "x_ends", "span_ids", "annotations")
+
+    def __init__(self, hot_characters: list[HotCharacter]) -> None:
+        self.values = [hot_character.value for hot_character in hot_characters]
+        self.xs = array("l", [hot_character.x for hot_character in hot_characters])
+        self.ys = array("l", [hot_character.y for hot_character in hot_characters])
+        self.x_ends = array("l", [hot_character.x_end for hot_character in hot_characters])
+        self.span_ids = array("l", [hot_character.span_id for hot_character in hot_characters])
+        self.annotations = bytes(bool(hot_character.is_anno) for hot_character in hot_characters)
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return self.values, self.xs, self.ys, self.x_ends, self.span_ids, self.annotations
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.values, self.xs, self.ys, self.x_ends, self.span_ids, self.annotations = state
+
+    def to_hot_characters(self) -> list[HotCharacter]:
+        # Glyphs on one row share their y, as they do when loaded from the page layout.
+        rows: dict[int, int] = {}
+        return [
+            HotCharacter(value=value, x=x, y=rows.setdefault(y, y), x_end=x_end, span_id=span_id, is_anno=bool(is_anno))
+            for value, x, y, x_end, span_id, is_anno in zip(
+                self.values, self.xs, self.ys, self.x_ends, self.span_ids, self.annotations
+            )
+        ]
 
 
 class MemoryMap:
     # Horizontal gap (in columns) between one glyph's end and the next glyph's start above which a
     # space is synthesised. Within-word kerning is ~0-2 columns; separate text groups gap far wider.
     __GAP_SPACE_THRESHOLD = 2
+    # Segmented extraction caches layout blocks per region; bbox callers vary the region, so bound it.
+    __LAYOUT_CACHE_SIZE = 16
+    # Rows a value may sit above or below its label's row and still count as being to its right.
+    __VALUE_ROW_TOLERANCE = 2
 
     def __init__(self) -> None:
         """Initialize the MemoryMap. 2D Matrix representation of a PDF Page.
@@ -25,22 +95,175 @@ class MemoryMap:
             width (int): The width of a page.
             height (int) The height of a page.
         """
-        self.text_trie = Trie()
-        self.span_map = SpanMap()
+        self.__memory_map: SparseMatrix | None = None
+        self.__text_trie: Trie | None = Trie()
+        self.__span_map: SpanMap | None = SpanMap()
+        # Placed glyphs of the last load, kept until every index is built from them.
+        self.__glyphs: _GlyphColumns | list[HotCharacter] | None = None
+        self.__glyph_count = 0
         self.width: int = 0
         self.height: int = 0
+        # Content fingerprint of the source page, set when the page is loaded with a page cache.
+        self.fingerprint: str | None = None
+        self.__line_map: LineMap | None = None
+        self.__layout_cache: dict[tuple[int, ...], list[ElementDimension]] = {}
+        # Guards the lazy builds and the layout cache, so concurrent queries build each structure once.
+        # Reentrant, since building the line map reads the grid, which may itself be built lazily.
+        self.__lock = threading.RLock()
+        self.frozen = False
+        # Called after building a lazy index or caching a layout has grown the page, e.g. by the
+        # PagePool holding it to re-measure the page. Not pickled.
+        self.on_resize: Callable[[], None] | None = None
 
     def build_memory_map(self) -> None:
         """Build the memory map based on width and height.
 
         The memory map is a SparseMatrix representation of the PDF.
         """
-        self.memory_map = SparseMatrix()
+        if self.frozen:
+            raise HotPdfFrozenError("MemoryMap is frozen")
+        self.__memory_map = SparseMatrix()
+        self.__line_map = None
+        self.__layout_cache.clear()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Derived indexes are rebuilt on first use, so a pickled page carries only its source structures.
+        # A frozen page keeps them, since it must not build anything at query time.
+        state = self.__dict__.copy()
+        del state["_MemoryMap__lock"]
+        state["on_resize"] = None
+        if not self.frozen:
+            state["_MemoryMap__line_map"] = None
+            state["_MemoryMap__layout_cache"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.RLock()
+
+    def memory_usage(self) -> int:
+        """Estimate the bytes held by the page's structures, including any derived indexes built so far.
+
+        The estimate is computed from the page's glyph, span, grid cell and row counts, so it is cheap
+        enough to take again every time a lazy index or cache is built.
+
+        Returns:
+            int: Estimated resident size of the page in bytes.
+        """
+        glyphs = self.__glyph_count
+        size = _PAGE_BYTES
+        if self.__text_trie is not None or self.__span_map is not None or isinstance(self.__glyphs, list):
+            size += glyphs * _GLYPH_BYTES
+        elif self.__glyphs is not None:
+            size += glyphs * _GLYPH_COLUMN_BYTES
+        if self.__text_trie is not None:
+            size += glyphs * _TRIE_GLYPH_BYTES + len(self.__text_trie.root.children) * _TRIE_NODE_BYTES
+        if self.__span_map is not None:
+            size += glyphs * _SPAN_GLYPH_BYTES + len(self.__span_map) * _SPAN_BYTES
+            if self.__span_map.indexed_rows is not None:
+                size += glyphs * _SPAN_ROW_INDEX_GLYPH_BYTES + self.__span_map.indexed_rows * _SPAN_ROW_INDEX_ROW_BYTES
+        return size + self.__grid_bytes()
+
+    def __grid_bytes(self) -> int:
+        """Estimated bytes of the grid and of the line map and layouts derived from it."""
+        if self.__memory_map is None:
+            return 0
+        cells = len(self.__memory_map.values)
+        size = cells * _GRID_CELL_BYTES
+        line_map = self.__line_map
+        if line_map is not None:
+            size += (
+                cells * _LINE_MAP_CELL_BYTES
+                + len(line_map.rows) * _LINE_MAP_ROW_BYTES
+                + len(line_map.columns) * _LINE_MAP_COLUMN_BYTES
+            )
+        # A copy, since a concurrent query may be adding a layout.
+        for blocks in self.__layout_cache.copy().values():
+            size += _LAYOUT_CACHE_ENTRY_BYTES + len(blocks) * _LAYOUT_BLOCK_BYTES
+        return size
+
+    def __resized(self) -> None:
+        """Report that the page has grown. Called outside the page's lock, which the callback may need."""
+        on_resize = self.on_resize
+        if on_resize is not None:
+            on_resize()
+
+    def freeze(self) -> None:
+        """Build every lazy index up front and make the page read-only.
+
+        Queries on a frozen page read prebuilt structures and never write to them: the line map,
+        the span row index and the whole-page layout blocks are built here, spans are sorted once,
+        and region layouts that are not cached are recomputed instead of being added to the cache.
+        Loading into a frozen page raises HotPdfFrozenError.
+        """
+        if self.frozen:
+            return
+        self.memory_map.freeze()
+        self.text_trie.freeze()
+        self.span_map.freeze()
+        self.extract_text_from_bbox(x0=0, x1=self.width, y0=0, y1=self.height, segment=True)
+        self.frozen = True
+        self.__resized()
+
+    @property
+    def memory_map(self) -> SparseMatrix:
+        """Grid of the page's characters by row and column. Built on first use if the page was loaded without it."""
+        if self.__memory_map is None:
+            with self.__lock:
+                if self.__memory_map is None:
+                    self.__build_missing_index("grid")
+            self.__resized()
+        assert self.__memory_map is not None
+        return self.__memory_map
+
+    @property
+    def text_trie(self) -> Trie:
+        """Search index of the page's characters. Built on first use if the page was loaded without it."""
+        if self.__text_trie is None:
+            with self.__lock:
+                if self.__text_trie is None:
+                    self.__build_missing_index("search")
+            self.__resized()
+        assert self.__text_trie is not None
+        return self.__text_trie
+
+    @property
+    def span_map(self) -> SpanMap:
+        """Characters of the page grouped by span. Built on first use if the page was loaded without it."""
+        if self.__span_map is None:
+            with self.__lock:
+                if self.__span_map is None:
+                    self.__build_missing_index("spans")
+            self.__resized()
+        assert self.__span_map is not None
+        return self.__span_map
+
+    @property
+    def line_map(self) -> LineMap:
+        """Row and column occupancy index of the memory map, built on first use."""
+        line_map = self.__line_map
+        if line_map is None:
+            grid = self.memory_map
+            with self.__lock:
+                if self.__line_map is None:
+                    self.__line_map = LineMap(grid)
+                line_map = self.__line_map
+            self.__resized()
+        return line_map
+
+    def __indexed_span_map(self) -> SpanMap:
+        """The span map, with the row index that spatial span queries read built."""
+        span_map = self.span_map
+        if span_map.build_row_index():
+            self.__resized()
+        return span_map
 
     def __reverse_page_objs(self, page_objs: list[LTComponent]) -> Generator[LTComponent, None, None]:
         yield from reversed(page_objs)
 
     def __extract_from_ltfigure(self, lt_figure_obj: LTFigure) -> Generator[LTTextLine | LTChar, None, None]:
+        from pdfminer.layout import LTChar, LTTextContainer, LTTextLine
+
         for element in lt_figure_obj:
             if isinstance(element, (LTTextLine, LTChar)):
                 yield element
@@ -49,6 +272,8 @@ class MemoryMap:
                 yield from (em for em in element_stack if isinstance(em, LTTextLine))
 
     def __get_page_spans(self, page: LTPage) -> Generator[LTTextLine | LTChar, None, None]:
+        from pdfminer.layout import LTFigure, LTTextContainer, LTTextLine
+
         element_stack = self.__reverse_page_objs(page._objs)
         for obj in element_stack:
             if isinstance(obj, LTTextLine):
@@ -59,25 +284,13 @@ class MemoryMap:
             elif isinstance(obj, (LTFigure)):
                 yield from self.__extract_from_ltfigure(obj)
 
-    def __get_right_shifted_hot_character(self, hot_character: HotCharacter, shift: int) -> HotCharacter:
-        """Shift a hotcharacter on the x-coordinate
-
-        Args:
-            hot_character (HotCharacter): HotCharacter object to be shifted
-            shift (int): shift offset on the x-coordinate
-
-        Returns:
-            HotCharacter: HotCharacter object with new coords
-        """
-        hot_character.x += shift
-        hot_character.x_end += shift
-        return hot_character
-
     def load_memory_map(
         self,
         page: LTPage,
         include_annotation_spaces: bool = False,
         preserve_pdfminer_coordinates: bool = False,
+        stats: PageStats | None = None,
+        indexes: Collection[str] | None = None,
     ) -> None:
         """Load memory map data from an XML page.
 
@@ -85,255 +298,299 @@ class MemoryMap:
             page (str): LTPage Element returned by pdfminer
             include_annotation_spaces (bool, optional): Add annotation spaces to the memory map.
             preserve_pdfminer_coordinates(bool, optional): Preserve pdfminer y-coordinate values.
+            stats (PageStats, optional): Profile to add the glyph and span counts and the wall time
+                of the traverse, sort, place, search and spans stages to.
+            indexes (Collection[str], optional): Indexes to build now, out of INDEXES: "grid" (memory_map,
+                for bbox and page text extraction), "search" (text_trie, for find_text) and "spans" (span_map).
+                The page keeps its glyphs and builds any other index on first use. Defaults to all of them.
         Returns:
             None
         """
+        indexes = INDEXES if indexes is None else indexes
+        start = perf_counter() if stats is not None else 0.0
+        char_hot_characters, span_count = self.__collect_hot_characters(
+            page, include_annotation_spaces, preserve_pdfminer_coordinates
+        )
+        if stats is not None:
+            sorted_at = perf_counter()
+            stats.add_time("traverse", sorted_at - start)
+            stats.glyphs += len(char_hot_characters)
+            stats.spans += span_count
+        # Sort by row then x so every row is one contiguous run in left-to-right order, even when
+        # pdfminer emits side-by-side containers out of order. The build below streams over the rows.
+        char_hot_characters.sort(key=attrgetter("y", "x"))
+        if stats is not None:
+            placed_at = perf_counter()
+            stats.add_time("sort", placed_at - sorted_at)
+        self.__memory_map = self.__text_trie = self.__span_map = None
+        grid = SparseMatrix() if "grid" in indexes else None
+        hot_characters = self.__place_hot_characters(char_hot_characters, include_annotation_spaces, grid)
+        self.__memory_map = grid
+        if stats is not None:
+            stats.add_time("place", perf_counter() - placed_at)
+        self.__build_indexes(hot_characters, indexes, stats)
+        self.__keep_glyphs(hot_characters)
+        self.__glyph_count = len(hot_characters)
+        self.width = math.ceil(page.width)
+        self.height = math.ceil(page.height)
+
+    def __collect_hot_characters(
+        self,
+        page: LTPage,
+        include_annotation_spaces: bool,
+        preserve_pdfminer_coordinates: bool,
+    ) -> tuple[list[HotCharacter], int]:
+        """Read the glyphs of a page layout in traversal order.
+
+        Returns:
+            tuple[list[HotCharacter], int]: The glyphs, and the number of spans they were read from.
+        """
+        from pdfminer.layout import LTAnno, LTChar, LTText
+
         char_hot_characters: list[HotCharacter] = []
+        append = char_hot_characters.append
+        page_height = page.height
         page_components: Generator[LTTextLine | LTChar, None, None] = self.__get_page_spans(page)
-        line_shift: defaultdict[int, int] = defaultdict(int)
+        # Span ids are small page-local integers in traversal order. They start at 1 so that a
+        # span id is always truthy, which callers rely on to tell "no span" apart.
+        span_id = 0
         for component in page_components:
-            span_id = uuid4()
+            span_id += 1
             prev_char_inserted = False
             if isinstance(component, LTChar):
-                x0 = round(component.x0)
-                x1 = round(component.x1)
-                y0 = round(component.y0) if preserve_pdfminer_coordinates else round(page.height - component.y0)
+                y0 = round(component.y0) if preserve_pdfminer_coordinates else round(page_height - component.y0)
                 char_hot_characters.extend(
                     self.__get_hot_characters_of(
-                        value=component.get_text(),
-                        x=x0,
-                        y=y0,
-                        x_end=x1,
-                        span_id=span_id,
+                        component.get_text(), round(component.x0), y0, round(component.x1), span_id
                     )
                 )
                 continue
+            # Every glyph of a text line sits on the line's row; compute it once so the glyphs share one int.
+            line_y0 = round(component.y0) if preserve_pdfminer_coordinates else round(page_height - component.y0)
+            # Position of the last glyph, where an annotation space that follows it is placed.
+            x0 = y0 = 0
             for character in component:
-                if (
-                    include_annotation_spaces
-                    and isinstance(character, LTAnno)
-                    and (character._text == " ")
-                    and prev_char_inserted
-                ):
-                    _elem_width: int = 1
-                    space_char: HotCharacter = self.__get_hot_character_of(
-                        value=" ", x=x0, y=y0, x_end=x0 + _elem_width, span_id=span_id, is_anno=True
-                    )
-                    char_hot_characters.append(
-                        space_char,
-                    )
-                    prev_char_inserted = False
-                elif (
-                    isinstance(character, (LTChar, LTText))
-                    and (
-                        hasattr(character, "x0")
-                        and hasattr(character, "x1")
-                        and hasattr(character, "y0")
-                        and hasattr(character, "y1")
-                    )
-                    and not isinstance(character, LTAnno)
-                ):
+                if isinstance(character, LTAnno):
+                    if include_annotation_spaces and character._text == " " and prev_char_inserted:
+                        append(HotCharacter(" ", x0, y0, x0 + 1, span_id, True))
+                        prev_char_inserted = False
+                elif isinstance(character, (LTChar, LTText)) and hasattr(character, "x0"):
                     char_c = character.get_text()
                     x0 = round(character.x0)
-                    x1 = round(character.x1)
-                    y0 = round(component.y0) if preserve_pdfminer_coordinates else round(page.height - component.y0)
-                    char_hot_characters.extend(
-                        self.__get_hot_characters_of(
-                            value=char_c,
-                            x=x0,
-                            y=y0,
-                            x_end=x1,
-                            span_id=span_id,
+                    y0 = line_y0
+                    if len(char_c) == 1:
+                        append(HotCharacter(char_c, x0, y0, round(character.x1), span_id))
+                    else:
+                        char_hot_characters.extend(
+                            self.__get_hot_characters_of(char_c, x0, y0, round(character.x1), span_id)
                         )
-                    )
                     prev_char_inserted = char_c != " "
-        # Insert into Trie and Span Maps. Sort by row then x so gap detection sees glyphs in
-        # left-to-right order even when pdfminer emits side-by-side containers out of order.
-        char_hot_characters.sort(key=lambda hc: (hc.y, hc.x))
-        last_inserted_x_y: tuple[int, int] = (-1, -1)
-        row_last_x_end: dict[int, int] = {}
-        row_prev_space: dict[int, bool] = {}
-        for i in range(len(char_hot_characters)):
-            _current_character: HotCharacter = char_hot_characters[i]
-            # Determine if annotation spaces should be added
-            if include_annotation_spaces and i > 0 and i < len(char_hot_characters) - 1:
-                prev_char: HotCharacter = char_hot_characters[i - 1]
-                next_char: HotCharacter = char_hot_characters[i + 1]
-                # Anno and non-anno characters should not be overlapping
-                if _current_character.is_anno and next_char.x - prev_char.x <= 0:
-                    continue
-
-            # Prevent characters from overlapping
-            if (last_inserted_x_y[0] > 0 and last_inserted_x_y[1] > 0) and (
-                _current_character.x == last_inserted_x_y[0] and _current_character.y == last_inserted_x_y[1]
-            ):
-                line_shift[_current_character.y] += 1
-            last_inserted_x_y = (_current_character.x, _current_character.y)
-            _current_character = self.__get_right_shifted_hot_character(
-                _current_character, line_shift[_current_character.y]
-            )
-
-            self.__insert_gap_space(_current_character, row_last_x_end, row_prev_space)
-            self.__insert_hotcharacter_to_memory(_current_character)
-        self.width = math.ceil(page.width)
-        self.height = math.ceil(page.height)
-
-    def __insert_gap_space(
-        self,
-        hot_character: HotCharacter,
-        row_last_x_end: dict[int, int],
-        row_prev_space: dict[int, bool],
-    ) -> None:
-        """Insert a single space cell when a glyph starts well past the previous glyph's end on the
-        same row. Separate text groups (form fields, table cells) carry no space character across
-        the gap, so this restores word separation without a per-glyph side structure."""
-        y = hot_character.y
-        if hot_character.value in ("", " "):
-            row_last_x_end[y] = max(row_last_x_end.get(y, -1), hot_character.x_end)
-            row_prev_space[y] = hot_character.value == " "
-
-            return
-
-        last_x_end = row_last_x_end.get(y, -1)
-        gap = 0 <= last_x_end < hot_character.x and hot_character.x - last_x_end > self.__GAP_SPACE_THRESHOLD
-        if gap and not row_prev_space.get(y, False) and self.memory_map.get(row_idx=y, column_idx=last_x_end) == "":
-            self.memory_map.insert(value=" ", row_idx=y, column_idx=last_x_end)
-        row_last_x_end[y] = max(last_x_end, hot_character.x_end)
-        row_prev_space[y] = False
+        return char_hot_characters, span_id
 
-    def __insert_hotcharacter_to_memory(
-        self,
-        hot_character: HotCharacter,
-    ) -> None:
-        """Insert hotcharacter into memory map & trie"""
-        if hot_character.value == "":
-            return None
-        self.memory_map.insert(value=hot_character.value, row_idx=hot_character.y, column_idx=hot_character.x)
-        self.text_trie.insert(word=hot_character.value, hot_character=hot_character)
-        if hot_character.span_id:
-            self.span_map[hot_character.span_id] = hot_character
-
-    def __get_hot_character_of(
-        self,
-        value: str,
-        x: int,
-        y: int,
-        x_end: int,
-        span_id: UUID,
-        is_anno: bool = False,
-    ) -> HotCharacter:
-        """Insert element into memory map.
-
-        Args:
-            value (str): Value of the object to be inserted.
-            x (int): column index (x0-coordinate) of the element.
-            y (int): row index (y0-coordinate) of the element.
-            x_end (int): end column index (x1-coordinate) of element. x_end - x = width of element.
-            span_id (UUID): id of parent span.
-
-        Returns:
-            HotCharacter: HotCharacter object of the whitespace.
-        """
-        return HotCharacter(
-            value=value,
-            x=x,
-            y=y,
-            x_end=x_end,
-            span_id=span_id,
-            is_anno=is_anno,
-        )
-
-    def __get_hot_characters_of(
-        self,
-        value: str,
-        x: int,
-        y: int,
-        x_end: int,
-        span_id: UUID,
-        is_anno: bool = False,
-    ) -> list[HotCharacter]:
+    @staticmethod
+    def __get_hot_characters_of(value: str, x: int, y: int, x_end: int, span_id: int) -> list[HotCharacter]:
         # pdfminer emits ligatures (e.g. "fi", "ffi") as a single glyph. The trie matches the
         # query one char at a time, so an un-split ligature makes find_text miss any text crossing
         # it. Split into single chars with proportional x so trie/find_text see real characters.
         if len(value) <= 1:
-            return [self.__get_hot_character_of(value=value, x=x, y=y, x_end=x_end, span_id=span_id, is_anno=is_anno)]
-
+            return [HotCharacter(value, x, y, x_end, span_id)]
         n = len(value)
         width = x_end - x
         return [
-            self.__get_hot_character_of(
-                value=char,
-                x=round(x + width * i / n),
-                y=y,
-                x_end=round(x + width * (i + 1) / n),
-                span_id=span_id,
-                is_anno=is_anno,
-            )
+            HotCharacter(char, round(x + width * i / n), y, round(x + width * (i + 1) / n), span_id)
             for i, char in enumerate(value)
         ]
 
-    def __render_lines(self, cells: list[tuple[int, int, str]]) -> str:
-        """Render cells top-to-bottom, one grid row per line, columns left-to-right.
+    def __place_hot_characters(
+        self,
+        char_hot_characters: list[HotCharacter],
+        include_annotation_spaces: bool,
+        grid: SparseMatrix | None,
+    ) -> list[HotCharacter]:
+        """Stream over the sorted glyphs row by row: drop overlapping annotation spaces, shift glyphs that
+        land on an occupied cell (in place), and fill each finished row into the grid, if one is given.
 
-        Word separation already lives in the grid as synthesised space cells (see
-        __insert_gap_space), so this is a plain positional join.
+        Returns:
+            list[HotCharacter]: The glyphs to index, in insertion order.
         """
-        by_row: dict[int, list[tuple[int, str]]] = defaultdict(list)
-        for row, col, char in cells:
-            by_row[row].append((col, char))
+        placed: list[HotCharacter] = []
+        append = placed.append
+        last = len(char_hot_characters) - 1
+        row_y = row_start = shift = 0
+        last_x = last_y = -1
+        for i, hot_character in enumerate(char_hot_characters):
+            # Anno and non-anno characters should not be overlapping
+            if (
+                include_annotation_spaces
+                and hot_character.is_anno
+                and 0 < i < last
+                and char_hot_characters[i + 1].x - char_hot_characters[i - 1].x <= 0
+            ):
+                continue
+            x, y = hot_character.x, hot_character.y
+            if y != row_y or not placed:
+                if grid is not None and placed:
+                    self.__fill_grid_row(grid, row_y, placed, row_start)
+                row_y, row_start, shift = y, len(placed), 0
+            # Prevent characters from overlapping: a glyph at the previous glyph's cell moves the rest of the row right.
+            if x == last_x and y == last_y and x > 0 and y > 0:
+                shift += 1
+            last_x, last_y = x, y
+            if shift:
+                hot_character.x += shift
+                hot_character.x_end += shift
+            append(hot_character)
+        if grid is not None and placed:
+            self.__fill_grid_row(grid, row_y, placed, row_start)
+        return placed
+
+    def __fill_grid_row(self, grid: SparseMatrix, y: int, hot_characters: list[HotCharacter], start: int = 0) -> None:
+        """Insert one row of placed glyphs into the grid, with gap spaces.
+
+        A single space cell is synthesised when a glyph starts well past the previous glyph's end on the
+        row. Separate text groups (form fields, table cells) carry no space character across the gap, so
+        this restores word separation without a per-glyph side structure.
+        """
+        cells: dict[int, str] = {}
+        last_x_end = -1
+        prev_space = False
+        for i in range(start, len(hot_characters)):
+            hot_character = hot_characters[i]
+            value = hot_character.value
+            if value == "" or value == " ":
+                last_x_end = max(last_x_end, hot_character.x_end)
+                prev_space = value == " "
+                if value:
+                    cells[hot_character.x] = value
+                continue
+            x = hot_character.x
+            if (
+                0 <= last_x_end < x
+                and x - last_x_end > self.__GAP_SPACE_THRESHOLD
+                and not prev_space
+                and last_x_end not in cells
+            ):
+                cells[last_x_end] = " "
+            last_x_end = max(last_x_end, hot_character.x_end)
+            prev_space = False
+            cells[x] = value
+        grid.insert_row(y, cells)
+
+    def __fill_grid(self, grid: SparseMatrix, hot_characters: list[HotCharacter]) -> None:
+        """Insert placed glyphs, sorted by row, into the grid one row at a time."""
+        row_start = 0
+        for i in range(1, len(hot_characters) + 1):
+            if i == len(hot_characters) or hot_characters[i].y != hot_characters[row_start].y:
+                self.__fill_grid_row(grid, hot_characters[row_start].y, hot_characters[row_start:i])
+                row_start = i
+
+    def __keep_glyphs(self, hot_characters: list[HotCharacter]) -> None:
+        """Keep what is needed to build the missing indexes later. The trie and the span map must share
+        their HotCharacters, so once either holds them the list is kept; before that, compact columns are."""
+        if self.__memory_map is not None and self.__text_trie is not None and self.__span_map is not None:
+            self.__glyphs = None
+        elif self.__text_trie is not None or self.__span_map is not None:
+            self.__glyphs = hot_characters
+        else:
+            self.__glyphs = _GlyphColumns(hot_characters)
 
-        lines: list[str] = []
-        for row in sorted(by_row):
-            line = "".join(char for _, char in sorted(by_row[row]))
-            if line:
-                lines.append(line)
+    def __build_missing_index(self, index: str) -> None:
+        """Build an index that the page was loaded without from its kept glyphs."""
+        if isinstance(self.__glyphs, _GlyphColumns):
+            hot_characters = self.__glyphs.to_hot_characters()
+        else:
+            hot_characters = self.__glyphs or []
+        if index == "grid":
+            grid = SparseMatrix()
+            self.__fill_grid(grid, hot_characters)
+            self.__memory_map = grid
+        self.__build_indexes(hot_characters, {index})
+        self.__keep_glyphs(hot_characters)
+
+    def __build_indexes(
+        self, hot_characters: list[HotCharacter], indexes: Collection[str], stats: PageStats | None = None
+    ) -> None:
+        """Build the search and span indexes in one batch each, and finalise the spans.
 
-        return "\n".join(lines)
+        Each index is assigned once it is complete, so a concurrent query never sees it half built.
+        """
+        start = perf_counter()
+        if "search" in indexes:
+            text_trie = Trie()
+            text_trie.insert_many(hot_character for hot_character in hot_characters if hot_character.value)
+            self.__text_trie = text_trie
+        if stats is not None:
+            spans_at = perf_counter()
+            stats.add_time("search", spans_at - start)
+        if "spans" in indexes:
+            span_map = SpanMap()
+            span_map.insert_many(
+                hot_character for hot_character in hot_characters if hot_character.value and hot_character.span_id
+            )
+            span_map.finalise()
+            self.__span_map = span_map
+        if stats is not None:
+            stats.add_time("spans", perf_counter() - spans_at)
 
     @staticmethod
-    def __widest_empty_run(occupied: set[int], lo: int, hi: int, min_gap: int) -> int | None:
-        """Return the start column/row of the widest empty run >= min_gap within [lo, hi], else None."""
+    def __widest_gap(occupied: list[int], min_gap: int) -> int | None:
+        """Return the start of the widest empty run >= min_gap between ascending occupied indices, else None."""
         best_len = 0
         best_start: int | None = None
-        run_len = 0
-        run_start: int | None = None
-        for i in range(lo, hi + 1):
-            if i in occupied:
-                if run_len > best_len:
-                    best_len, best_start = run_len, run_start
-                run_len = 0
-                run_start = None
-            else:
-                if run_start is None:
-                    run_start = i
-                run_len += 1
-        if run_len > best_len:
-            best_len, best_start = run_len, run_start
+        for prev_idx, next_idx in zip(occupied, occupied[1:]):
+            run_len = next_idx - prev_idx - 1
+            if run_len > best_len:
+                best_len, best_start = run_len, prev_idx + 1
 
         return best_start if best_len >= min_gap else None
 
-    def __xy_cut(self, cells: list[tuple[int, int, str]], gap_x: int, gap_y: int) -> str:
-        """Recursive XY-cut: split the region at its widest gutter, read blocks in order."""
-        if not cells:
-            return ""
+    def __xy_cut(self, region: ElementDimension, gap_x: int, gap_y: int, blocks: list[ElementDimension]) -> None:
+        """Recursive XY-cut: split the region at its widest gutter, collect leaf blocks in reading order."""
+        rows_used = self.line_map.rows_in(region)
+        if not rows_used:
+            return
 
-        cols_used = {c[1] for c in cells}
-        rows_used = {c[0] for c in cells}
-        v_cut = self.__widest_empty_run(cols_used, min(cols_used), max(cols_used), gap_x)
-        h_cut = self.__widest_empty_run(rows_used, min(rows_used), max(rows_used), gap_y)
+        cols_used = self.line_map.columns_in(region)
+        region = ElementDimension(x0=cols_used[0], y0=rows_used[0], x1=cols_used[-1], y1=rows_used[-1])
+        v_cut = self.__widest_gap(cols_used, gap_x)
+        h_cut = self.__widest_gap(rows_used, gap_y)
         if v_cut is None and h_cut is None:
-            return self.__render_lines(cells)
+            blocks.append(region)
+            return
 
         # Prefer the vertical cut (column split) when present; it preserves reading order of rows.
         if v_cut is not None and (h_cut is None or v_cut >= h_cut):
-            left = [c for c in cells if c[1] < v_cut]
-            right = [c for c in cells if c[1] >= v_cut]
-            return self.__xy_cut(left, gap_x, gap_y) + "\n" + self.__xy_cut(right, gap_x, gap_y)
+            self.__xy_cut(ElementDimension(region.x0, region.y0, v_cut - 1, region.y1), gap_x, gap_y, blocks)
+            self.__xy_cut(ElementDimension(v_cut, region.y0, region.x1, region.y1), gap_x, gap_y, blocks)
+            return
 
         assert h_cut is not None
-        top = [c for c in cells if c[0] < h_cut]
-        bottom = [c for c in cells if c[0] >= h_cut]
-        return self.__xy_cut(top, gap_x, gap_y) + "\n" + self.__xy_cut(bottom, gap_x, gap_y)
+        self.__xy_cut(ElementDimension(region.x0, region.y0, region.x1, h_cut - 1), gap_x, gap_y, blocks)
+        self.__xy_cut(ElementDimension(region.x0, h_cut, region.x1, region.y1), gap_x, gap_y, blocks)
+
+    def __layout_blocks(self, region: ElementDimension, gap_x: int, gap_y: int) -> list[ElementDimension]:
+        """Return the XY-cut leaf blocks of a region in reading order, cached per text extent and gaps.
+
+        The cache key is the region shrunk to the text it contains, so every bbox enclosing the
+        same text (e.g. any bbox covering the whole page) reuses one block tree.
+        """
+        rows_used = self.line_map.rows_in(region)
+        if not rows_used:
+            return []
+        cols_used = self.line_map.columns_in(region)
+        key = (cols_used[0], rows_used[0], cols_used[-1], rows_used[-1], gap_x, gap_y)
+        blocks = self.__layout_cache.get(key)
+        if blocks is None:
+            blocks = []
+            self.__xy_cut(ElementDimension(*key[:4]), gap_x, gap_y, blocks)
+            if self.frozen:
+                return blocks
+            with self.__lock:
+                if len(self.__layout_cache) >= self.__LAYOUT_CACHE_SIZE:
+                    del self.__layout_cache[next(iter(self.__layout_cache))]
+                self.__layout_cache[key] = blocks
+            self.__resized()
+        return blocks
 
     def extract_text_from_bbox(
         self,
@@ -365,18 +622,15 @@ class MemoryMap:
         col_hi = min(x1, self.memory_map.columns - 1)
         row_lo = max(y0, 0)
         row_hi = min(y1, self.memory_map.rows - 1)
-        cells: list[tuple[int, int, str]] = []
-        for row in range(row_lo, row_hi + 1):
-            for col in range(col_lo, col_hi + 1):
-                char = self.memory_map.get(row_idx=row, column_idx=col)
-                if char:
-                    cells.append((row, col, char))
+        region = ElementDimension(x0=col_lo, y0=row_lo, x1=col_hi, y1=row_hi)
 
         if segment:
-            extracted_text = self.__xy_cut(cells, segment_gap_x, segment_gap_y)
-            extracted_text = "\n".join(line for line in extracted_text.split("\n") if line)
+            blocks = self.__layout_blocks(region, segment_gap_x, segment_gap_y)
+            extracted_text = "\n".join(
+                block_text for block_text in (self.line_map.render(block) for block in blocks) if block_text
+            )
         else:
-            extracted_text = self.__render_lines(cells)
+            extracted_text = self.line_map.render(region)
 
         return extracted_text + "\n" if extracted_text else ""
 
@@ -392,3 +646,194 @@ class MemoryMap:
         """
         found_text = self.text_trie.search_all(query, case_sensitive=case_sensitive)
         return found_text
+
+    def __text_run(self, hot_character: HotCharacter, extend_left: bool) -> list[HotCharacter]:
+        """Grow a run of characters on hot_character's row while neighbours share its span or sit
+        within the gap-space threshold, then drop whitespace at both ends."""
+        row = self.__indexed_span_map().row_characters(hot_character.y)
+        start = end = next(i for i, ch in enumerate(row) if ch is hot_character)
+
+        def same_run(left: HotCharacter, right: HotCharacter) -> bool:
+            return left.span_id == right.span_id or right.x - left.x_end <= self.__GAP_SPACE_THRESHOLD
+
+        while end + 1 < len(row) and same_run(row[end], row[end + 1]):
+            end += 1
+        while extend_left and start > 0 and same_run(row[start - 1], row[start]):
+            start -= 1
+        while row[start].value.isspace():
+            start += 1
+        while row[end].value.isspace():
+            end -= 1
+        return row[start : end + 1]
+
+    def find_value(self, label: list[HotCharacter], direction: str = "right", max_distance: int = 200) -> PageResult:
+        """Find the text run nearest to a label in a direction.
+
+        Args:
+            label (list[HotCharacter]): Characters of the label, e.g. one find_text occurrence.
+            direction (str): "right" (same line, after the label) or "below" (under the label).
+            max_distance (int): Maximum distance in columns (right) or rows (below) from the label.
+
+        Raises:
+            ValueError: If the direction is invalid.
+
+        Returns:
+            PageResult: A single list with the value's characters ordered by x, or empty if none was found.
+        """
+        label_dimension = get_element_dimension(label)
+        if direction == "right":
+            region = ElementDimension(
+                x0=max(ch.x for ch in label) + 1,
+                y0=label_dimension.y0 - self.__VALUE_ROW_TOLERANCE,
+                x1=label_dimension.x1 + max_distance,
+                y1=label_dimension.y1 + self.__VALUE_ROW_TOLERANCE,
+            )
+
+            def distance(ch: HotCharacter) -> tuple[int, int]:
+                return ch.x, abs(ch.y - label_dimension.y1)
+
+        elif direction == "below":
+            region = ElementDimension(
+                x0=label_dimension.x0,
+                y0=label_dimension.y1 + 1,
+                x1=label_dimension.x1,
+                y1=label_dimension.y1 + max_distance,
+            )
+
+            def distance(ch: HotCharacter) -> tuple[int, int]:
+                return ch.y, abs(ch.x - label_dimension.x0)
+
+        else:
+            raise ValueError("Invalid direction")
+
+        candidates = [
+            ch
+            for ch in self.__indexed_span_map().characters_in(region)
+            if not ch.value.isspace() and all(ch is not label_ch for label_ch in label)
+        ]
+        if not candidates:
+            return []
+        return [self.__text_run(min(candidates, key=distance), extend_left=direction == "below")]
+
+    @staticmethod
+    def __row_runs(row_characters: list[HotCharacter], min_column_gap: int) -> list[tuple[int, int, str]]:
+        """Split a row into (x0, x1, text) runs at horizontal gaps of at least min_column_gap columns."""
+        runs: list[tuple[int, int, str]] = []
+        run_chars: list[str] = []
+        run_x0 = run_x1 = 0
+        for ch in row_characters:
+            if ch.value.isspace():
+                if run_chars:
+                    run_chars.append(ch.value)
+                continue
+            if run_chars and ch.x - run_x1 >= min_column_gap:
+                runs.append((run_x0, run_x1, "".join(run_chars).strip()))
+                run_chars = []
+            if not run_chars:
+                run_x0 = run_x1 = ch.x
+            run_chars.append(ch.value)
+            run_x1 = max(run_x1, ch.x_end, ch.x + 1)
+        if run_chars:
+            runs.append((run_x0, run_x1, "".join(run_chars).strip()))
+        return runs
+
+    @staticmethod
+    def __table_columns(table_rows: list[list[tuple[int, int, str]]], min_column_gap: int) -> list[int]:
+        """Return the start column of each table column, found from the horizontal occupancy histogram of the runs.
+
+        A gutter is a stretch of at least min_column_gap columns that no run covers. Neighbouring
+        columns that never both hold text in the same row are then merged, closest first: they are
+        one column whose rows are aligned differently (e.g. a left-aligned header above right-aligned
+        numbers).
+        """
+        lo = min(run[0] for runs in table_rows for run in runs)
+        hi = max(run[1] for runs in table_rows for run in runs)
+        histogram = [0] * (hi - lo + 1)
+        for runs in table_rows:
+            for x0, x1, _ in runs:
+                histogram[x0 - lo] += 1
+                histogram[x1 - lo] -= 1
+        # Columns as (x0, x1, indices of the rows with text in the column).
+        columns: list[tuple[int, int, set[int]]] = []
+        empty_run = min_column_gap
+        for offset, coverage in enumerate(accumulate(histogram)):
+            if coverage > 0:
+                if empty_run >= min_column_gap:
+                    columns.append((lo + offset, lo + offset, set()))
+                columns[-1] = (columns[-1][0], lo + offset + 1, columns[-1][2])
+                empty_run = 0
+            else:
+                empty_run += 1
+        column_starts = [column[0] for column in columns]
+        for row_idx, runs in enumerate(table_rows):
+            for x0, _, _ in runs:
+                columns[bisect_right(column_starts, x0) - 1][2].add(row_idx)
+
+        mergeable = True
+        while mergeable:
+            gaps = [
+                (columns[i + 1][0] - columns[i][1], i)
+                for i in range(len(columns) - 1)
+                if columns[i][2].isdisjoint(columns[i + 1][2])
+            ]
+            mergeable = bool(gaps)
+            if mergeable:
+                _, i = min(gaps)
+                columns[i : i + 2] = [(columns[i][0], columns[i + 1][1], columns[i][2] | columns[i + 1][2])]
+        return [column[0] for column in columns]
+
+    @staticmethod
+    def __table_from_rows(table_rows: list[list[tuple[int, int, str]]], column_starts: list[int]) -> list[list[str]]:
+        """Place each run in its column; runs sharing a cell are joined with a space."""
+        table: list[list[str]] = []
+        for runs in table_rows:
+            cells: list[list[str]] = [[] for _ in column_starts]
+            for x0, _, text in runs:
+                cells[bisect_right(column_starts, x0) - 1].append(text)
+            table.append([" ".join(cell) for cell in cells])
+        return table
+
+    def extract_tables(
+        self,
+        region: ElementDimension | None = None,
+        min_column_gap: int = 10,
+        max_row_gap: int = 30,
+    ) -> list[list[list[str]]]:
+        """Detect tables on the page and extract their cell text.
+
+        Each row is split into runs of text at horizontal gaps of at least min_column_gap columns.
+        A table is a sequence of two or more consecutive rows, each no more than max_row_gap rows
+        apart, that split into two or more runs. Column gutters are the columns no run of the
+        table covers, so a run spanning several columns (e.g. a merged header) merges them.
+        Side-by-side text columns read as a two-column table; pass a region to avoid them.
+
+        Args:
+            region (ElementDimension, optional): Restrict detection to this bbox. Defaults to the whole page.
+            min_column_gap (int): Minimum horizontal gap between two cells of a row. Defaults to 10.
+            max_row_gap (int): Maximum vertical distance between two rows of the same table. Defaults to 30.
+
+        Returns:
+            list[list[list[str]]]: Tables top to bottom, each a list of rows, each a list of cell texts.
+        """
+        if region is None:
+            region = ElementDimension(x0=0, y0=0, x1=self.width, y1=self.height)
+
+        rows: dict[int, list[HotCharacter]] = {}
+        for ch in self.__indexed_span_map().characters_in(region):
+            rows.setdefault(ch.y, []).append(ch)
+
+        tables: list[list[list[str]]] = []
+        table_rows: list[list[tuple[int, int, str]]] = []
+        last_row_idx = -1
+        for row_idx, row_characters in rows.items():
+            runs = self.__row_runs(row_characters, min_column_gap)
+            if len(runs) < 2 or (table_rows and row_idx - last_row_idx > max_row_gap):
+                if len(table_rows) >= 2:
+                    tables.append(self.__table_from_rows(table_rows, self.__table_columns(table_rows, min_column_gap)))
+                table_rows = []
+            if len(runs) >= 2:
+                table_rows.append(runs)
+                last_row_idx = row_idx
+        if len(table_rows) >= 2:
+            tables.append(self.__table_from_rows(table_rows, self.__table_columns(table_rows, min_column_gap)))
+        return tables
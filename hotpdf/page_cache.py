@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from typing import Optional
+
+from .memory_map import MemoryMap
+
+
+class PageCache:
+    """Pages keyed by content fingerprint, shared across the pages of a document and across loads.
+
+    A page's fingerprint hashes its content streams, the resources they draw with (fonts, images,
+    forms), its boxes and rotation, and the load settings that shape the result. Pages with the same
+    fingerprint parse to the same MemoryMap, so a load that finds a page's fingerprint here reuses
+    the cached page without interpreting it, and identical pages share one page in memory.
+
+    A page becomes shared, and is frozen (see MemoryMap.freeze), the first time it is served from
+    the cache. Pass the same cache to every load of a batch to dedupe boilerplate pages across it.
+    """
+
+    def __init__(self, max_pages: Optional[int] = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_pages (int, optional): Number of pages to keep. The least recently used page above it is
+                dropped from the cache; documents that hold it keep it. Default: None - keep every page
+
+        Raises:
+            ValueError: If max_pages is not positive.
+        """
+        if max_pages is not None and max_pages <= 0:
+            raise ValueError("Invalid cache size")
+        self.max_pages = max_pages
+        self.hits = 0
+        self.misses = 0
+        self.__pages: OrderedDict[str, MemoryMap] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__pages)
+
+    def __contains__(self, fingerprint: object) -> bool:
+        return fingerprint in self.__pages
+
+    def get(self, fingerprint: str) -> Optional[MemoryMap]:
+        """Get the page with a fingerprint, frozen, and count the hit or miss.
+
+        Args:
+            fingerprint (str): Page fingerprint.
+
+        Returns:
+            MemoryMap | None: The cached page, or None if there is none.
+        """
+        page = self.__pages.get(fingerprint)
+        if page is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__pages.move_to_end(fingerprint)
+        page.freeze()
+        return page
+
+    def put(self, fingerprint: str, page: MemoryMap) -> None:
+        """Cache a page under its fingerprint.
+
+        Args:
+            fingerprint (str): Page fingerprint.
+            page (MemoryMap): The page parsed from content with this fingerprint.
+        """
+        self.__pages[fingerprint] = page
+        self.__pages.move_to_end(fingerprint)
+        if self.max_pages is not None and len(self.__pages) > self.max_pages:
+            self.__pages.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached page and reset the counters."""
+        self.__pages.clear()
+        self.hits = self.misses = 0
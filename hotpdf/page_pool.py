@@ -0,0 +1,198 @@
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, MutableSequence
+from typing import IO, Optional, Union, overload
+
+from .memory_map import MemoryMap
+
+
+class _PageSlot:
+    """One page of the pool: the MemoryMap while resident, its place in the spill file once written."""
+
+    __slots__ = ("page", "resident_bytes", "spill_offset", "spill_length", "on_resize", "__weakref__")
+
+    def __init__(self, page: MemoryMap, resident_bytes: int) -> None:
+        self.page: Optional[MemoryMap] = page
+        self.resident_bytes = resident_bytes
+        self.spill_offset = -1
+        self.spill_length = 0
+        # The callback set on the resident page, to tell it apart from another pool's.
+        self.on_resize: Optional[Callable[[], None]] = None
+
+
+class PagePool(MutableSequence[MemoryMap]):
+    """List of pages that keeps at most max_memory_bytes of them in memory.
+
+    Each page's resident size is estimated when it enters the pool or is read back, and again
+    whenever a query builds one of its lazy indexes or caches a layout. When the resident pages
+    exceed the budget, the least recently accessed ones are pickled to an anonymous
+    temporary file and dropped; indexing a spilled page reads it back transparently. Pages
+    are immutable once built, so a page is written to the spill file at most once and later
+    evictions only drop the in-memory copy. Reads and writes are serialised by a lock, since
+    even reading a page updates the recency order and may spill or reload pages.
+    """
+
+    def __init__(self, max_memory_bytes: int, pages: Iterable[MemoryMap] = ()) -> None:
+        if max_memory_bytes <= 0:
+            raise ValueError("Invalid memory budget")
+        self.max_memory_bytes = max_memory_bytes
+        self.resident_bytes = 0
+        self.__slots: list[_PageSlot] = []
+        # Resident slots by id(), least recently accessed first.
+        self.__resident: OrderedDict[int, _PageSlot] = OrderedDict()
+        self.__spill_file: Optional[IO[bytes]] = None
+        self.__lock = threading.RLock()
+        self.extend(pages)
+
+    def __len__(self) -> int:
+        return len(self.__slots)
+
+    @overload
+    def __getitem__(self, index: int) -> MemoryMap: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[MemoryMap]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MemoryMap, list[MemoryMap]]:
+        with self.__lock:
+            if isinstance(index, slice):
+                return [self.__load(slot) for slot in self.__slots[index]]
+            return self.__load(self.__slots[index])
+
+    @overload
+    def __setitem__(self, index: int, page: MemoryMap) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, page: Iterable[MemoryMap]) -> None: ...
+
+    def __setitem__(self, index: Union[int, slice], page: Union[MemoryMap, Iterable[MemoryMap]]) -> None:
+        if isinstance(index, slice) or not isinstance(page, MemoryMap):
+            raise TypeError("PagePool only supports assigning a single page")
+        with self.__lock:
+            self.__release(self.__slots[index])
+            self.__slots[index] = self.__admit(page)
+            self.__enforce_budget()
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        with self.__lock:
+            slots = self.__slots[index] if isinstance(index, slice) else [self.__slots[index]]
+            for slot in slots:
+                self.__release(slot)
+            del self.__slots[index]
+
+    def __iter__(self) -> Iterator[MemoryMap]:
+        for slot in list(self.__slots):
+            with self.__lock:
+                page = self.__load(slot)
+            yield page
+
+    def insert(self, index: int, page: MemoryMap) -> None:
+        with self.__lock:
+            self.__slots.insert(index, self.__admit(page))
+            self.__enforce_budget()
+
+    def page_sizes(self) -> list[int]:
+        """Get the estimated resident size of every page, whether it is resident or spilled.
+
+        Returns:
+            list[int]: Size in bytes per page, in page order.
+        """
+        return [slot.resident_bytes for slot in self.__slots]
+
+    def is_resident(self, index: int) -> bool:
+        """Check whether a page is currently held in memory.
+
+        Args:
+            index (int): Page index.
+
+        Returns:
+            bool: False if the page is only in the spill file.
+        """
+        return self.__slots[index].page is not None
+
+    def close(self) -> None:
+        """Delete the spill file. Spilled pages can no longer be read afterwards."""
+        with self.__lock:
+            if self.__spill_file is not None:
+                self.__spill_file.close()
+                self.__spill_file = None
+
+    def __admit(self, page: MemoryMap) -> _PageSlot:
+        slot = _PageSlot(page, page.memory_usage())
+        self.__watch(slot)
+        self.__resident[id(slot)] = slot
+        self.resident_bytes += slot.resident_bytes
+        return slot
+
+    def __watch(self, slot: _PageSlot) -> None:
+        """Re-measure the slot's page whenever it grows. Frozen pages never grow, and may be shared."""
+        assert slot.page is not None
+        if slot.page.frozen:
+            return
+        # Weak references, so that the page does not keep the pool or its slot alive.
+        pool, slot_reference = weakref.ref(self), weakref.ref(slot)
+
+        def on_resize() -> None:
+            current_pool, current_slot = pool(), slot_reference()
+            if current_pool is not None and current_slot is not None:
+                current_pool.__remeasure(current_slot)
+
+        slot.on_resize = slot.page.on_resize = on_resize
+
+    def __remeasure(self, slot: _PageSlot) -> None:
+        with self.__lock:
+            if slot.page is None:
+                return
+            resident_bytes = slot.page.memory_usage()
+            self.resident_bytes += resident_bytes - slot.resident_bytes
+            slot.resident_bytes = resident_bytes
+            self.__enforce_budget(keep=slot)
+
+    def __release(self, slot: _PageSlot) -> None:
+        if self.__resident.pop(id(slot), None) is not None:
+            self.resident_bytes -= slot.resident_bytes
+        if slot.page is not None and slot.page.on_resize is slot.on_resize:
+            slot.page.on_resize = None
+        slot.page = None
+        slot.on_resize = None
+
+    def __load(self, slot: _PageSlot) -> MemoryMap:
+        if slot.page is None:
+            if self.__spill_file is None:
+                raise RuntimeError("Page was spilled and the spill file is closed")
+            self.__spill_file.seek(slot.spill_offset)
+            slot.page = pickle.loads(self.__spill_file.read(slot.spill_length))
+            # The derived indexes are not spilled, so the page comes back smaller than it left.
+            slot.resident_bytes = slot.page.memory_usage()
+            self.__watch(slot)
+            self.__resident[id(slot)] = slot
+            self.resident_bytes += slot.resident_bytes
+            self.__enforce_budget(keep=slot)
+        else:
+            self.__resident.move_to_end(id(slot))
+        assert slot.page is not None
+        return slot.page
+
+    def __spill(self, slot: _PageSlot) -> None:
+        if slot.spill_offset < 0:
+            if self.__spill_file is None:
+                import tempfile
+
+                self.__spill_file = tempfile.TemporaryFile()  # noqa: SIM115 - lives as long as the pool
+            data = pickle.dumps(slot.page, protocol=pickle.HIGHEST_PROTOCOL)
+            slot.spill_offset = self.__spill_file.seek(0, 2)
+            slot.spill_length = len(data)
+            self.__spill_file.write(data)
+            self.__spill_file.flush()
+        self.__release(slot)
+
+    def __enforce_budget(self, keep: Optional[_PageSlot] = None) -> None:
+        """Spill least recently used pages until the budget holds. The most recent page always stays."""
+        while self.resident_bytes > self.max_memory_bytes and len(self.__resident) > 1:
+            oldest = next(iter(self.__resident.values()))
+            if oldest is keep:
+                self.__resident.move_to_end(id(oldest))
+                continue
+            self.__spill(oldest)
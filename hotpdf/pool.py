@@ -0,0 +1,321 @@
+"""Supervised worker processes that load and query documents.
+
+A DocumentPool runs every document in a recycled worker process, so a pathological file (huge
+figure nests, millions of glyphs) costs at most its timeout and its memory cap instead of the
+whole batch: a worker that runs past the timeout is killed, a worker that goes over the memory
+cap stops itself, and both are replaced. Every document yields a TaskResult.
+
+Example:
+    from operator import methodcaller
+
+    with DocumentPool(workers=8, timeout=60, max_rss_bytes=2**31) as pool:
+        for result in pool.map(methodcaller("extract_page_text", 0), file_names):
+            print(result.source, result.value if result.ok else result.error)
+"""
+
+import contextlib
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from multiprocessing.connection import Connection, wait
+from multiprocessing.context import BaseContext
+from multiprocessing.process import BaseProcess
+from types import TracebackType
+from typing import Any, Optional
+
+from .data.classes import TaskResult
+from .hotpdf import HotPdf
+
+# Exit code of a worker that stopped itself for going over the memory cap.
+_MEMORY_EXIT_CODE = 75
+# How often a worker checks its resident memory.
+_MEMORY_POLL_SECONDS = 0.05
+
+
+def _resident_bytes() -> int:
+    """Current resident set size of this process, or its peak where the current one is not available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _watch_memory(max_rss_bytes: int) -> None:
+    while _resident_bytes() <= max_rss_bytes:
+        time.sleep(_MEMORY_POLL_SECONDS)
+    os._exit(_MEMORY_EXIT_CODE)
+
+
+def _serve(connection: Connection, max_rss_bytes: Optional[int], max_tasks: Optional[int]) -> None:
+    """Worker loop: load each document it is sent, run the task on it and send back the outcome."""
+    if max_rss_bytes is not None:
+        threading.Thread(target=_watch_memory, args=(max_rss_bytes,), daemon=True).start()
+    tasks = 0
+    while max_tasks is None or tasks < max_tasks:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        index, function, source, load_options = task
+        try:
+            outcome: tuple[Any, Optional[str], Optional[str]] = (function(HotPdf(source, **load_options)), None, None)
+        except MemoryError as e:
+            outcome = (None, f"{type(e).__name__}: {e}", "memory")
+        except Exception as e:
+            outcome = (None, f"{type(e).__name__}: {e}", "error")
+        try:
+            connection.send((index, *outcome))
+        except Exception as e:
+            # The value could not be pickled. Nothing was written, so report the error instead.
+            connection.send((index, None, f"{type(e).__name__}: {e}", "error"))
+        tasks += 1
+
+
+class _Worker:
+    """A worker process, its end of the pipe and the task it is running."""
+
+    __slots__ = ("process", "connection", "tasks", "index", "source", "started")
+
+    def __init__(self, process: BaseProcess, connection: Connection) -> None:
+        self.process = process
+        self.connection = connection
+        self.tasks = 0
+        self.index: Optional[int] = None
+        self.source: Any = None
+        self.started = 0.0
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class DocumentPool:
+    """Worker processes that load documents and run a task on each, under a timeout and a memory cap.
+
+    Tasks are functions that take the loaded HotPdf and return a picklable value. They are sent to
+    the workers by pickling, so they must be defined at module level (functools.partial and
+    operator.methodcaller objects of such functions work). Documents are sent the same way, so pass
+    paths or bytes rather than open streams.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_rss_bytes: Optional[int] = None,
+        max_tasks_per_child: Optional[int] = None,
+        mp_context: Optional[BaseContext] = None,
+    ) -> None:
+        """Initialize the pool. Workers are started as tasks arrive.
+
+        Args:
+            workers (int, optional): Number of worker processes. Default: None - os.cpu_count()
+            timeout (float, optional): Seconds a worker may spend on one document, loading included,
+                before it is killed. Default: None - no timeout
+            max_rss_bytes (int, optional): Resident memory a worker may use. A worker that goes over it
+                exits, failing its current document. Default: None - no cap
+            max_tasks_per_child (int, optional): Documents a worker processes before it is replaced, to
+                return the memory it holds on to. Default: None - workers live as long as the pool
+            mp_context (BaseContext, optional): multiprocessing context to start workers with.
+                Default: None - the default context
+
+        Raises:
+            ValueError: If any limit is not positive, or if a memory cap is given on a platform where
+                resident memory cannot be measured.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("Invalid number of workers")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Invalid timeout")
+        if max_rss_bytes is not None and max_rss_bytes <= 0:
+            raise ValueError("Invalid memory cap")
+        if max_rss_bytes is not None:
+            try:
+                _resident_bytes()
+            except ImportError:
+                raise ValueError("Invalid memory cap: resident memory cannot be measured on this platform") from None
+        if max_tasks_per_child is not None and max_tasks_per_child < 1:
+            raise ValueError("Invalid number of tasks per child")
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_bytes
+        self.max_tasks_per_child = max_tasks_per_child
+        # BaseContext does not declare Process in the stubs, though every concrete context has it.
+        self.__context: Any = mp_context or multiprocessing.get_context()
+        self.__workers: list[_Worker] = []
+        self.closed = False
+
+    def __enter__(self) -> "DocumentPool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers. Idle workers exit cleanly, busy ones are killed."""
+        self.closed = True
+        for worker in self.__workers:
+            if worker.index is None:
+                with contextlib.suppress(OSError):
+                    worker.connection.send(None)
+                worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.kill()
+            worker.connection.close()
+        self.__workers.clear()
+
+    def __start_worker(self) -> _Worker:
+        connection, child_connection = self.__context.Pipe()
+        process = self.__context.Process(
+            target=_serve, args=(child_connection, self.max_rss_bytes, self.max_tasks_per_child), daemon=True
+        )
+        process.start()
+        child_connection.close()
+        worker = _Worker(process, connection)
+        self.__workers.append(worker)
+        return worker
+
+    def __retire(self, worker: _Worker) -> None:
+        self.__workers.remove(worker)
+        if worker.process.is_alive():
+            worker.kill()
+        else:
+            worker.process.join()
+            worker.connection.close()
+
+    def __dispatch(self, task: tuple[int, Callable[[HotPdf], Any], Any, dict[str, Any]]) -> _Worker:
+        """Send a task to an idle worker, or to a new one if none is idle or the idle one has exited."""
+        idle = [worker for worker in self.__workers if worker.index is None]
+        worker = idle[0] if idle else self.__start_worker()
+        try:
+            worker.connection.send(task)
+        except OSError:
+            # The worker exited while idle: over the memory cap, or at its task limit. Replace it.
+            self.__retire(worker)
+            worker = self.__start_worker()
+            worker.connection.send(task)
+        return worker
+
+    def __collect(self, worker: _Worker) -> Optional[TaskResult]:
+        """Get the outcome of a worker's task if it has one: its result, its death or its timeout."""
+        assert worker.index is not None
+        result = TaskResult(index=worker.index, source=worker.source)
+        outcome, closed = None, False
+        if worker.connection.poll():
+            try:
+                outcome = worker.connection.recv()
+            except EOFError:
+                # The worker died and its end of the pipe was closed.
+                closed = True
+        if outcome is not None:
+            result.index, result.value, result.error, result.failure = outcome
+            worker.tasks += 1
+            worker.index = worker.source = None
+            if self.max_tasks_per_child is not None and worker.tasks >= self.max_tasks_per_child:
+                self.__retire(worker)
+        elif closed or not worker.process.is_alive():
+            worker.process.join()
+            if worker.process.exitcode == _MEMORY_EXIT_CODE:
+                result.error = f"MemoryError: worker exceeded the memory cap of {self.max_rss_bytes} bytes"
+                result.failure = "memory"
+            else:
+                result.error = f"WorkerCrashed: worker exited with code {worker.process.exitcode}"
+                result.failure = "crashed"
+            self.__retire(worker)
+        elif self.timeout is not None and time.monotonic() - worker.started > self.timeout:
+            result.error = f"TimeoutError: document took longer than {self.timeout} seconds"
+            result.failure = "timeout"
+            self.__retire(worker)
+        else:
+            return None
+        result.seconds = time.monotonic() - worker.started
+        return result
+
+    def __wait(self, busy: list[_Worker]) -> None:
+        """Block until a busy worker sends a result, dies or reaches its timeout."""
+        timeout = None
+        if self.timeout is not None:
+            timeout = max(0.0, min(worker.started for worker in busy) + self.timeout - time.monotonic())
+        wait([worker.connection for worker in busy] + [worker.process.sentinel for worker in busy], timeout)
+
+    def map(
+        self,
+        function: Callable[[HotPdf], Any],
+        sources: Iterable[Any],
+        load_options: Optional[dict[str, Any]] = None,
+        ordered: bool = True,
+    ) -> Iterator[TaskResult]:
+        """Load every source in a worker, run function on it and yield the outcomes.
+
+        Args:
+            function (Callable[[HotPdf], Any]): Task to run on every loaded document. Its return value
+                is sent back, so it must be picklable.
+            sources (Iterable[Any]): Documents to load: paths or bytes.
+            load_options (dict[str, Any], optional): Keyword arguments of HotPdf to load every document with.
+            ordered (bool, optional): Yield the outcomes in the order of the sources. Otherwise they are
+                yielded as they finish. Defaults to True.
+
+        Raises:
+            ValueError: If the pool is closed.
+
+        Yields:
+            TaskResult: The outcome of every document. A failed document never stops the others.
+        """
+        if self.closed:
+            raise ValueError("Invalid operation: the pool is closed")
+        pending = deque(enumerate(sources))
+        finished: dict[int, TaskResult] = {}
+        next_index = 0
+        try:
+            while True:
+                busy = [worker for worker in self.__workers if worker.index is not None]
+                while pending and len(busy) < self.workers:
+                    index, source = pending.popleft()
+                    worker = self.__dispatch((index, function, source, load_options or {}))
+                    worker.index, worker.source, worker.started = index, source, time.monotonic()
+                    busy.append(worker)
+                if not busy:
+                    return
+                self.__wait(busy)
+                for worker in busy:
+                    result = self.__collect(worker)
+                    if result is None:
+                        continue
+                    if not ordered:
+                        yield result
+                        continue
+                    finished[result.index] = result
+                    while next_index in finished:
+                        yield finished.pop(next_index)
+                        next_index += 1
+        finally:
+            # Tasks still running belong to this call; stop them so the workers are free for the next one.
+            for worker in [worker for worker in self.__workers if worker.index is not None]:
+                self.__retire(worker)
+
+    def run(
+        self, function: Callable[[HotPdf], Any], source: Any, load_options: Optional[dict[str, Any]] = None
+    ) -> TaskResult:
+        """Load one source in a worker and run function on it, like map with a single source.
+
+        Returns:
+            TaskResult: The outcome of the document.
+        """
+        return next(self.map(function, [source], load_options))
@@ -1,22 +1,47 @@
 import logging
+import os
+from collections.abc import Callable, Collection, Generator, Iterator
+from contextlib import ExitStack, contextmanager
 from io import IOBase
+from mmap import ACCESS_READ, mmap
 from pathlib import PurePath
-from typing import Optional, Union
-
-from pdfminer.high_level import extract_pages
-from pdfminer.layout import LAParams
+from time import perf_counter
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, BinaryIO, Optional, Union, cast
 
+from hotpdf.buffer_reader import BufferReader
+from hotpdf.data.classes import PageStats, PdfSource
 from hotpdf.memory_map import MemoryMap
+from hotpdf.page_cache import PageCache
+
+# pdfminer takes most of the package's import time, so it is imported on the first parse,
+# not when hotpdf is imported. Likewise the modules that only prefetching, fingerprinting or profiling use.
+if TYPE_CHECKING:
+    from hashlib import blake2b
+    from multiprocessing import Queue
+    from queue import Queue as ThreadQueue
+
+    from pdfminer.layout import LAParams, LTPage
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
 
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
+# How often a prefetching producer blocked on a full window, or a consumer waiting on a prefetch
+# process, checks whether the other side has gone away.
+_PREFETCH_POLL_SECONDS = 0.1
+# Sources a prefetch process can be started with. Streams and memory maps cannot be sent to it.
+_PREFETCH_PROCESS_SOURCES = (str, PurePath, bytes, bytearray)
+
 
 def __make_custom_laparams_object(
     laparams: Optional[dict[str, Union[float, bool]]] = None,
-) -> Union[LAParams, None]:
+) -> Union["LAParams", None]:
     if not laparams:
         return None
-    laparams_obj: LAParams = LAParams()
+    from pdfminer.layout import LAParams
+
+    laparams_obj = LAParams()
     for key in laparams:
         if hasattr(laparams_obj, key):
             laparams_obj.__setattr__(key, laparams[key])
@@ -27,47 +52,492 @@ def __supress_pdfminer_logs() -> None:
     logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
 
-def __process(
-    source: Union[PurePath, str, IOBase],
+@contextmanager
+def __open_source(source: PdfSource) -> Generator[IOBase, None, None]:
+    """Expose a source as something pdfminer can read without copying the document.
+
+    In-memory buffers are read through a BufferReader, and non-empty files are memory-mapped
+    so the parser reads pages straight from the page cache.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap)):
+        with BufferReader(source) as reader:
+            yield reader
+    elif isinstance(source, (str, PurePath)):
+        with open(source, "rb") as pdf_file:
+            if os.fstat(pdf_file.fileno()).st_size == 0:
+                yield pdf_file
+                return
+            with mmap(pdf_file.fileno(), 0, access=ACCESS_READ) as mapped_file, BufferReader(mapped_file) as reader:
+                yield reader
+    else:
+        yield source
+
+
+class OpenDocument:
+    """A parsed document kept open so more of its pages can be processed later.
+
+    The parser, xref and document catalog are read once, and the page tree is walked only
+    as far as the pages requested so far. Fonts and other resources are cached across
+    calls, so processing pages in several batches costs the same as processing them at once.
+    Create it with open_document, and close it to release the source.
+
+    With a page cache, every page is fingerprinted before it is interpreted, and a page whose
+    fingerprint is cached is served from the cache instead of being parsed again.
+    """
+
+    def __init__(
+        self,
+        exit_stack: ExitStack,
+        document: "PDFDocument",
+        laparams: Optional["LAParams"],
+        include_annotation_spaces: bool,
+        preserve_pdfminer_coordinates: bool,
+        indexes: Optional[Collection[str]] = None,
+        page_cache: Optional[PageCache] = None,
+    ) -> None:
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        self.__exit_stack = exit_stack
+        self.__document = document
+        self.__page_tree: Iterator[PDFPage] = PDFPage.create_pages(document)
+        self.__pdf_pages: list[PDFPage] = []
+        resource_manager = PDFResourceManager(caching=True)
+        laparams = laparams or LAParams()
+        self.__device = PDFPageAggregator(resource_manager, laparams=laparams)
+        self.__interpreter = PDFPageInterpreter(resource_manager, self.__device)
+        # pdfminer runs layout analysis in the device's end_page, at the end of process_page. Time it
+        # there so profiled pages can report interpretation and layout analysis separately.
+        self.__layout_seconds = 0.0
+        device_end_page = self.__device.end_page
+
+        def end_page(page: "PDFPage") -> None:
+            start = perf_counter()
+            device_end_page(page)
+            self.__layout_seconds += perf_counter() - start
+
+        self.__device.end_page = end_page  # type: ignore[method-assign]
+        self.include_annotation_spaces = include_annotation_spaces
+        self.preserve_pdfminer_coordinates = preserve_pdfminer_coordinates
+        self.indexes = indexes
+        self.page_cache = page_cache
+        # The settings that shape a parsed page are part of its fingerprint, so pages parsed with
+        # different settings never share a cache entry.
+        self.__settings_key = repr((
+            sorted(vars(laparams).items()),
+            include_annotation_spaces,
+            preserve_pdfminer_coordinates,
+        )).encode()
+        # Digests of the indirect objects hashed so far, by object id. Fonts and images are shared
+        # by many pages, so each is hashed once per document.
+        self.__object_digests: dict[int, bytes] = {}
+        self.closed = False
+
+    def __enter__(self) -> "OpenDocument":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the source and the parser state."""
+        if not self.closed:
+            self.closed = True
+            self.__pdf_pages.clear()
+            self.__object_digests.clear()
+            self.__exit_stack.close()
+
+    def __iter_pdf_pages(self) -> Generator[tuple[int, "PDFPage"], None, None]:
+        yield from enumerate(self.__pdf_pages)
+        for pdf_page in self.__page_tree:
+            self.__pdf_pages.append(pdf_page)
+            yield len(self.__pdf_pages) - 1, pdf_page
+
+    def iter_pages(
+        self,
+        page_numbers: Optional[list[int]] = None,
+        on_page_stats: Optional[Callable[[PageStats], None]] = None,
+    ) -> Generator[tuple[int, MemoryMap], None, None]:
+        """Process pages in document order, yielding each one with its page number as soon as it is built.
+
+        Args:
+            page_numbers (list[int], optional): Pages to process (0-indexed). Page numbers beyond the
+                end of the document are ignored. If not provided, all pages are processed.
+            on_page_stats (Callable[[PageStats], None], optional): Profile every page and call this with
+                its PageStats before the page is yielded. Allocations are included while tracemalloc is tracing.
+
+        Raises:
+            ValueError: If the document is closed.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed document")
+        wanted = set(page_numbers) if page_numbers else None
+        last_wanted = max(wanted) if wanted else None
+        for page_number, pdf_page in self.__iter_pdf_pages():
+            if last_wanted is not None and page_number > last_wanted:
+                break
+            if wanted is not None and page_number not in wanted:
+                continue
+            if on_page_stats is None:
+                yield page_number, self.__process_page(pdf_page)
+                continue
+            stats = PageStats(page_number=page_number)
+            parsed_page = self.__process_page(pdf_page, stats)
+            on_page_stats(stats)
+            yield page_number, parsed_page
+
+    def __hash_object(self, hasher: "blake2b", obj: object) -> None:
+        """Feed a PDF object, and every object it refers to, to a hash."""
+        from hashlib import blake2b
+
+        from pdfminer.pdftypes import PDFObjRef, PDFStream
+        from pdfminer.psparser import PSLiteral
+
+        if isinstance(obj, PDFObjRef):
+            digest = self.__object_digests.get(obj.objid)
+            if digest is None:
+                # Placeholder while the object is hashed, in case it refers back to itself.
+                self.__object_digests[obj.objid] = b"cycle"
+                object_hasher = blake2b(digest_size=16)
+                self.__hash_object(object_hasher, obj.resolve())
+                digest = self.__object_digests[obj.objid] = object_hasher.digest()
+            hasher.update(b"R" + digest)
+        elif isinstance(obj, PDFStream):
+            self.__hash_object(hasher, obj.attrs)
+            # Hash the stored bytes unless pdfminer has already decoded them; tag which one was hashed
+            # so a stream's raw bytes never collide with another stream's decoded bytes.
+            rawdata = obj.get_rawdata()
+            data = (b"S" + rawdata) if rawdata is not None else (b"D" + obj.get_data())
+            hasher.update(b"%d:" % len(data))
+            hasher.update(data)
+        elif isinstance(obj, dict):
+            hasher.update(b"{%d" % len(obj))
+            for key in sorted(obj, key=str):
+                hasher.update(str(key).encode() + b"\0")
+                self.__hash_object(hasher, obj[key])
+        elif isinstance(obj, (list, tuple)):
+            hasher.update(b"[%d" % len(obj))
+            for item in obj:
+                self.__hash_object(hasher, item)
+        elif isinstance(obj, PSLiteral):
+            hasher.update(b"/" + str(obj.name).encode() + b"\0")
+        else:
+            hasher.update(repr(obj).encode() + b"\0")
+
+    def __fingerprint(self, pdf_page: "PDFPage") -> str:
+        """Hash what a parsed page depends on: its decoded content streams, the resources they draw
+        with, its boxes and rotation, and the load settings."""
+        from hashlib import blake2b
+
+        from pdfminer.pdftypes import stream_value
+
+        hasher = blake2b(self.__settings_key, digest_size=16)
+        hasher.update(repr((pdf_page.mediabox, pdf_page.cropbox, pdf_page.rotate)).encode())
+        for content in pdf_page.contents:
+            data = stream_value(content).get_data()
+            hasher.update(b"%d:" % len(data))
+            hasher.update(data)
+        self.__hash_object(hasher, pdf_page.resources)
+        return hasher.hexdigest()
+
+    def __process_page(self, pdf_page: "PDFPage", stats: Optional[PageStats] = None) -> MemoryMap:
+        fingerprint: Optional[str] = None
+        if self.page_cache is not None:
+            start = perf_counter()
+            fingerprint = self.__fingerprint(pdf_page)
+            if stats is not None:
+                stats.add_time("fingerprint", perf_counter() - start)
+            cached_page = self.page_cache.get(fingerprint)
+            if cached_page is not None:
+                if stats is not None:
+                    stats.cached = True
+                return cached_page
+        allocated_before = None
+        if stats is not None:
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                allocated_before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+        self.__layout_seconds = 0.0
+        start = perf_counter()
+        self.__interpreter.process_page(pdf_page)
+        if stats is not None:
+            stats.add_time("interpret", perf_counter() - start - self.__layout_seconds)
+            stats.add_time("layout", self.__layout_seconds)
+        page_layout: LTPage = self.__device.get_result()
+        parsed_page: MemoryMap = MemoryMap()
+        parsed_page.build_memory_map()
+        parsed_page.load_memory_map(
+            page=page_layout,
+            include_annotation_spaces=self.include_annotation_spaces,
+            preserve_pdfminer_coordinates=self.preserve_pdfminer_coordinates,
+            stats=stats,
+            indexes=self.indexes,
+        )
+        if stats is not None and allocated_before is not None:
+            allocated, peak_allocated = tracemalloc.get_traced_memory()
+            stats.allocated_bytes = allocated - allocated_before
+            stats.peak_allocated_bytes = peak_allocated - allocated_before
+        if self.page_cache is not None and fingerprint is not None:
+            parsed_page.fingerprint = fingerprint
+            self.page_cache.put(fingerprint, parsed_page)
+        return parsed_page
+
+
+def open_document(
+    source: PdfSource,
     password: str = "",
-    page_numbers: Optional[list[int]] = None,
     laparams: Optional[dict[str, Union[float, bool]]] = None,
     include_annotation_spaces: bool = False,
     preserve_pdfminer_coordinates: bool = False,
-) -> list[MemoryMap]:
-    pages: list[MemoryMap] = []
+    indexes: Optional[Collection[str]] = None,
+    page_cache: Optional[PageCache] = None,
+) -> OpenDocument:
+    """Open a document and read its xref, without processing any page yet.
+
+    indexes selects the indexes every page builds when it is processed (see MemoryMap.load_memory_map).
+    Pages whose fingerprint is in page_cache are served from it instead of being parsed, and parsed
+    pages are added to it.
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfparser import PDFParser
+
     __supress_pdfminer_logs()
-    page_numbers = sorted(page_numbers) if page_numbers else []
     laparams_obj = __make_custom_laparams_object(laparams)
-
-    hl_page_layouts = extract_pages(
-        source, password=password, page_numbers=page_numbers, caching=True, laparams=laparams_obj
-    )
-    for page_layout in hl_page_layouts:
-        parsed_page: MemoryMap = MemoryMap()
-        parsed_page.build_memory_map()
-        parsed_page.load_memory_map(
-            page=page_layout,
+    with ExitStack() as exit_stack:
+        pdf_file = exit_stack.enter_context(__open_source(source))
+        document = PDFDocument(PDFParser(cast(BinaryIO, pdf_file)), password=password, caching=True)
+        return OpenDocument(
+            exit_stack.pop_all(),
+            document,
+            laparams=laparams_obj,
             include_annotation_spaces=include_annotation_spaces,
             preserve_pdfminer_coordinates=preserve_pdfminer_coordinates,
+            indexes=indexes,
+            page_cache=page_cache,
         )
-        pages.append(parsed_page)
-    return pages
 
 
-def process(
-    source: Union[PurePath, str, IOBase],
+def __iter_process(
+    source: PdfSource,
     password: str = "",
     page_numbers: Optional[list[int]] = None,
     laparams: Optional[dict[str, Union[float, bool]]] = None,
     include_annotation_spaces: bool = False,
     preserve_pdfminer_coordinates: bool = False,
-) -> list[MemoryMap]:
-    return __process(
-        source=source,
+    on_page_stats: Optional[Callable[[PageStats], None]] = None,
+    indexes: Optional[Collection[str]] = None,
+    page_cache: Optional[PageCache] = None,
+) -> Generator[MemoryMap, None, None]:
+    with open_document(
+        source,
         password=password,
-        page_numbers=page_numbers,
         laparams=laparams,
         include_annotation_spaces=include_annotation_spaces,
         preserve_pdfminer_coordinates=preserve_pdfminer_coordinates,
+        indexes=indexes,
+        page_cache=page_cache,
+    ) as document:
+        for _, parsed_page in document.iter_pages(page_numbers, on_page_stats=on_page_stats):
+            yield parsed_page
+
+
+class _PrefetchThread:
+    """Runs a page generator in a background thread, keeping at most window built pages ahead of the caller.
+
+    buffer holds (page, None) for every page, then (None, None) at the end, or (None, error) if
+    parsing failed.
+    """
+
+    def __init__(self, pages: Generator[MemoryMap, None, None], window: int) -> None:
+        import queue
+        import threading
+
+        self.pages = pages
+        self.buffer: ThreadQueue[tuple[Optional[MemoryMap], Optional[BaseException]]] = queue.Queue(maxsize=window)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="hotpdf-prefetch", daemon=True)
+
+    def __put(self, item: tuple[Optional[MemoryMap], Optional[BaseException]]) -> bool:
+        import queue
+
+        while not self.stopped.is_set():
+            try:
+                self.buffer.put(item, timeout=_PREFETCH_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self) -> None:
+        try:
+            for page in self.pages:
+                if not self.__put((page, None)):
+                    return
+            self.__put((None, None))
+        except BaseException as e:
+            self.__put((None, e))
+        finally:
+            # Closes the document, in the thread that has been reading it.
+            self.pages.close()
+
+
+def __prefetch_in_thread(pages: Generator[MemoryMap, None, None], window: int) -> Generator[MemoryMap, None, None]:
+    """Run a page generator in a background thread, at most window pages ahead of the caller."""
+    producer = _PrefetchThread(pages, window)
+    producer.thread.start()
+    try:
+        while True:
+            page, error = producer.buffer.get()
+            if error is not None:
+                raise error
+            if page is None:
+                return
+            yield page
+    finally:
+        # A producer in the middle of a page stops once the page is built.
+        producer.stopped.set()
+        producer.thread.join()
+
+
+def _prefetch_worker(buffer: "Queue[bytes]", options: dict[str, Any], with_stats: bool) -> None:
+    """Parse pages in a prefetch process and send (page, stats, error) for each, pickled up front so a
+    value that cannot be pickled fails here instead of in the queue's feeder thread."""
+    import pickle
+
+    page_stats: list[PageStats] = []
+    try:
+        for page in __iter_process(**options, on_page_stats=page_stats.append if with_stats else None):
+            buffer.put(pickle.dumps((page, page_stats.pop() if page_stats else None, None), pickle.HIGHEST_PROTOCOL))
+        buffer.put(pickle.dumps((None, None, None)))
+    except Exception as e:
+        try:
+            payload = pickle.dumps((None, None, e))
+        except Exception:
+            payload = pickle.dumps((None, None, RuntimeError(f"{type(e).__name__}: {e}")))
+        buffer.put(payload)
+
+
+def __prefetch_in_process(
+    options: dict[str, Any], window: int, on_page_stats: Optional[Callable[[PageStats], None]]
+) -> Generator[MemoryMap, None, None]:
+    """Parse pages in a child process, at most window pages ahead of the caller."""
+    import multiprocessing
+    import pickle
+    import queue
+
+    context = multiprocessing.get_context()
+    buffer: Queue[bytes] = context.Queue(maxsize=window)
+    worker = context.Process(
+        target=_prefetch_worker, args=(buffer, options, on_page_stats is not None), name="hotpdf-prefetch", daemon=True
+    )
+    worker.start()
+    try:
+        while True:
+            # A worker that is gone has flushed everything it sent, so an empty queue after that means it died.
+            alive = worker.is_alive()
+            try:
+                payload = buffer.get(timeout=_PREFETCH_POLL_SECONDS)
+            except queue.Empty:
+                if alive:
+                    continue
+                raise RuntimeError(f"Prefetch process exited with code {worker.exitcode}") from None
+            page, stats, error = pickle.loads(payload)
+            if error is not None:
+                raise error
+            if page is None:
+                return
+            if stats is not None and on_page_stats is not None:
+                on_page_stats(stats)
+            yield page
+    finally:
+        if worker.is_alive():
+            worker.kill()
+        worker.join()
+        buffer.close()
+
+
+def iter_process(
+    source: PdfSource,
+    password: str = "",
+    page_numbers: Optional[list[int]] = None,
+    laparams: Optional[dict[str, Union[float, bool]]] = None,
+    include_annotation_spaces: bool = False,
+    preserve_pdfminer_coordinates: bool = False,
+    on_page_stats: Optional[Callable[[PageStats], None]] = None,
+    indexes: Optional[Collection[str]] = None,
+    page_cache: Optional[PageCache] = None,
+    prefetch: int = 0,
+    prefetch_process: bool = False,
+) -> Generator[MemoryMap, None, None]:
+    """Parse the document page by page, yielding each MemoryMap as soon as it is built.
+
+    Pass on_page_stats to profile the load: it is called with the PageStats of every page.
+    Pass page_cache to reuse identical pages across the document and across calls (see PageCache).
+
+    With prefetch, upcoming pages are parsed in the background while the caller works on the current
+    one, so scanning a document costs about max(parse, consume) instead of their sum. At most prefetch
+    built pages wait for the caller; the worker blocks when they do. The worker is a thread by default:
+    it overlaps with callers that wait (on I/O, or on free-threaded Python on anything), and calls
+    on_page_stats and uses page_cache from that thread. With prefetch_process it is a child process,
+    which also overlaps with CPU-bound callers, at the cost of unpickling every page; the source must
+    then be a path or bytes, and page_cache is not supported. Stopping early stops the worker.
+
+    Raises:
+        ValueError: If prefetch is negative, or if prefetch_process is given a page cache or a
+            source that is not a path or bytes.
+    """
+    if prefetch < 0:
+        raise ValueError("Invalid prefetch window")
+    options: dict[str, Any] = {
+        "source": source,
+        "password": password,
+        "page_numbers": page_numbers,
+        "laparams": laparams,
+        "include_annotation_spaces": include_annotation_spaces,
+        "preserve_pdfminer_coordinates": preserve_pdfminer_coordinates,
+        "indexes": indexes,
+    }
+    if prefetch and prefetch_process:
+        if page_cache is not None:
+            raise ValueError("Invalid prefetch: a page cache cannot be shared with a prefetch process")
+        if not isinstance(source, _PREFETCH_PROCESS_SOURCES):
+            raise ValueError("Invalid source for a prefetch process: pass a path or bytes")
+        yield from __prefetch_in_process(options, prefetch, on_page_stats)
+        return
+    pages = __iter_process(**options, on_page_stats=on_page_stats, page_cache=page_cache)
+    yield from __prefetch_in_thread(pages, prefetch) if prefetch else pages
+
+
+def process(
+    source: PdfSource,
+    password: str = "",
+    page_numbers: Optional[list[int]] = None,
+    laparams: Optional[dict[str, Union[float, bool]]] = None,
+    include_annotation_spaces: bool = False,
+    preserve_pdfminer_coordinates: bool = False,
+    on_page_stats: Optional[Callable[[PageStats], None]] = None,
+    indexes: Optional[Collection[str]] = None,
+    page_cache: Optional[PageCache] = None,
+) -> list[MemoryMap]:
+    return list(
+        __iter_process(
+            source=source,
+            password=password,
+            page_numbers=page_numbers,
+            laparams=laparams,
+            include_annotation_spaces=include_annotation_spaces,
+            preserve_pdfminer_coordinates=preserve_pdfminer_coordinates,
+            on_page_stats=on_page_stats,
+            indexes=indexes,
+            page_cache=page_cache,
+        )
     )
@@ -0,0 +1,397 @@
+import json
+import math
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Sequence
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional
+
+from .data.classes import HotCharacter, PageResult, SearchResult
+from .memory_map import MemoryMap
+from .trie import TrieNode
+from .utils import filter_adjacent_coords
+
+if TYPE_CHECKING:
+    from .hotpdf import HotPdf
+
+_MAGIC = b"HOTPDF\x00\x01"
+_HEADER = struct.Struct("<8sQ")
+_TEXT_ENCODING = "utf-32-le"
+_CODE_UNIT = 4
+_INT_ARRAYS = (
+    "glyph_x",
+    "glyph_y",
+    "glyph_x_end",
+    "glyph_span",
+    "glyph_anno",
+    "glyph_offsets",
+    "span_glyphs",
+    "span_offsets",
+    "rows",
+    "row_starts",
+    "cell_columns",
+    "cell_offsets",
+)
+_TEXT_ARRAYS = ("glyph_text", "cell_text")
+
+
+def _trie_groups(node: TrieNode, prefix: str = "") -> list[tuple[str, list[HotCharacter]]]:
+    groups: list[tuple[str, list[HotCharacter]]] = []
+    stack = [(prefix, node)]
+    while stack:
+        word, current = stack.pop()
+        if current.hot_characters:
+            groups.append((word, current.hot_characters))
+        stack.extend((word + char, child) for char, child in current.children.items())
+    return groups
+
+
+def _page_columns(page: MemoryMap) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """Flatten a page into its metadata and the byte columns of its glyph, span and grid tables.
+
+    Glyphs are grouped by value in trie order, so the occurrences of a character form one contiguous
+    range. Grid cells are ordered by row then column, so a bbox is a range of rows, each a range of cells.
+    """
+    columns: dict[str, array[int]] = {name: array("i") for name in _INT_ARRAYS}
+    glyph_text: list[str] = []
+    glyph_index: dict[int, int] = {}
+    keys: dict[str, list[int]] = {}
+    columns["glyph_offsets"].append(0)
+    text_length = 0
+    for value, hot_characters in _trie_groups(page.text_trie.root):
+        keys[value] = [len(glyph_index), len(glyph_index) + len(hot_characters)]
+        for hot_character in hot_characters:
+            glyph_index[id(hot_character)] = len(glyph_index)
+            columns["glyph_x"].append(hot_character.x)
+            columns["glyph_y"].append(hot_character.y)
+            columns["glyph_x_end"].append(hot_character.x_end)
+            columns["glyph_span"].append(hot_character.span_id)
+            columns["glyph_anno"].append(bool(hot_character.is_anno))
+            text_length += len(hot_character.value)
+            columns["glyph_offsets"].append(text_length)
+            glyph_text.append(hot_character.value)
+
+    spans = dict(page.span_map.items())
+    columns["span_offsets"].append(0)
+    for span_id in range(max(spans, default=0) + 1):
+        span = spans.get(span_id)
+        if span:
+            columns["span_glyphs"].extend(glyph_index[id(hot_character)] for hot_character in span.characters)
+        columns["span_offsets"].append(len(columns["span_glyphs"]))
+
+    cell_text: list[str] = []
+    text_length = 0
+    columns["cell_offsets"].append(0)
+    line_map = page.line_map
+    for row_idx in line_map.rows:
+        columns["rows"].append(row_idx)
+        columns["row_starts"].append(len(columns["cell_columns"]))
+        columns["cell_columns"].extend(line_map.row_columns[row_idx])
+        for value in line_map.row_characters[row_idx]:
+            text_length += len(value)
+            columns["cell_offsets"].append(text_length)
+        cell_text.append(line_map.lines[row_idx])
+    columns["row_starts"].append(len(columns["cell_columns"]))
+
+    metadata = {
+        "width": page.width,
+        "height": page.height,
+        "grid_rows": page.memory_map.rows,
+        "grid_columns": page.memory_map.columns,
+        "keys": keys,
+    }
+    blobs = {name: column.tobytes() for name, column in columns.items()}
+    blobs["glyph_text"] = "".join(glyph_text).encode(_TEXT_ENCODING)
+    blobs["cell_text"] = "".join(cell_text).encode(_TEXT_ENCODING)
+    return metadata, blobs
+
+
+def _data_offset(directory_length: int) -> int:
+    """Columns start after the header and directory, aligned to 8 bytes."""
+    return math.ceil((_HEADER.size + directory_length) / 8) * 8
+
+
+def _buffer_of(shared_memory: SharedMemory) -> memoryview:
+    if shared_memory.buf is None:
+        raise ValueError("I/O operation on closed shared store")
+    return shared_memory.buf
+
+
+class _SharedPage:
+    """Read-only view of one page's columns inside the shared segment."""
+
+    def __init__(self, buffer: memoryview, metadata: dict[str, Any]) -> None:
+        self.width: int = metadata["width"]
+        self.height: int = metadata["height"]
+        self.grid_rows: int = metadata["grid_rows"]
+        self.grid_columns: int = metadata["grid_columns"]
+        self.keys: dict[str, list[int]] = metadata["keys"]
+        self.columns: dict[str, memoryview] = {}
+        for name, (offset, length) in metadata["columns"].items():
+            view = buffer[offset : offset + length]
+            self.columns[name] = view if name in _TEXT_ARRAYS else view.cast("i")
+
+    def release(self) -> None:
+        for view in self.columns.values():
+            view.release()
+
+    def __text(self, name: str, start: int, end: int) -> str:
+        return self.columns[name][start * _CODE_UNIT : end * _CODE_UNIT].tobytes().decode(_TEXT_ENCODING)
+
+    def hot_character(self, glyph: int) -> HotCharacter:
+        offsets = self.columns["glyph_offsets"]
+        return HotCharacter(
+            value=self.__text("glyph_text", offsets[glyph], offsets[glyph + 1]),
+            x=self.columns["glyph_x"][glyph],
+            y=self.columns["glyph_y"][glyph],
+            x_end=self.columns["glyph_x_end"][glyph],
+            span_id=self.columns["glyph_span"][glyph],
+            is_anno=bool(self.columns["glyph_anno"][glyph]),
+        )
+
+    def occurrences(self, value: str) -> list[HotCharacter]:
+        start, end = self.keys.get(value, (0, 0))
+        return [self.hot_character(glyph) for glyph in range(start, end)]
+
+    def find_text(self, query: str, case_sensitive: bool = True) -> tuple[list[str], PageResult]:
+        """Same matching as Trie.search_all, reading the occurrences from the glyph table."""
+        found: list[str] = []
+        hot_characters: PageResult = []
+        for char in query:
+            candidates = (char,) if case_sensitive else {char, char.lower(), char.upper()}
+            occurrences = [hot_character for candidate in candidates for hot_character in self.occurrences(candidate)]
+            if occurrences:
+                found.append(char)
+                hot_characters.append(occurrences)
+        return found, hot_characters
+
+    def span_characters(self, span_id: int) -> list[HotCharacter]:
+        span_offsets = self.columns["span_offsets"]
+        if not 0 <= span_id < len(span_offsets) - 1:
+            return []
+        span_glyphs = self.columns["span_glyphs"][span_offsets[span_id] : span_offsets[span_id + 1]]
+        return sorted((self.hot_character(glyph) for glyph in span_glyphs), key=lambda ch: (ch.y, ch.x))
+
+    def render(self, x0: int, x1: int, y0: int, y1: int) -> str:
+        """Same output as MemoryMap.extract_text_from_bbox without segmentation."""
+        x0, x1 = max(x0, 0), min(x1, self.grid_columns - 1)
+        y0, y1 = max(y0, 0), min(y1, self.grid_rows - 1)
+        rows, row_starts = self.columns["rows"], self.columns["row_starts"]
+        cell_columns, cell_offsets = self.columns["cell_columns"], self.columns["cell_offsets"]
+        lines: list[str] = []
+        for row in range(bisect_left(rows, y0), bisect_right(rows, y1)):
+            row_start, row_end = row_starts[row], row_starts[row + 1]
+            start = bisect_left(cell_columns, x0, row_start, row_end)
+            end = bisect_right(cell_columns, x1, row_start, row_end)
+            if start < end:
+                lines.append(self.__text("cell_text", cell_offsets[start], cell_offsets[end]))
+        extracted_text = "\n".join(lines)
+        return extracted_text + "\n" if extracted_text else ""
+
+
+class SharedPdfStore:
+    """Loaded pages published to shared memory as a compact, read-only columnar store.
+
+    The publishing process flattens every page into integer columns (glyph positions, span
+    membership, grid cells) and UTF-32 text columns, and writes them to one named
+    multiprocessing.shared_memory segment. Any process on the host can attach to the segment by
+    name and run find_text, extract_text and extract_page_text against it without parsing the
+    document or copying the pages: queries read the columns in place and only materialise the
+    HotCharacters they return.
+
+    The publisher owns the segment and must unlink it when no process needs it any more. Before
+    Python 3.13, a process outside the publisher's process tree that attaches to the segment
+    registers it with its own resource tracker, which unlinks the segment when that process exits.
+    """
+
+    def __init__(self, shared_memory: SharedMemory, owner: bool) -> None:
+        self.__shared_memory = shared_memory
+        self.__owner = owner
+        buffer = _buffer_of(shared_memory)
+        magic, directory_length = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC:
+            raise ValueError("Invalid shared store")
+        directory = json.loads(bytes(buffer[_HEADER.size : _HEADER.size + directory_length]))
+        self.extraction_tolerance: int = directory["extraction_tolerance"]
+        self.page_numbers: list[int] = directory["page_numbers"]
+        self.__data = buffer[_data_offset(directory_length) :]
+        self.__pages = [_SharedPage(self.__data, page_metadata) for page_metadata in directory["pages"]]
+
+    @classmethod
+    def publish(cls, hotpdf: "HotPdf", name: Optional[str] = None) -> "SharedPdfStore":
+        """Copy the pages of a loaded HotPdf into a new shared memory segment.
+
+        Args:
+            hotpdf (HotPdf): The loaded document.
+            name (str, optional): Name of the segment. A unique name is generated if not provided.
+
+        Raises:
+            FileExistsError: If a segment with this name already exists.
+
+        Returns:
+            SharedPdfStore: The owning store. Its name is what other processes attach to.
+        """
+        pages_metadata: list[dict[str, Any]] = []
+        blobs: list[bytes] = []
+        data_length = 0
+        for page in hotpdf.pages:
+            metadata, page_blobs = _page_columns(page)
+            metadata["columns"] = {}
+            for column_name, blob in page_blobs.items():
+                metadata["columns"][column_name] = (data_length, len(blob))
+                blobs.append(blob)
+                data_length += len(blob)
+            pages_metadata.append(metadata)
+
+        directory = {
+            "extraction_tolerance": hotpdf.extraction_tolerance,
+            "page_numbers": hotpdf.page_numbers or list(range(len(hotpdf.pages))),
+            "pages": pages_metadata,
+        }
+        encoded_directory = json.dumps(directory).encode()
+        offset = _data_offset(len(encoded_directory))
+
+        shared_memory = SharedMemory(name=name, create=True, size=offset + data_length)
+        buffer = _buffer_of(shared_memory)
+        _HEADER.pack_into(buffer, 0, _MAGIC, len(encoded_directory))
+        buffer[_HEADER.size : _HEADER.size + len(encoded_directory)] = encoded_directory
+        for blob in blobs:
+            buffer[offset : offset + len(blob)] = blob
+            offset += len(blob)
+        return cls(shared_memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedPdfStore":
+        """Attach to a store published by another process.
+
+        Args:
+            name (str): Name of the segment.
+
+        Raises:
+            FileNotFoundError: If no segment with this name exists.
+            ValueError: If the segment is not a shared store.
+
+        Returns:
+            SharedPdfStore: A read-only view of the store.
+        """
+        if sys.version_info >= (3, 13):
+            shared_memory = SharedMemory(name=name, track=False)
+        else:
+            # Before 3.13 attaching registers the segment with the process's resource tracker. Workers
+            # forked from the publisher share its tracker, so this is a no-op for them.
+            shared_memory = SharedMemory(name=name)
+        return cls(shared_memory, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.__shared_memory.name
+
+    @property
+    def size(self) -> int:
+        """Size of the shared segment in bytes."""
+        return self.__shared_memory.size
+
+    def __len__(self) -> int:
+        return len(self.__pages)
+
+    def __enter__(self) -> "SharedPdfStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+        if self.__owner:
+            self.unlink()
+
+    def close(self) -> None:
+        """Detach this process from the segment."""
+        for page in self.__pages:
+            page.release()
+        self.__pages = []
+        self.__data.release()
+        self.__shared_memory.close()
+
+    def unlink(self) -> None:
+        """Destroy the segment. Processes still attached keep their mapping until they close it."""
+        self.__shared_memory.unlink()
+
+    def __check_page_number(self, page: int) -> None:
+        if page < 0 or page >= len(self.__pages):
+            raise ValueError("Invalid page number")
+
+    def __check_coordinates(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        if x0 < 0 or x1 < 0 or y0 < 0 or y1 < 0:
+            raise ValueError("Invalid coordinates")
+
+    def find_text(
+        self,
+        query: str,
+        pages: Optional[Sequence[int]] = None,
+        take_span: bool = False,
+        sort: bool = True,
+        case_sensitive: bool = True,
+    ) -> SearchResult:
+        """Find text within the published pages. Same arguments and results as HotPdf.find_text.
+
+        Raises:
+            ValueError: If the page number is invalid.
+
+        Returns:
+            SearchResult: A dictionary mapping page numbers to found text coordinates.
+        """
+        pages = pages or range(len(self.__pages))
+        for page_num in pages:
+            self.__check_page_number(page_num)
+        normalized_query = query if case_sensitive else query.lower()
+
+        found_page_map: SearchResult = defaultdict(PageResult)
+        for page_num in pages:
+            shared_page = self.__pages[page_num]
+            found_page_map[page_num] = []
+            for hot_characters in filter_adjacent_coords(*shared_page.find_text(query, case_sensitive)):
+                text = "".join(hc.value for hc in hot_characters)
+                if normalized_query not in (text if case_sensitive else text.lower()):
+                    continue
+                span_characters = shared_page.span_characters(hot_characters[0].span_id) if take_span else None
+                chars_to_append = span_characters or hot_characters
+                if sort:
+                    chars_to_append = sorted(chars_to_append, key=lambda ch: (ch.y, ch.x))
+                found_page_map[page_num].append(chars_to_append)
+            if sort:
+                found_page_map[page_num].sort(key=lambda element: (element[0].y, element[0].x))
+        return found_page_map
+
+    def extract_text(self, x0: int, y0: int, x1: int, y1: int, page: int = 0) -> str:
+        """Extract text from a bounding box on a page. Same arguments and result as HotPdf.extract_text.
+
+        Raises:
+            ValueError: If the coordinates are invalid.
+            ValueError: If the page number is invalid.
+
+        Returns:
+            str: Extracted text within the bounding box.
+        """
+        self.__check_coordinates(x0, y0, x1, y1)
+        self.__check_page_number(page)
+        return self.__pages[page].render(x0=math.floor(x0), x1=math.ceil(x1 + self.extraction_tolerance), y0=y0, y1=y1)
+
+    def extract_page_text(self, page: int) -> str:
+        """Extract the text of a page, like HotPdf.extract_page_text without segmentation.
+
+        Raises:
+            ValueError: If the page number is invalid.
+
+        Returns:
+            str: Extracted text from the page.
+        """
+        self.__check_page_number(page)
+        shared_page = self.__pages[page]
+        return shared_page.render(x0=0, x1=shared_page.width, y0=0, y1=shared_page.height)
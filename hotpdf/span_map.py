@@ -1,33 +1,75 @@
-from collections.abc import Iterable
-from typing import Union
-from uuid import UUID
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any, Optional, Union
 
-from .data.classes import HotCharacter, Span
+from .data.classes import ElementDimension, HotCharacter, Span
+from .exceptions.custom_exceptions import HotPdfFrozenError
 
 
 class SpanMap:
     """Hashmap to store spans and their child words for fast referencing
     and character grouping.
 
-    Keys are span_ids and values are Span objects.
+    Keys are span_ids and values are Span objects. A row index of the spans'
+    characters (row -> characters ordered by x) is built on first spatial query.
+
+    Spans are finalised once after loading: their characters are sorted and their text and
+    bounding box cached, and the spans are ordered by position. Reading them is then a lookup.
+    Spans inserted into afterwards are finalised again on the next read.
     """
 
     def __init__(self) -> None:
-        self.span_map: dict[UUID, Span] = dict()
+        self.span_map: dict[int, Span] = dict()
+        # Ids of the spans changed since the last finalise, and the spans ordered by (y0, x0) as of then.
+        self.__changed: set[int] = set()
+        self.__ordered: tuple[Span, ...] = ()
+        self.__rows: Optional[list[int]] = None
+        self.__row_characters: dict[int, list[HotCharacter]] = {}
+        self.__row_xs: dict[int, list[int]] = {}
+        # Guards finalising and building the row index, which queries may trigger concurrently.
+        self.__lock = threading.Lock()
+        self.frozen = False
 
     def __len__(self) -> int:
         return len(self.span_map)
 
-    def __getitem__(self, span_id: UUID) -> Union[Span, None]:
+    def __getstate__(self) -> dict[str, Any]:
+        # The row index is rebuilt on the first spatial query after unpickling, unless the map is frozen.
+        state = self.__dict__.copy()
+        del state["_SpanMap__lock"]
+        if not self.frozen:
+            state["_SpanMap__rows"] = None
+            state["_SpanMap__row_characters"] = {}
+            state["_SpanMap__row_xs"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def __getitem__(self, span_id: int) -> Union[Span, None]:
         return self.get_span(span_id)
 
-    def __setitem__(self, span_id: UUID, hot_character: HotCharacter) -> None:
+    def __setitem__(self, span_id: int, hot_character: HotCharacter) -> None:
         self.insert(span_id, hot_character)
 
-    def items(self) -> Iterable[tuple[UUID, Span]]:
+    def items(self) -> Iterable[tuple[int, Span]]:
         yield from self.span_map.items()
 
-    def insert(self, span_id: UUID, hot_character: HotCharacter) -> None:
+    def freeze(self) -> None:
+        """Finalise the spans and build the row index once, then make the map read-only.
+
+        Lookups on a frozen map never write to the spans, and further insertions raise HotPdfFrozenError.
+        """
+        self.finalise()
+        if self.__rows is None:
+            self.__build_row_index()
+        self.frozen = True
+
+    def insert(self, span_id: int, hot_character: HotCharacter) -> None:
+        if self.frozen:
+            raise HotPdfFrozenError("SpanMap is frozen")
         span = self.span_map.get(span_id)
         if not span:
             span = Span(
@@ -36,10 +78,126 @@ class SpanMap:
             )
         span.characters.append(hot_character)
         self.span_map[span_id] = span
+        self.__changed.add(span_id)
+        self.__rows = None
+
+    def insert_many(self, hot_characters: Iterable[HotCharacter]) -> None:
+        """Append HotCharacters to their spans (by span_id), creating the spans as needed.
+
+        Args:
+            hot_characters (Iterable[HotCharacter]): The HotCharacters to insert, in order.
+        """
+        if self.frozen:
+            raise HotPdfFrozenError("SpanMap is frozen")
+        spans = self.span_map
+        changed = self.__changed
+        for hot_character in hot_characters:
+            span = spans.get(hot_character.span_id)
+            if span is None:
+                span = spans[hot_character.span_id] = Span(characters=[], span_id=hot_character.span_id)
+            span.characters.append(hot_character)
+            changed.add(hot_character.span_id)
+        self.__rows = None
+
+    def finalise(self) -> None:
+        """Finalise the spans changed since the last call, and order all spans by position."""
+        if not self.__changed:
+            return
+        with self.__lock:
+            if not self.__changed:
+                return
+            for span_id in self.__changed:
+                self.span_map[span_id].finalise()
+            # Spans without characters have no position; they are left out of the order.
+            self.__ordered = tuple(
+                sorted(
+                    (span for span in self.span_map.values() if span.characters),
+                    key=lambda span: (span.characters[0].y, span.characters[0].x),
+                )
+            )
+            self.__changed.clear()
+
+    def spans(self, ordered: bool = True) -> Sequence[Span]:
+        """Get the finalised spans.
+
+        Args:
+            ordered (bool, optional): Order the spans by the row, then the column, of their first
+                character. Otherwise they are in insertion order. Defaults to True.
 
-    def get_span(self, span_id: UUID) -> Union[Span, None]:
+        Returns:
+            Sequence[Span]: the spans.
+        """
+        self.finalise()
+        return self.__ordered if ordered else tuple(self.span_map.values())
+
+    def get_span(self, span_id: int) -> Union[Span, None]:
         span = self.span_map.get(span_id)
         if not span:
             return None
-        span.characters = sorted(span.characters, key=lambda ch: (ch.y, ch.x))
+        if span_id in self.__changed:
+            self.finalise()
         return span
+
+    @property
+    def indexed_rows(self) -> Optional[int]:
+        """Number of rows in the row index, or None if it is not built."""
+        rows = self.__rows
+        return None if rows is None else len(rows)
+
+    def build_row_index(self) -> bool:
+        """Build the row index that row_characters and characters_in read, if it is not built yet.
+
+        Returns:
+            bool: True if this call built the index.
+        """
+        if self.__rows is not None:
+            return False
+        self.__build_row_index()
+        return True
+
+    def __build_row_index(self) -> list[int]:
+        with self.__lock:
+            if self.__rows is not None:
+                return self.__rows
+            row_characters: dict[int, list[HotCharacter]] = {}
+            for span in self.span_map.values():
+                for hot_character in span.characters:
+                    row_characters.setdefault(hot_character.y, []).append(hot_character)
+            for hot_characters in row_characters.values():
+                hot_characters.sort(key=lambda ch: ch.x)
+            self.__row_characters = row_characters
+            self.__row_xs = {
+                row_idx: [ch.x for ch in hot_characters] for row_idx, hot_characters in row_characters.items()
+            }
+            # Published last: queries that see the rows also see the index they refer to.
+            self.__rows = sorted(row_characters)
+            return self.__rows
+
+    def row_characters(self, row_idx: int) -> list[HotCharacter]:
+        """Get all characters on a row, ordered by x.
+
+        Args:
+            row_idx (int): row index.
+
+        Returns:
+            list[HotCharacter]: characters whose y is row_idx.
+        """
+        if self.__rows is None:
+            self.__build_row_index()
+        return self.__row_characters.get(row_idx, [])
+
+    def characters_in(self, region: ElementDimension) -> list[HotCharacter]:
+        """Get the characters starting inside a region, ordered by row then x.
+
+        Args:
+            region (ElementDimension): inclusive bounds on the characters' x and y.
+
+        Returns:
+            list[HotCharacter]: characters with x0 <= x <= x1 and y0 <= y <= y1.
+        """
+        rows = self.__rows if self.__rows is not None else self.__build_row_index()
+        found: list[HotCharacter] = []
+        for row_idx in rows[bisect_left(rows, region.y0) : bisect_right(rows, region.y1)]:
+            xs = self.__row_xs[row_idx]
+            found.extend(self.__row_characters[row_idx][bisect_left(xs, region.x0) : bisect_right(xs, region.x1)])
+        return found
@@ -2,6 +2,8 @@ from collections import defaultdict
 from collections.abc import Iterator
 from warnings import warn
 
+from .exceptions.custom_exceptions import HotPdfFrozenError
+
 
 class SparseMatrix:
     """2D representation of a PDF in plain text format.
@@ -14,11 +16,20 @@ class SparseMatrix:
         self.values: defaultdict[tuple[int, int], str] = defaultdict(str)
         self.rows = rows
         self.columns = columns
+        self.frozen = False
 
     def __getitem__(self, key: tuple[int, int]) -> str:
         row_idx, column_idx = key
         self.__check_indices(row_idx, column_idx)
-        return self.values[(row_idx, column_idx)]
+        return self.values.get((row_idx, column_idx), "")
+
+    def freeze(self) -> None:
+        """Make the matrix read-only. Further insertions raise HotPdfFrozenError."""
+        self.frozen = True
+
+    def __check_not_frozen(self) -> None:
+        if self.frozen:
+            raise HotPdfFrozenError("SparseMatrix is frozen")
 
     def __update_indices(self, row_idx: int, column_idx: int) -> None:
         if row_idx > self.rows:
@@ -31,6 +42,7 @@ class SparseMatrix:
             raise IndexError("Specified index is out of range")
 
     def __setitem__(self, key: tuple[int, int], value: str) -> None:
+        self.__check_not_frozen()
         row_idx, column_idx = key
         try:
             self.__check_indices(row_idx, column_idx)
@@ -46,6 +58,7 @@ class SparseMatrix:
         yield from self.values.items()
 
     def insert(self, value: str, row_idx: int, column_idx: int) -> None:
+        self.__check_not_frozen()
         self.__update_indices(row_idx, column_idx)
         try:
             self.__check_indices(row_idx, column_idx)
@@ -55,6 +68,22 @@ class SparseMatrix:
         if value:
             self.values[(row_idx, column_idx)] = value
 
+    def insert_row(self, row_idx: int, cells: dict[int, str]) -> None:
+        """Insert the cells of one row, in order. Same as calling insert for every cell, in one call.
+
+        Args:
+            row_idx (int): row index.
+            cells (dict[int, str]): values by column index.
+        """
+        self.__check_not_frozen()
+        values = self.values
+        for column_idx, value in cells.items():
+            self.__update_indices(row_idx, column_idx)
+            if row_idx < 0 or column_idx < 0:
+                warn("Index Error. Skipping insertion into SparseMatrix", stacklevel=1)
+            elif value:
+                values[(row_idx, column_idx)] = value
+
     def get(self, row_idx: int, column_idx: int) -> str:
         self.__check_indices(row_idx, column_idx)
-        return self.values[(row_idx, column_idx)]
+        return self.values.get((row_idx, column_idx), "")
@@ -1,6 +1,8 @@
 from collections import defaultdict
+from collections.abc import Iterable
 
 from .data.classes import HotCharacter, PageResult
+from .exceptions.custom_exceptions import HotPdfFrozenError
 
 
 class TrieNode:
@@ -21,6 +23,11 @@ class Trie:
     def __init__(self) -> None:
         """Initialize a Trie."""
         self.root = TrieNode()
+        self.frozen = False
+
+    def freeze(self) -> None:
+        """Make the trie read-only. Further insertions raise HotPdfFrozenError."""
+        self.frozen = True
 
     def insert(self, word: str, hot_character: HotCharacter) -> None:
         """Insert a word and a HotCharacter into the Trie.
@@ -29,11 +36,35 @@ class Trie:
             word (str): The word to insert.
             hot_character (HotCharacter): The HotCharacter to insert.
         """
+        if self.frozen:
+            raise HotPdfFrozenError("Trie is frozen")
         node: TrieNode = self.root
         for char in word:
             node = node.children[char]
         node.is_end_of_word = True
-        node.hot_characters = node.hot_characters + [hot_character]
+        node.hot_characters.append(hot_character)
+
+    def insert_many(self, hot_characters: Iterable[HotCharacter]) -> None:
+        """Insert HotCharacters under their values, walking the trie once per distinct value.
+
+        Args:
+            hot_characters (Iterable[HotCharacter]): The HotCharacters to insert, in order.
+        """
+        if self.frozen:
+            raise HotPdfFrozenError("Trie is frozen")
+        by_value: dict[str, list[HotCharacter]] = {}
+        for hot_character in hot_characters:
+            group = by_value.get(hot_character.value)
+            if group is None:
+                by_value[hot_character.value] = [hot_character]
+            else:
+                group.append(hot_character)
+        for value, group in by_value.items():
+            node: TrieNode = self.root
+            for char in value:
+                node = node.children[char]
+            node.is_end_of_word = True
+            node.hot_characters.extend(group)
 
     def search_all(self, text: str, case_sensitive: bool = True) -> tuple[list[str], PageResult]:
         """Search for words in the Trie that match a given text.
@@ -58,14 +58,22 @@ def filter_adjacent_coords(text: list[str], page_hot_character_occurences: PageR
     adjacent_groups = []
 
     anchor_hot_character_instances = page_hot_character_occurences[0]
+    # Neighbours lie on the reference character's row, so only scan that row's candidates (in their
+    # original order, so the first neighbour found is the same as scanning them all).
+    rows_by_position: list[dict[int, list[HotCharacter]]] = []
+    for coords_j in page_hot_character_occurences[1:]:
+        rows: dict[int, list[HotCharacter]] = {}
+        for hot_character in coords_j:
+            rows.setdefault(hot_character.y, []).append(hot_character)
+        rows_by_position.append(rows)
 
     for anchor_hot_character in anchor_hot_character_instances:
         neighbours = [anchor_hot_character]
         reference_hot_character = anchor_hot_character
-        for coords_j in page_hot_character_occurences[1:]:
+        for rows in rows_by_position:
             neighbour_hot_character = find_neighbour_coord(
                 reference_character=reference_hot_character,
-                hot_characters=coords_j,
+                hot_characters=rows.get(reference_hot_character.y, []),
             )
             if neighbour_hot_character:
                 neighbours.append(neighbour_hot_character)
@@ -0,0 +1,187 @@
+"""Load benchmark suite over synthetic PDFs.
+
+Measures load throughput (pages/s, glyphs/s), peak traced memory and the per-glyph cost of
+hotpdf's own build stage (excluding pdfminer) over scaling curves of page count, glyph density
+and column count, plus ligature and overlapping-glyph pages. Results are written as JSON and
+can be compared against a stored baseline:
+
+    python -m tests.benchmark_suite --output results.json --baseline tests/resources/benchmark_baseline.json
+
+The exit code is 1 when a scenario's throughput, build cost or peak memory regressed past the tolerance.
+Timings depend on the machine, so refresh the baseline with --output on the reference machine.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Optional
+
+from hotpdf import HotPdf
+from hotpdf.data.classes import PageStats
+from hotpdf.memory_map import MemoryMap
+from tests.pdf_generator import write_synthetic_pdf
+
+# Scenario name -> write_synthetic_pdf arguments.
+SCENARIOS: dict[str, dict[str, Any]] = {
+    **{f"pages-{pages}": {"pages": pages} for pages in (1, 10, 50)},
+    **{
+        f"density-{lines}x{chars}": {"pages": 10, "lines_per_page": lines, "chars_per_line": chars}
+        for lines, chars in ((10, 40), (40, 80), (80, 160))
+    },
+    **{f"columns-{columns}": {"pages": 10, "columns": columns, "chars_per_line": 40} for columns in (2, 4)},
+    "ligatures": {"pages": 10, "ligatures": True},
+    "overlap": {"pages": 10, "overlap": True},
+}
+
+
+def measure_load(file_name: str, repeat: int) -> tuple[float, int]:
+    """Load a file once untimed, so imports and first-use setup are not measured, then `repeat` times
+    and return the best wall time (s), then once more under tracemalloc and return its peak traced
+    memory (bytes)."""
+    HotPdf(file_name)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        HotPdf(file_name)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        HotPdf(file_name)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak_memory
+
+
+def measure_build(file_name: str, repeat: int) -> float:
+    """Parse a file's page layouts once, then build MemoryMaps from them `repeat` times and return
+    the best build cost per glyph (us). This isolates hotpdf's build stage from pdfminer."""
+    from pdfminer.high_level import extract_pages
+
+    layouts = list(extract_pages(file_name))
+    stats = PageStats()
+    for layout in layouts:
+        MemoryMap().load_memory_map(layout, stats=stats)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        for layout in layouts:
+            page = MemoryMap()
+            page.build_memory_map()
+            page.load_memory_map(layout)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6 / max(stats.glyphs, 1)
+
+
+def run_suite(
+    scenarios: Optional[dict[str, dict[str, Any]]] = None, repeat: int = 3, scale: float = 1.0
+) -> dict[str, Any]:
+    """Run the scenarios and return the machine-readable results.
+
+    Args:
+        scenarios (dict, optional): Scenario name -> write_synthetic_pdf arguments. Defaults to SCENARIOS.
+        repeat (int, optional): Timed loads per scenario; the best one is kept. Defaults to 3.
+        scale (float, optional): Multiplier of every scenario's page count, for quick runs. Defaults to 1.0.
+
+    Returns:
+        dict: Environment description and per-scenario results.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, layout in (scenarios or SCENARIOS).items():
+            layout = {**layout, "pages": max(1, round(layout.get("pages", 1) * scale))}
+            file_name = str(Path(directory) / f"{name}.pdf")
+            glyphs = write_synthetic_pdf(file_name, **layout)
+            seconds, peak_memory = measure_load(file_name, repeat)
+            build_us_per_glyph = measure_build(file_name, repeat)
+            results[name] = {
+                **layout,
+                "glyphs": glyphs,
+                "seconds": seconds,
+                "pages_per_second": layout["pages"] / seconds,
+                "glyphs_per_second": glyphs / seconds,
+                "peak_memory_bytes": peak_memory,
+                "build_us_per_glyph": build_us_per_glyph,
+            }
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], time_tolerance: float = 0.25, memory_tolerance: float = 0.1
+) -> list[str]:
+    """Compare results against a baseline.
+
+    Args:
+        current (dict): Results of run_suite.
+        baseline (dict): Stored results of run_suite.
+        time_tolerance (float, optional): Allowed relative throughput drop. Defaults to 0.25.
+        memory_tolerance (float, optional): Allowed relative peak memory growth. Defaults to 0.1.
+
+    Returns:
+        list[str]: One message per regression. Scenarios missing from either side are skipped.
+    """
+    regressions: list[str] = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        for metric in ("pages_per_second", "glyphs_per_second"):
+            if result[metric] < reference[metric] * (1 - time_tolerance):
+                regressions.append(f"{name}: {metric} {result[metric]:.1f} < baseline {reference[metric]:.1f}")
+        build_cost, reference_build_cost = result["build_us_per_glyph"], reference["build_us_per_glyph"]
+        if build_cost > reference_build_cost * (1 + time_tolerance):
+            regressions.append(f"{name}: build_us_per_glyph {build_cost:.2f} > baseline {reference_build_cost:.2f}")
+        if result["peak_memory_bytes"] > reference["peak_memory_bytes"] * (1 + memory_tolerance):
+            regressions.append(
+                f"{name}: peak_memory_bytes {result['peak_memory_bytes']} > baseline {reference['peak_memory_bytes']}"
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--repeat", type=int, default=3, help="timed loads per scenario (default: 3)")
+    parser.add_argument("--scale", type=float, default=1.0, help="page count multiplier (default: 1.0)")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="allowed throughput drop (default: 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="allowed memory growth (default: 0.1)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    args = parser.parse_args(argv)
+
+    scenarios = {name: SCENARIOS[name] for name in args.scenario} if args.scenario else SCENARIOS
+    current = run_suite(scenarios, repeat=args.repeat, scale=args.scale)
+    for name, result in current["results"].items():
+        print(
+            f"{name:<18} {result['pages']:>4} pages {result['glyphs']:>8} glyphs "
+            f"{result['pages_per_second']:>8.1f} pages/s {result['glyphs_per_second']:>10.0f} glyphs/s "
+            f"{result['peak_memory_bytes'] / 2**20:>8.1f} MiB peak {result['build_us_per_glyph']:>6.2f} us/glyph build"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(
+            current, json.loads(Path(args.baseline).read_text()), args.time_tolerance, args.memory_tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,25 @@
+import sys
+
 import pytest
 
 
+def _tracing():
+    """Whether a tracer such as coverage is running, which slows every call several times over."""
+    if sys.gettrace() is not None:
+        return True
+    monitoring = getattr(sys, "monitoring", None)
+    return monitoring is not None and monitoring.get_tool(monitoring.COVERAGE_ID) is not None
+
+
+def pytest_collection_modifyitems(config, items):
+    if not _tracing():
+        return
+    skip = pytest.mark.skip(reason="Wall-clock benchmark: a tracer such as coverage is running")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture()
 def valid_file_name():
     return "tests/resources/PDF.pdf"
@@ -0,0 +1,223 @@
+"""Dependency-free writer of synthetic PDF files for benchmarks.
+
+The files use the built-in Courier font, so every glyph is 0.6 em wide and the layout is known
+exactly: each page holds `lines_per_page` rows of `chars_per_line` glyphs in each of `columns`
+columns. Words come from a seeded generator, so the same arguments always write the same bytes.
+Repeated pages, like terms and conditions appended to every statement, draw identical content
+from their own content streams.
+"""
+
+import io
+import random
+import re
+from pathlib import Path
+from typing import BinaryIO, Union
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+MARGIN = 36
+COLUMN_GAP = 18
+# Courier glyphs are 600/1000 em wide, and rows are set at 120% of the font size.
+GLYPH_WIDTH_EM = 0.6
+LEADING_EM = 1.2
+# Shift of the second copy of every row when overlap is on, like fake-bold text.
+OVERLAP_SHIFT = 0.4
+
+# Font codes that the font's /Differences map to ligature glyphs.
+LIGATURES = {"fi": b"\\001", "fl": b"\\002"}
+WORDS = [
+    "account",
+    "balance",
+    "transfer",
+    "amount",
+    "invoice",
+    "date",
+    "total",
+    "payment",
+    "reference",
+    "customer",
+    "office",
+    "file",
+    "profit",
+    "flow",
+    "final",
+    "official",
+    "field",
+    "flat",
+    "figure",
+    "benefit",
+    "flexible",
+    "statement",
+    "period",
+    "credit",
+    "debit",
+    "opening",
+    "closing",
+]
+
+
+def _line_text(rng: random.Random, chars_per_line: int) -> str:
+    words: list[str] = []
+    length = -1
+    while length < chars_per_line:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars_per_line]
+
+
+def _encode(text: str, ligatures: bool) -> tuple[bytes, int]:
+    """Encode a row as a PDF string body and count the glyphs it draws."""
+    encoded = text.encode("ascii")
+    glyphs = len(text)
+    if ligatures:
+        for pair, code in LIGATURES.items():
+            glyphs -= text.count(pair)
+            encoded = encoded.replace(pair.encode("ascii"), code)
+    return encoded, glyphs
+
+
+def _page_content(
+    rng: random.Random,
+    lines_per_page: int,
+    chars_per_line: int,
+    columns: int,
+    ligatures: bool,
+    overlap: bool,
+) -> tuple[bytes, int]:
+    column_width = (PAGE_WIDTH - 2 * MARGIN - COLUMN_GAP * (columns - 1)) / columns
+    font_size = min(
+        10.0,
+        column_width / (chars_per_line * GLYPH_WIDTH_EM),
+        (PAGE_HEIGHT - 2 * MARGIN) / (lines_per_page * LEADING_EM),
+    )
+    operators = [b"BT /F1 %.3f Tf" % font_size]
+    glyphs = 0
+    for column in range(columns):
+        x = MARGIN + column * (column_width + COLUMN_GAP)
+        for line in range(lines_per_page):
+            y = PAGE_HEIGHT - MARGIN - (line + 1) * font_size * LEADING_EM
+            encoded, line_glyphs = _encode(_line_text(rng, chars_per_line), ligatures)
+            for shift in (0.0, OVERLAP_SHIFT) if overlap else (0.0,):
+                operators.append(b"1 0 0 1 %.3f %.3f Tm (%s) Tj" % (x + shift, y, encoded))
+                glyphs += line_glyphs
+    operators.append(b"ET")
+    return b"\n".join(operators), glyphs
+
+
+def write_synthetic_pdf(
+    destination: Union[str, Path, BinaryIO],
+    pages: int = 1,
+    lines_per_page: int = 40,
+    chars_per_line: int = 80,
+    columns: int = 1,
+    ligatures: bool = False,
+    overlap: bool = False,
+    seed: int = 0,
+    repeated_pages: int = 0,
+) -> int:
+    """Write a synthetic PDF.
+
+    Args:
+        destination (Union[str, Path, BinaryIO]): File path or binary stream to write to.
+        pages (int, optional): Number of pages. Defaults to 1.
+        lines_per_page (int, optional): Rows per column. Defaults to 40.
+        chars_per_line (int, optional): Characters per row. The font shrinks so rows fit their column. Defaults to 80.
+        columns (int, optional): Side-by-side text columns per page. Defaults to 1.
+        ligatures (bool, optional): Draw "fi" and "fl" as single ligature glyphs. Defaults to False.
+        overlap (bool, optional): Draw every row twice, slightly shifted. Defaults to False.
+        seed (int, optional): Seed of the word generator. Defaults to 0.
+        repeated_pages (int, optional): Identical pages appended after the others. Defaults to 0.
+
+    Returns:
+        int: Number of glyphs drawn.
+    """
+    if pages < 1 or lines_per_page < 1 or chars_per_line < 1 or columns < 1 or repeated_pages < 0:
+        raise ValueError("Invalid synthetic PDF layout")
+    rng = random.Random(seed)
+    font_id, pages_id = 3, 2
+    objects: dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: (
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding << /Type /Encoding "
+            b"/BaseEncoding /WinAnsiEncoding /Differences [1 /fi /fl] >> >>"
+        ),
+    }
+    page_ids: list[int] = []
+    total_glyphs = 0
+    repeated_content = _page_content(
+        random.Random(seed + 1), lines_per_page, chars_per_line, columns, ligatures, overlap
+    )
+    for page in range(pages + repeated_pages):
+        page_id, content_id = 4 + 2 * page, 5 + 2 * page
+        content, glyphs = (
+            _page_content(rng, lines_per_page, chars_per_line, columns, ligatures, overlap)
+            if page < pages
+            else repeated_content
+        )
+        total_glyphs += glyphs
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        objects[page_id] = b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R %s >>" % (
+            pages_id,
+            PAGE_WIDTH,
+            PAGE_HEIGHT,
+            content_id,
+            b"/Resources << /Font << /F1 %d 0 R >> >>" % font_id,
+        )
+        page_ids.append(page_id)
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    buffer = io.BytesIO()
+    buffer.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets: dict[int, int] = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = buffer.tell()
+        buffer.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id]))
+    xref_offset = buffer.tell()
+    buffer.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(offsets):
+        buffer.write(b"%010d 00000 n \n" % offsets[object_id])
+    buffer.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+
+    if isinstance(destination, (str, Path)):
+        Path(destination).write_bytes(buffer.getvalue())
+    else:
+        destination.write(buffer.getvalue())
+    return total_glyphs
+
+
+def append_page_update(file_name: Union[str, Path], page: int, text: str) -> None:
+    """Append an incremental update to a file written by write_synthetic_pdf that replaces the content
+    of one page with a single row of text, like a signing or annotation tool appending its changes.
+
+    Args:
+        file_name (Union[str, Path]): File to update in place.
+        page (int): Page to replace (0-indexed).
+        text (str): ASCII text of the new page content.
+    """
+    data = Path(file_name).read_bytes()
+    size = int(re.findall(rb"/Size (\d+)", data)[-1])
+    previous_xref = int(re.findall(rb"startxref\n(\d+)", data)[-1])
+    page_id, content_id = 4 + 2 * page, size
+    content = b"BT /F1 10 Tf 1 0 0 1 %d %d Tm (%s) Tj ET" % (MARGIN, PAGE_HEIGHT - MARGIN, text.encode("ascii"))
+    objects = {
+        page_id: b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R %s >>"
+        % (PAGE_WIDTH, PAGE_HEIGHT, content_id, b"/Resources << /Font << /F1 3 0 R >> >>"),
+        content_id: b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+    }
+    buffer = io.BytesIO()
+    buffer.write(b"\n")
+    offsets: dict[int, int] = {}
+    for object_id, body in objects.items():
+        offsets[object_id] = len(data) + buffer.tell()
+        buffer.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, body))
+    xref_offset = len(data) + buffer.tell()
+    buffer.write(b"xref\n")
+    for object_id in sorted(offsets):
+        buffer.write(b"%d 1\n%010d 00000 n \n" % (object_id, offsets[object_id]))
+    buffer.write(
+        b"trailer\n<< /Size %d /Root 1 0 R /Prev %d >>\nstartxref\n%d\n%%%%EOF\n"
+        % (size + 1, previous_xref, xref_offset)
+    )
+    Path(file_name).write_bytes(data + buffer.getvalue())
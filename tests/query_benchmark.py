@@ -0,0 +1,201 @@
+"""Query-latency benchmark harness.
+
+Loads the fixture PDFs (and a synthetic one) once, then replays a mixed query workload over
+them: find_text with common, rare and missing terms, case-insensitively and with take_span;
+find_matches; extract_text and extract_spans with small and page-sized bounding boxes; and
+segmented extract_page_text. Reports p50/p95/p99 latency and ops/s per API:
+
+    python -m tests.query_benchmark --output results.json --baseline tests/resources/query_benchmark_baseline.json
+
+The exit code is 1 when an API's p95 latency regressed past the tolerance.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+from hotpdf import HotPdf
+from tests.pdf_generator import write_synthetic_pdf
+
+FIXTURES = ("tests/resources/20pages.pdf", "tests/resources/hotpdf_bank.pdf", "tests/resources/doc_lt_figure.pdf")
+MISSING_TERM = "qzxj"
+SMALL_BBOX = (120, 20)
+
+Query = tuple[str, Callable[[], Any]]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))]
+
+
+def _terms(hotpdf: HotPdf) -> tuple[list[str], list[str]]:
+    """Pick the most frequent words of a document, and words that appear once."""
+    words = Counter(
+        word
+        for page in range(len(hotpdf.pages))
+        for word in hotpdf.extract_page_text(page).split()
+        if len(word) > 2 and word.isalnum()
+    )
+    ranked = [word for word, _ in words.most_common()]
+    return ranked[:5], [word for word in reversed(ranked) if words[word] == 1][:5]
+
+
+def _bboxes(hotpdf: HotPdf, page: int, rng: random.Random) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    width = max(hotpdf.pages[page].width, SMALL_BBOX[0] + 1)
+    height = max(hotpdf.pages[page].height, SMALL_BBOX[1] + 1)
+    x0 = rng.randrange(width - SMALL_BBOX[0])
+    y0 = rng.randrange(height - SMALL_BBOX[1])
+    return (x0, y0, x0 + SMALL_BBOX[0], y0 + SMALL_BBOX[1]), (0, 0, width, height)
+
+
+def build_workload(hotpdfs: list[HotPdf], queries_per_document: int = 200, seed: int = 0) -> list[Query]:
+    """Build a shuffled mixed query workload over loaded documents.
+
+    Args:
+        hotpdfs (list[HotPdf]): Loaded documents.
+        queries_per_document (int, optional): Queries per document. Defaults to 200.
+        seed (int, optional): Seed of the workload generator. Defaults to 0.
+
+    Returns:
+        list[Query]: (API name, call) pairs.
+    """
+    rng = random.Random(seed)
+    workload: list[Query] = []
+    for hotpdf in hotpdfs:
+        common, rare = _terms(hotpdf)
+        terms = common + rare + [MISSING_TERM]
+        for _ in range(queries_per_document):
+            page = rng.randrange(len(hotpdf.pages))
+            term = rng.choice(terms)
+            small, large = _bboxes(hotpdf, page, rng)
+            api = rng.choice((
+                "find_text",
+                "find_text_ignore_case",
+                "find_text_take_span",
+                "find_matches",
+                "extract_text_small",
+                "extract_text_large",
+                "extract_spans_small",
+                "extract_spans_large",
+                "extract_page_text_segment",
+            ))
+            call: Callable[[], Any] = {
+                "find_text": lambda h=hotpdf, t=term: h.find_text(t),
+                "find_text_ignore_case": lambda h=hotpdf, t=term: h.find_text(t.upper(), case_sensitive=False),
+                "find_text_take_span": lambda h=hotpdf, t=term: h.find_text(t, take_span=True),
+                "find_matches": lambda h=hotpdf, t=term: h.find_matches(t),
+                "extract_text_small": lambda h=hotpdf, b=small, p=page: h.extract_text(*b, page=p),
+                "extract_text_large": lambda h=hotpdf, b=large, p=page: h.extract_text(*b, page=p),
+                "extract_spans_small": lambda h=hotpdf, b=small, p=page: h.extract_spans(*b, page=p),
+                "extract_spans_large": lambda h=hotpdf, b=large, p=page: h.extract_spans(*b, page=p),
+                "extract_page_text_segment": lambda h=hotpdf, p=page: h.extract_page_text(p, segment=True),
+            }[api]
+            workload.append((api, call))
+    rng.shuffle(workload)
+    return workload
+
+
+def replay(workload: list[Query]) -> dict[str, dict[str, float]]:
+    """Run every query once untimed, to warm up caches and lazily built state, then once timed, and
+    report its API's latency percentiles (ms) and ops/s."""
+    for _, call in workload:
+        call()
+    latencies: defaultdict[str, list[float]] = defaultdict(list)
+    # Like timeit, collect first and keep the collector out of the timings.
+    gc.collect()
+    gc.disable()
+    try:
+        for api, call in workload:
+            start = time.perf_counter()
+            call()
+            latencies[api].append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    results: dict[str, dict[str, float]] = {}
+    for api, seconds in sorted(latencies.items()):
+        seconds.sort()
+        results[api] = {
+            "queries": len(seconds),
+            "p50_ms": percentile(seconds, 0.50) * 1000,
+            "p95_ms": percentile(seconds, 0.95) * 1000,
+            "p99_ms": percentile(seconds, 0.99) * 1000,
+            "ops_per_second": len(seconds) / sum(seconds),
+        }
+    return results
+
+
+def load_documents(directory: str) -> list[HotPdf]:
+    synthetic_file_name = str(Path(directory) / "synthetic.pdf")
+    write_synthetic_pdf(synthetic_file_name, pages=5, columns=2, chars_per_line=40)
+    return [HotPdf(file_name) for file_name in (*FIXTURES, synthetic_file_name)]
+
+
+def run_suite(queries_per_document: int = 200, seed: int = 0) -> dict[str, Any]:
+    """Load the documents once, replay the workload and return the machine-readable results."""
+    with tempfile.TemporaryDirectory() as directory:
+        hotpdfs = load_documents(directory)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "queries_per_document": queries_per_document,
+        "results": replay(build_workload(hotpdfs, queries_per_document, seed)),
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.5) -> list[str]:
+    """Compare p95 latencies against a baseline.
+
+    Args:
+        current (dict): Results of run_suite.
+        baseline (dict): Stored results of run_suite.
+        tolerance (float, optional): Allowed relative p95 latency growth. Defaults to 0.5.
+
+    Returns:
+        list[str]: One message per regression. APIs missing from either side are skipped.
+    """
+    regressions: list[str] = []
+    for api, result in current["results"].items():
+        reference = baseline["results"].get(api)
+        if reference is not None and result["p95_ms"] > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{api}: p95_ms {result['p95_ms']:.3f} > baseline {reference['p95_ms']:.3f}")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare the results against this JSON file")
+    parser.add_argument("--queries", type=int, default=200, help="queries per document (default: 200)")
+    parser.add_argument("--seed", type=int, default=0, help="workload seed (default: 0)")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed p95 latency growth (default: 0.5)")
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.queries, args.seed)
+    for api, result in current["results"].items():
+        print(
+            f"{api:<26} {result['queries']:>5} queries p50 {result['p50_ms']:>8.3f} ms p95 {result['p95_ms']:>8.3f} ms "
+            f"p99 {result['p99_ms']:>8.3f} ms {result['ops_per_second']:>10.0f} ops/s"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(current, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
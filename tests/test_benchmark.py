@@ -1,10 +1,19 @@
+import gc
+import json
 import math
+import subprocess
+import sys
 import time
 import tracemalloc
+from pathlib import Path
 
 import pytest
 
 from hotpdf import HotPdf
+from tests.benchmark_suite import SCENARIOS, compare, measure_build, run_suite
+from tests.pdf_generator import write_synthetic_pdf
+from tests.query_benchmark import compare as compare_queries
+from tests.query_benchmark import run_suite as run_query_suite
 
 
 def perform_speed_test(file_name, expected_processing_seconds):
@@ -16,13 +25,18 @@ def perform_speed_test(file_name, expected_processing_seconds):
     assert math.floor(elapsed) < expected_processing_seconds, "Benchmark time exceeded!"
 
 
-@pytest.mark.skip(reason="Need to perform benchmarks first for pdfminer")
 def perform_memory_test(file_name, expected_peak_memory):
+    # pdfminer is imported on the first load; load once untraced so the peak is the document's alone.
+    HotPdf(file_name)
+    gc.collect()
     tracemalloc.start()
-    hot_pdf_object = HotPdf()
-    hot_pdf_object.load(file_name)
-    peak_memory = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
-    tracemalloc.stop()
+    try:
+        hot_pdf_object = HotPdf()
+        hot_pdf_object.load(file_name)
+        peak_memory = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        # Stop tracing even if the load fails, or every later test runs under tracemalloc.
+        tracemalloc.stop()
     assert math.floor(peak_memory) <= expected_peak_memory, "Benchmark memory usage exceeded!"
 
 
@@ -31,7 +45,7 @@ def test_speed_benchmark_multiple_pages(multiple_pages_file_name):
 
 
 def test_memory_benchmark_multiple_pages(multiple_pages_file_name):
-    perform_memory_test(multiple_pages_file_name, 16)
+    perform_memory_test(multiple_pages_file_name, 12)
 
 
 def test_speed_luca_mock(mock_hotpdf_bank_file_name):
@@ -39,7 +53,7 @@ def test_speed_luca_mock(mock_hotpdf_bank_file_name):
 
 
 def test_memory_luca_mock(mock_hotpdf_bank_file_name):
-    perform_memory_test(mock_hotpdf_bank_file_name, 12.99)
+    perform_memory_test(mock_hotpdf_bank_file_name, 1)
 
 
 def test_speed_default_file(valid_file_name):
@@ -49,3 +63,104 @@ def test_speed_default_file(valid_file_name):
 @pytest.mark.skip(reason="Need to perform benchmarks first")
 def test_memory_default_file(valid_file_name):
     perform_memory_test(valid_file_name, 1)
+
+
+def measure_import_time(module):
+    """Run `python -X importtime -c "import <module>"` and return the module's cumulative import time (us)."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[-1].strip() == module:
+            return int(line.split("|")[1])
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_import_time_budget():
+    loaded = subprocess.run(
+        [sys.executable, "-c", "import sys, hotpdf; print(*sys.modules)"],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert not any(name.startswith("pdfminer") for name in loaded), "pdfminer imported eagerly!"
+    # Relative to pdfminer's own import on the same machine, so the budget holds on slow runners too.
+    hotpdf_import = min(measure_import_time("hotpdf") for _ in range(3))
+    pdfminer_import = min(measure_import_time("pdfminer.high_level") for _ in range(3))
+    assert hotpdf_import < pdfminer_import, "Import time budget exceeded!"
+
+
+@pytest.mark.benchmark
+def test_build_cost_per_glyph(tmp_path):
+    file_name = str(tmp_path / "pages-10.pdf")
+    write_synthetic_pdf(file_name, **SCENARIOS["pages-10"])
+    baseline = json.loads(Path(__file__).parent.joinpath("resources", "benchmark_baseline.json").read_text())
+    # Relative to the stored baseline, with room for slower machines and other Python versions.
+    reference = baseline["results"]["pages-10"]["build_us_per_glyph"]
+    assert measure_build(file_name, repeat=3) < reference * 1.5, "Build cost per glyph regressed!"
+
+
+def test_synthetic_pdf_generator(tmp_path):
+    file_name = tmp_path / "synthetic.pdf"
+    glyphs = write_synthetic_pdf(file_name, pages=3, lines_per_page=5, chars_per_line=20, columns=2, ligatures=True)
+    hot_pdf_object = HotPdf(str(file_name))
+    assert len(hot_pdf_object.pages) == 3
+    page_text = hot_pdf_object.extract_page_text(0)
+    assert len(page_text.splitlines()) == 5
+    assert "ﬁ" in page_text or "ﬂ" in page_text
+    assert glyphs == 3 * 5 * 2 * 20 - sum(
+        hot_pdf_object.extract_page_text(page).count(ligature) for page in range(3) for ligature in ("ﬁ", "ﬂ")
+    )
+
+
+def test_benchmark_suite_compare():
+    scenarios = {"pages-2": {"pages": 2, "lines_per_page": 5}, "overlap": {"pages": 1, "overlap": True}}
+    current = run_suite(scenarios, repeat=1)
+    assert set(current["results"]) == set(scenarios)
+    assert all(
+        result["glyphs_per_second"] > 0 and result["peak_memory_bytes"] > 0 for result in current["results"].values()
+    )
+    assert compare(current, current) == []
+    leaner = {"results": {"pages-2": {**current["results"]["pages-2"], "peak_memory_bytes": 1}}}
+    assert compare(leaner, current, memory_tolerance=0.1) == []
+    assert compare(current, leaner, memory_tolerance=0.1) == [
+        f"pages-2: peak_memory_bytes {current['results']['pages-2']['peak_memory_bytes']} > baseline 1"
+    ]
+
+
+# Loose p95 ceilings (ms) of the query workload, per API, far above the baseline: they only catch
+# pathological slowdowns. Regressions are gated relative to query_benchmark_baseline.json.
+QUERY_LATENCY_CEILINGS_MS = {
+    "find_text": 1000,
+    "find_text_ignore_case": 1000,
+    "find_text_take_span": 1000,
+    "find_matches": 1000,
+    "extract_text_small": 50,
+    "extract_text_large": 50,
+    "extract_spans_small": 50,
+    "extract_spans_large": 50,
+    "extract_page_text_segment": 100,
+}
+
+
+@pytest.mark.benchmark
+def test_query_latency_budget():
+    baseline = json.loads(Path(__file__).parent.joinpath("resources", "query_benchmark_baseline.json").read_text())
+    # The baseline's workload, so that the p95 latencies are comparable.
+    results = run_query_suite(queries_per_document=baseline["queries_per_document"])["results"]
+    assert set(results) == set(QUERY_LATENCY_CEILINGS_MS)
+    for api, result in results.items():
+        assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+        assert result["p95_ms"] < QUERY_LATENCY_CEILINGS_MS[api], f"{api} p95 latency ceiling exceeded!"
+    # p95 latencies may double before they count as a regression: slower machines, other Python versions.
+    assert compare_queries({"results": results}, baseline, tolerance=1.0) == []
+
+    slower = {"results": {"find_text": {**results["find_text"], "p95_ms": results["find_text"]["p95_ms"] * 2}}}
+    assert compare_queries(slower, {"results": results}, tolerance=0.5) == [
+        f"find_text: p95_ms {results['find_text']['p95_ms'] * 2:.3f} > baseline {results['find_text']['p95_ms']:.3f}"
+    ]
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from hotpdf import HotPdf
+from hotpdf.cli import main
+
+
+def run_cli(capsys, argv):
+    exit_code = main(argv)
+    return exit_code, [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+@pytest.mark.parametrize("options", [[], ["--dedupe-pages"], ["--timeout", "60", "--max-rss", "1024"]])
+def test_cli_text(capsys, multiple_pages_file_name, options):
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[1, 3])
+    exit_code, records = run_cli(capsys, ["text", multiple_pages_file_name, "--pages", "1,3", *options])
+    assert exit_code == 0
+    assert records == [
+        {
+            "file": multiple_pages_file_name,
+            "results": [
+                {"page": 1, "text": hotpdf_obj.extract_page_text(0)},
+                {"page": 3, "text": hotpdf_obj.extract_page_text(1)},
+            ],
+        }
+    ]
+
+
+def test_cli_find_directory(capsys, mock_hotpdf_bank_file_name):
+    exit_code, records = run_cli(capsys, ["find", "IBAN", "tests/resources", "--workers", "2"])
+    assert exit_code == 0
+    records_by_file = {record["file"]: record for record in records}
+    assert len(records_by_file) == 6
+    assert records_by_file[mock_hotpdf_bank_file_name]["results"] == [
+        {"page": 0, "text": "IBAN", "x0": 68, "y0": 175, "x1": 100, "y1": 175}
+    ]
+
+
+def test_cli_bbox_commands(capsys, mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name, laparams={"char_margin": 1.5})
+    laparam = ["--laparam", "char_margin=1.5"]
+
+    _, records = run_cli(capsys, ["extract-bbox", "0", "0", "300", "200", mock_hotpdf_bank_file_name, *laparam])
+    assert records[0]["results"] == [{"page": 0, "text": hotpdf_obj.extract_text(0, 0, 300, 200)}]
+
+    _, records = run_cli(capsys, ["spans", "0", "0", "300", "200", mock_hotpdf_bank_file_name, *laparam])
+    assert [result["text"] for result in records[0]["results"]] == [
+        span.to_text() for span in hotpdf_obj.extract_spans(0, 0, 300, 200)
+    ]
+
+
+@pytest.mark.parametrize("options", [[], ["--max-tasks-per-child", "1"]])
+def test_cli_reports_failed_files(capsys, non_existent_file_name, mock_hotpdf_bank_file_name, options):
+    exit_code, records = run_cli(capsys, ["text", non_existent_file_name, mock_hotpdf_bank_file_name, *options])
+    assert exit_code == 1
+    assert records[0]["error"].startswith("FileNotFoundError")
+    assert records[1]["results"]
+
+
+@pytest.mark.parametrize("argv", [["text", "--pages", "a-b", "x.pdf"], ["text", "--laparam", "char_margin", "x.pdf"]])
+def test_cli_invalid_arguments(argv):
+    with pytest.raises(SystemExit):
+        main(argv)
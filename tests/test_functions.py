@@ -1,11 +1,16 @@
+import io
 import shutil
 from uuid import uuid4
 
 import pytest
 
 from hotpdf import HotPdf
+from hotpdf.buffer_reader import BufferReader
 from hotpdf.data.classes import ElementDimension as El
 from hotpdf.data.classes import HotCharacter
+from hotpdf.exceptions.custom_exceptions import HotPdfFrozenError
+from hotpdf.line_map import LineMap
+from hotpdf.span_map import SpanMap
 from hotpdf.sparse_matrix import SparseMatrix
 from hotpdf.utils import filter_adjacent_coords, intersect, to_text
 
@@ -76,6 +81,20 @@ def test_sparse_matrix_iterator():
     assert non_empty_values == expected_result
 
 
+def test_sparse_matrix_reads_are_side_effect_free():
+    matrix = SparseMatrix(3, 3)
+    matrix.insert("A", 0, 0)
+    assert matrix.get(1, 1) == ""
+    assert matrix[2, 2] == ""
+    assert list(matrix) == [((0, 0), "A")]
+
+    matrix.freeze()
+    with pytest.raises(HotPdfFrozenError, match="SparseMatrix is frozen"):
+        matrix.insert("B", 1, 1)
+    with pytest.raises(HotPdfFrozenError, match="SparseMatrix is frozen"):
+        matrix[1, 1] = "B"
+
+
 @pytest.mark.parametrize(
     "bbox1, bbox2, expected",
     [
@@ -151,6 +170,26 @@ def test_span_map_get_span_none(valid_file_name):
     assert hotpdf_object.pages[0].span_map["xyz"] is None
 
 
+def test_span_map_finalises_spans():
+    span_map = SpanMap()
+    span_map.insert_many([
+        HotCharacter("b", 20, 5, 25, 1),
+        HotCharacter("a", 10, 5, 15, 1),
+        HotCharacter("c", 0, 2, 5, 2),
+    ])
+    span_map.finalise()
+    assert [span.span_id for span in span_map.spans()] == [2, 1]
+    assert [span.span_id for span in span_map.spans(ordered=False)] == [1, 2]
+    span = span_map[1]
+    assert span.to_text() == "ab"
+    assert span.get_element_dimension() is span.get_element_dimension()
+    assert span.get_element_dimension() == El(10, 5, 25, 5, 1)
+    # Inserting after finalising finalises the changed span again on the next read.
+    span_map[1] = HotCharacter("z", 0, 9, 5, 1)
+    assert span_map[1].to_text() == "abz"
+    assert [span.span_id for span in span_map.spans()] == [2, 1]
+
+
 @pytest.mark.skip(reason="Not implemented")
 def test_span_map_set_none_error(valid_file_name):
     # Setting non span object in spanmap should throw error
@@ -210,3 +249,42 @@ def test_single_character_glyph_is_not_split():
     assert len(chars) == 1
     assert chars[0].value == "o"
     assert (chars[0].x, chars[0].x_end) == (57, 62)
+
+
+def test_span_ids_are_page_local_integers(mock_hotpdf_bank_file_name):
+    first_load = HotPdf(mock_hotpdf_bank_file_name)
+    second_load = HotPdf(mock_hotpdf_bank_file_name)
+    span_ids = [span_id for span_id, _ in first_load.pages[0].span_map.items()]
+    assert all(isinstance(span_id, int) and span_id > 0 for span_id in span_ids)
+    assert span_ids == [span_id for span_id, _ in second_load.pages[0].span_map.items()]
+
+
+def test_line_map_region_queries():
+    matrix = SparseMatrix()
+    matrix.insert("A", 0, 0)
+    matrix.insert("B", 0, 5)
+    matrix.insert("C", 3, 2)
+    line_map = LineMap(matrix)
+    assert line_map.rows_in(El(0, 0, 10, 10)) == [0, 3]
+    assert line_map.rows_in(El(1, 0, 4, 10)) == [3]
+    assert line_map.columns_in(El(0, 0, 10, 2)) == [0, 5]
+    assert line_map.line(0, 1, 10) == "B"
+    assert line_map.render(El(0, 0, 10, 10)) == "AB\nC"
+    assert line_map.render(El(6, 0, 10, 10)) == ""
+
+
+def test_buffer_reader():
+    reader = BufferReader(bytearray(b"%PDF-1.7 hotpdf"))
+    assert reader.read(4) == b"%PDF"
+    assert reader.tell() == 4
+    assert reader.seek(-6, io.SEEK_END) == 9
+    assert reader.read() == b"hotpdf"
+    assert reader.read(10) == b""
+    reader.seek(1)
+    target = bytearray(3)
+    assert reader.readinto(target) == 3
+    assert target == b"PDF"
+    with pytest.raises(ValueError):
+        reader.seek(-1)
+    reader.close()
+    assert reader.closed
@@ -1,16 +1,28 @@
+import mmap
 import os
+import pickle
+import sys
+import threading
+import tracemalloc
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from pdfminer.pdfdocument import PDFPasswordIncorrect
 from pdfminer.pdfparser import PDFSyntaxError
 
-from hotpdf import HotPdf
+from hotpdf import HotPdf, processor
 from hotpdf.data.classes import ElementDimension
-from hotpdf.exceptions.custom_exceptions import HotPdfIsNoneError
+from hotpdf.exceptions.custom_exceptions import HotPdfFrozenError, HotPdfIsNoneError
 from hotpdf.memory_map import MemoryMap
-from hotpdf.utils import get_element_dimension
+from hotpdf.page_cache import PageCache
+from hotpdf.page_pool import PagePool
+from hotpdf.shared_store import SharedPdfStore
+from hotpdf.sparse_matrix import SparseMatrix
+from hotpdf.utils import get_element_dimension, to_text
+from tests.pdf_generator import append_page_update, write_synthetic_pdf
 
 
 def test_load(valid_file_name):
@@ -491,3 +503,453 @@ def test_extract_spans_pdfminer_y_preserved(valid_file_name):
     # extract from the bottom left of file
     spans = hot_pdf_object.extract_spans(x0=0, y0=0, x1=300, y1=200)
     assert "EMAIL" in spans[0].to_text()
+
+
+def test_segment_reuses_layout_blocks(multiple_pages_file_name):
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[0])
+    page = hotpdf_obj.pages[0]
+    segmented = hotpdf_obj.extract_page_text(page=0, segment=True)
+    with patch.object(MemoryMap, "_MemoryMap__xy_cut") as xy_cut:
+        assert hotpdf_obj.extract_page_text(page=0, segment=True) == segmented
+        # A bbox enclosing all of the page's text shares the page's block tree.
+        assert page.extract_text_from_bbox(0, page.width + 100, 0, page.height + 100, segment=True) == segmented
+        xy_cut.assert_not_called()
+
+
+def test_page_text_served_from_line_map(multiple_pages_file_name):
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[0])
+    page = hotpdf_obj.pages[0]
+    page_text = hotpdf_obj.extract_page_text(page=0)
+    line_map = page.line_map
+    with patch.object(SparseMatrix, "get") as matrix_get:
+        assert hotpdf_obj.extract_page_text(page=0) == page_text
+        assert "HOLY" in hotpdf_obj.extract_text(x0=0, y0=0, x1=page.width, y1=page.height)
+        matrix_get.assert_not_called()
+    assert page.line_map is line_map
+
+
+@pytest.mark.parametrize(
+    "label, direction, expected",
+    [
+        ("IBAN", "below", ["DE12345678910"]),
+        ("CLOSING BALANCE", "below", ["€ 1,000,000"]),
+        ("HOTPDF", "right", ["BANK"]),
+        ("§", "right", ["€ 1,200 | Paid Rent to Open Source"]),
+        ("ABOUT", "right", []),
+    ],
+)
+def test_find_value(mock_hotpdf_bank_file_name, label, direction, expected):
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name)
+    values = hotpdf_obj.find_value(label, direction=direction)
+    assert [to_text(value) for value in values[0]] == expected
+
+
+def test_find_value_max_distance(mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name)
+    # The IBAN sits 26 rows below its label.
+    assert hotpdf_obj.find_value("IBAN", direction="below", max_distance=10) == {0: []}
+    assert len(hotpdf_obj.find_value("IBAN", direction="below", max_distance=30)[0]) == 1
+
+
+def test_find_value_invalid_direction(mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name)
+    with pytest.raises(ValueError, match="Invalid direction"):
+        hotpdf_obj.find_value("IBAN", direction="above")
+
+
+def test_extract_tables(document_lt_figure_file_name):
+    hotpdf_obj = HotPdf(document_lt_figure_file_name)
+    tables = hotpdf_obj.extract_tables(page=0)
+    assert tables[0] == [
+        ["", "2014", "2013"],
+        ["Priemerný prepočítaný počet zamestnancov", "79", "65"],
+    ]
+    assert tables[-1] == [
+        ["", "absolútne", "v %", "v %", "v %"],
+        ["a", "b", "c", "d", "e"],
+        ["", "3 320", "100", "100", "-"],
+        ["Spolu", "3 320", "100", "100", "-"],
+    ]
+
+
+def test_extract_tables_bbox(document_lt_figure_file_name, mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(document_lt_figure_file_name)
+    tables = hotpdf_obj.extract_tables(page=0, bbox=ElementDimension(x0=0, y0=700, x1=600, y1=760))
+    assert len(tables) == 1
+    assert tables[0][1] == ["a", "b", "c", "d", "e"]
+
+    assert HotPdf(mock_hotpdf_bank_file_name).extract_tables(page=0) == []
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview, "mmap"])
+def test_load_buffer(mock_hotpdf_bank_file_name, buffer_type):
+    expected_text = HotPdf(mock_hotpdf_bank_file_name).extract_page_text(page=0)
+    with open(mock_hotpdf_bank_file_name, "rb") as f:
+        if buffer_type == "mmap":
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                assert HotPdf(mapped_file).extract_page_text(page=0) == expected_text
+        else:
+            assert HotPdf(buffer_type(f.read())).extract_page_text(page=0) == expected_text
+
+
+def test_load_path_like(mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(Path(mock_hotpdf_bank_file_name))
+    assert "HOTPDF BANK" in hotpdf_obj.extract_page_text(page=0)
+
+
+def test_load_memory_budget(multiple_pages_file_name):
+    unbounded = HotPdf(multiple_pages_file_name)
+    page_sizes = unbounded.page_memory_usage()
+    budget = 3 * max(page_sizes)
+    bounded = HotPdf(multiple_pages_file_name, max_memory_bytes=budget)
+
+    assert isinstance(bounded.pages, PagePool)
+    assert len(bounded.page_memory_usage()) == len(page_sizes)
+    assert bounded.pages.resident_bytes <= budget
+    assert not bounded.pages.is_resident(0)
+    assert bounded.extract_page_text(page=0) == unbounded.extract_page_text(page=0)
+    assert bounded.pages.is_resident(0)
+    assert bounded.find_text("Gen") == unbounded.find_text("Gen")
+    assert bounded.pages.resident_bytes <= budget
+
+
+def test_load_memory_budget_counts_lazy_indexes(multiple_pages_file_name):
+    unbounded = HotPdf(multiple_pages_file_name)
+    budget = int(1.2 * sum(unbounded.page_memory_usage()))
+    bounded = HotPdf(multiple_pages_file_name, max_memory_bytes=budget)
+    assert all(bounded.pages.is_resident(page) for page in range(len(bounded.pages)))
+    loaded_size = bounded.page_memory_usage()[0]
+    bounded.extract_page_text(0)
+    assert bounded.page_memory_usage()[0] > loaded_size
+
+    # Line maps, layouts and span row indexes built by queries grow the pages past the budget.
+    for hotpdf_obj in (unbounded, bounded):
+        for page in range(len(hotpdf_obj.pages)):
+            hotpdf_obj.extract_page_text(page, segment=True)
+            hotpdf_obj.extract_tables(page)
+    assert sum(unbounded.page_memory_usage()) > budget
+    assert bounded.pages.resident_bytes <= budget
+    assert not all(bounded.pages.is_resident(page) for page in range(len(bounded.pages)))
+    assert bounded.pages.resident_bytes == sum(
+        size for page, size in enumerate(bounded.page_memory_usage()) if bounded.pages.is_resident(page)
+    )
+
+
+def test_load_invalid_memory_budget(mock_hotpdf_bank_file_name):
+    with pytest.raises(ValueError, match="Invalid memory budget"):
+        HotPdf(mock_hotpdf_bank_file_name, max_memory_bytes=0)
+
+
+def test_load_more(multiple_pages_file_name):
+    full_load = HotPdf(multiple_pages_file_name)
+    with HotPdf(multiple_pages_file_name, page_numbers=[0], keep_open=True) as hotpdf_obj:
+        first_page = hotpdf_obj.pages[0]
+        hotpdf_obj.load_more([7, 5, 6])
+        hotpdf_obj.load_more([6, 3, 99])
+
+        assert hotpdf_obj.page_numbers == [0, 5, 6, 7, 3]
+        assert hotpdf_obj.pages[0] is first_page
+        for page, page_number in enumerate(hotpdf_obj.page_numbers):
+            assert hotpdf_obj.extract_page_text(page) == full_load.extract_page_text(page_number)
+
+    with pytest.raises(ValueError, match="no open document"):
+        hotpdf_obj.load_more([1])
+
+
+def test_load_more_without_keep_open(mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name)
+    assert hotpdf_obj.page_numbers == [0]
+    with pytest.raises(ValueError, match="no open document"):
+        hotpdf_obj.load_more([0])
+
+
+def test_load_profile(multiple_pages_file_name):
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[0, 2], profile=True, keep_open=True)
+    assert [stats.page_number for stats in hotpdf_obj.load_stats] == [0, 2]
+    for stats in hotpdf_obj.load_stats:
+        assert list(stats.stage_seconds) == ["interpret", "layout", "traverse", "sort", "place", "search", "spans"]
+        assert stats.total_seconds == pytest.approx(sum(stats.stage_seconds.values()))
+        assert stats.allocated_bytes is None
+
+    tracemalloc.start()
+    try:
+        hotpdf_obj.load_more([4])
+    finally:
+        tracemalloc.stop()
+        hotpdf_obj.close()
+    assert hotpdf_obj.load_stats[-1].page_number == 4
+    assert hotpdf_obj.load_stats[-1].peak_allocated_bytes > 0
+
+    page_stats = []
+    pages = processor.process(multiple_pages_file_name, page_numbers=[0, 2, 4], on_page_stats=page_stats.append)
+    assert [(stats.glyphs, stats.spans) for stats in page_stats] == [
+        (stats.glyphs, stats.spans) for stats in hotpdf_obj.load_stats
+    ]
+    assert len(pages) == 3
+    assert page_stats[0].glyphs >= page_stats[0].spans > 0
+    assert HotPdf(multiple_pages_file_name, page_numbers=[0]).load_stats == []
+
+
+@pytest.mark.parametrize("indexes", [set(), {"grid"}, {"search"}, {"spans"}, {"search", "spans"}])
+def test_load_selected_indexes(mock_hotpdf_bank_file_name, indexes):
+    expected = HotPdf(mock_hotpdf_bank_file_name)
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name, indexes=indexes)
+    assert hotpdf_obj.page_memory_usage()[0] < expected.page_memory_usage()[0]
+    unpickled_page = pickle.loads(pickle.dumps(hotpdf_obj.pages[0]))
+    assert unpickled_page.find_text("IBAN") == expected.pages[0].find_text("IBAN")
+
+    assert hotpdf_obj.find_text("IBAN", take_span=True) == expected.find_text("IBAN", take_span=True)
+    assert hotpdf_obj.extract_text(0, 0, 300, 200) == expected.extract_text(0, 0, 300, 200)
+    assert hotpdf_obj.extract_spans(0, 0, 300, 200) == expected.extract_spans(0, 0, 300, 200)
+    assert hotpdf_obj.extract_page_text(0, segment=True) == expected.extract_page_text(0, segment=True)
+    assert hotpdf_obj.extract_tables(0) == expected.extract_tables(0)
+    assert hotpdf_obj.page_memory_usage()[0] == pytest.approx(expected.page_memory_usage()[0], rel=0.05)
+
+
+def test_load_invalid_indexes(mock_hotpdf_bank_file_name):
+    with pytest.raises(ValueError, match="Invalid indexes"):
+        HotPdf(mock_hotpdf_bank_file_name, indexes={"grid", "trie"})
+
+
+def test_shared_store(multiple_pages_file_name):
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[0, 1, 2])
+    with SharedPdfStore.publish(hotpdf_obj) as store, SharedPdfStore.attach(store.name) as attached:
+        assert len(attached) == 3
+        assert attached.page_numbers == [0, 1, 2]
+        for page in range(3):
+            assert attached.extract_page_text(page) == hotpdf_obj.extract_page_text(page)
+            assert attached.extract_text(50, 100, 300, 400, page=page) == hotpdf_obj.extract_text(
+                50, 100, 300, 400, page=page
+            )
+        for query in ["LORD", "the", "xyz"]:
+            assert attached.find_text(query) == hotpdf_obj.find_text(query)
+            assert attached.find_text(query, take_span=True) == hotpdf_obj.find_text(query, take_span=True)
+        with pytest.raises(ValueError, match="Invalid page number"):
+            attached.extract_page_text(3)
+
+
+def test_freeze(mock_hotpdf_bank_file_name):
+    expected = HotPdf(mock_hotpdf_bank_file_name)
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name, keep_open=True)
+    hotpdf_obj.freeze(gc_freeze=False)
+    page = hotpdf_obj.pages[0]
+    frozen_state = pickle.dumps(page)
+
+    assert hotpdf_obj.find_text("IBAN", take_span=True) == expected.find_text("IBAN", take_span=True)
+    assert hotpdf_obj.extract_spans(0, 0, 500, 500) == expected.extract_spans(0, 0, 500, 500)
+    assert hotpdf_obj.extract_page_text(0, segment=True) == expected.extract_page_text(0, segment=True)
+    assert hotpdf_obj.extract_text(0, 0, 200, 200) == expected.extract_text(0, 0, 200, 200)
+    assert hotpdf_obj.find_value("IBAN", direction="below") == expected.find_value("IBAN", direction="below")
+    assert pickle.dumps(page) == frozen_state
+
+    with pytest.raises(HotPdfFrozenError, match="HotPdf object is frozen"):
+        hotpdf_obj.load_more([1])
+    with pytest.raises(HotPdfFrozenError, match="HotPdf object is frozen"):
+        hotpdf_obj.load(mock_hotpdf_bank_file_name)
+    with pytest.raises(HotPdfFrozenError, match="MemoryMap is frozen"):
+        page.build_memory_map()
+
+
+def test_freeze_memory_budget(mock_hotpdf_bank_file_name):
+    hotpdf_obj = HotPdf(mock_hotpdf_bank_file_name, max_memory_bytes=1)
+    with pytest.raises(ValueError, match="cannot be frozen"):
+        hotpdf_obj.freeze(gc_freeze=False)
+
+
+def test_page_cache(tmp_path, mock_hotpdf_bank_file_name):
+    file_name = str(tmp_path / "statement.pdf")
+    write_synthetic_pdf(file_name, pages=2, lines_per_page=5, repeated_pages=3)
+    expected = HotPdf(file_name)
+    page_cache = PageCache()
+    hotpdf_obj = HotPdf(file_name, page_cache=page_cache, profile=True)
+    assert hotpdf_obj.pages[2] is hotpdf_obj.pages[3] is hotpdf_obj.pages[4]
+    assert hotpdf_obj.pages[0] is not hotpdf_obj.pages[1]
+    assert hotpdf_obj.pages[2].frozen and not hotpdf_obj.pages[0].frozen
+    assert [stats.cached for stats in hotpdf_obj.load_stats] == [False, False, False, True, True]
+    assert len(page_cache) == 3 and (page_cache.hits, page_cache.misses) == (2, 3)
+    for page in range(5):
+        assert hotpdf_obj.extract_page_text(page) == expected.extract_page_text(page)
+    assert hotpdf_obj.find_text("account") == expected.find_text("account")
+
+    # A later load sharing the cache reuses every page, unless its settings change the parsed pages.
+    assert HotPdf(file_name, page_numbers=[0], page_cache=page_cache).pages[0] is hotpdf_obj.pages[0]
+    assert HotPdf(file_name, page_cache=page_cache, include_annotation_spaces=True).pages[0] is not hotpdf_obj.pages[0]
+    HotPdf(mock_hotpdf_bank_file_name, page_cache=page_cache)
+    assert len(page_cache) == 7
+
+    small_cache = PageCache(max_pages=1)
+    HotPdf(file_name, page_cache=small_cache)
+    assert len(small_cache) == 1
+    with pytest.raises(ValueError, match="Invalid cache size"):
+        PageCache(max_pages=0)
+
+
+def test_load_previous_version(tmp_path):
+    file_name = str(tmp_path / "signed.pdf")
+    write_synthetic_pdf(file_name, pages=3, lines_per_page=5)
+    first_version = HotPdf(file_name, page_cache=PageCache())
+    append_page_update(file_name, 1, "Signed by hotpdf")
+
+    hotpdf_obj = HotPdf(file_name, previous=first_version, profile=True)
+    assert [stats.cached for stats in hotpdf_obj.load_stats] == [True, False, True]
+    assert hotpdf_obj.pages[0] is first_version.pages[0] and hotpdf_obj.pages[2] is first_version.pages[2]
+    assert hotpdf_obj.extract_page_text(1) == "Signed by hotpdf\n"
+    expected = HotPdf(file_name)
+    for page in range(3):
+        assert hotpdf_obj.extract_page_text(page) == expected.extract_page_text(page)
+
+    # Reloading with different settings parses every page again.
+    reloaded = HotPdf(file_name, previous=hotpdf_obj, include_annotation_spaces=True, profile=True)
+    assert not any(stats.cached for stats in reloaded.load_stats)
+
+    # Pages loaded without a page cache have no fingerprints to compare.
+    with pytest.raises(ValueError, match="Invalid previous load"):
+        HotPdf(file_name, previous=expected)
+
+
+def test_concurrent_queries(multiple_pages_file_name):
+    expected = HotPdf(multiple_pages_file_name, page_numbers=[0, 1, 2, 3])
+    # Loaded without indexes, so the threads race to build them on first use.
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[0, 1, 2, 3], indexes=set())
+    queries = [
+        lambda h: h.find_text("the", take_span=True),
+        lambda h: h.find_value("LORD", pages=[1]),
+        lambda h: h.extract_text(50, 100, 300, 400, page=2),
+        lambda h: h.extract_spans(0, 0, 500, 500, page=3),
+        lambda h: [h.extract_page_text(page, segment=True) for page in range(4)],
+        lambda h: h.extract_tables(0),
+    ]
+    barrier = threading.Barrier(8)
+
+    def run(thread: int) -> list:
+        barrier.wait()
+        return [queries[(thread + i) % len(queries)](hotpdf_obj) for i in range(len(queries))]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, range(8)))
+    for thread, thread_results in enumerate(results):
+        for i, result in enumerate(thread_results):
+            assert result == queries[(thread + i) % len(queries)](expected)
+
+
+def test_query_workers(multiple_pages_file_name):
+    hotpdf_obj = HotPdf(multiple_pages_file_name, page_numbers=[0, 1, 2, 3])
+    assert hotpdf_obj.find_text("the", workers=4) == hotpdf_obj.find_text("the")
+    assert hotpdf_obj.find_text("LORD", pages=[2, 0, 2], workers=2) == hotpdf_obj.find_text("LORD", pages=[2, 0])
+    regions = [(50, 100, 300, 400, page) for page in range(4)] + [(0, 0, 100, 100, 1)]
+    assert hotpdf_obj.extract_text_many(regions, workers=3) == [hotpdf_obj.extract_text(*region) for region in regions]
+    with pytest.raises(ValueError, match="Invalid number of workers"):
+        hotpdf_obj.find_text("the", workers=0)
+    with pytest.raises(ValueError, match="Invalid page number"):
+        hotpdf_obj.extract_text_many([(0, 0, 10, 10, 4)], workers=2)
+
+
+@pytest.mark.parametrize("take_span", [False, True])
+@pytest.mark.parametrize("case_sensitive", [True, False])
+def test_find_matches(mock_hotpdf_bank_file_name, take_span, case_sensitive):
+    hot_pdf_object = HotPdf(mock_hotpdf_bank_file_name)
+    query = "IBAN" if case_sensitive else "iban"
+    occurences = hot_pdf_object.find_text(query, take_span=take_span, case_sensitive=case_sensitive)
+    matches = hot_pdf_object.find_matches(query, take_span=take_span, case_sensitive=case_sensitive)
+    assert matches
+    assert [(match.page, match.characters) for match in matches] == [
+        (page, hot_characters) for page, page_result in occurences.items() for hot_characters in page_result
+    ]
+    for match in matches:
+        dimension = get_element_dimension(match.characters)
+        assert match.get_element_dimension() == dimension
+        assert match.text == "".join(hot_character.value for hot_character in match.characters)
+        assert match.span_id == match.characters[0].span_id
+    assert hot_pdf_object.find_matches("IBAX") == []
+
+
+def test_to_arrays(multiple_pages_file_name):
+    hot_pdf_object = HotPdf(multiple_pages_file_name)
+    glyphs, spans = hot_pdf_object.to_arrays()
+    assert list(glyphs) == ["page", "char", "x", "y", "x_end", "span_id"]
+    assert list(spans) == ["page", "span_id", "text", "x0", "y0", "x1", "y1"]
+    expected_glyphs, expected_spans = [], []
+    for page_index, page in enumerate(hot_pdf_object.pages):
+        for span in page.span_map.spans():
+            dimension = span.get_element_dimension()
+            expected_spans.append((
+                page_index,
+                span.span_id,
+                span.to_text(),
+                dimension.x0,
+                dimension.y0,
+                dimension.x1,
+                dimension.y1,
+            ))
+            expected_glyphs.extend((page_index, ch.value, ch.x, ch.y, ch.x_end, ch.span_id) for ch in span.characters)
+    assert list(zip(*glyphs.values())) == expected_glyphs
+    assert list(zip(*spans.values())) == expected_spans
+    assert memoryview(glyphs["x"]).format == "q"
+
+    glyphs, spans = hot_pdf_object.to_arrays(pages=[1])
+    assert set(glyphs["page"]) == set(spans["page"]) == {1}
+    assert "".join(spans["text"]) == "".join(span.to_text() for span in hot_pdf_object.pages[1].span_map.spans())
+    with pytest.raises(ValueError, match="Invalid page number"):
+        hot_pdf_object.to_arrays(pages=[len(hot_pdf_object.pages)])
+
+
+def test_to_arrow(mock_hotpdf_bank_file_name):
+    hot_pdf_object = HotPdf(mock_hotpdf_bank_file_name)
+    with patch.dict(sys.modules, {"pyarrow": None}), pytest.raises(ImportError, match="requires pyarrow"):
+        hot_pdf_object.to_arrow()
+    pytest.importorskip("pyarrow")
+    glyph_table, span_table = hot_pdf_object.to_arrow()
+    glyphs, spans = hot_pdf_object.to_arrays()
+    assert glyph_table.to_pydict() == {name: list(column) for name, column in glyphs.items()}
+    assert span_table.to_pydict() == {name: list(column) for name, column in spans.items()}
+
+
+@pytest.mark.parametrize("prefetch_process", [False, True])
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_iter_process_prefetch(multiple_pages_file_name, prefetch, prefetch_process):
+    expected = [
+        page.extract_text_from_bbox(0, 0, page.width, page.height)
+        for page in processor.iter_process(multiple_pages_file_name, page_numbers=[0, 2, 4, 6])
+    ]
+    parsed, ahead = [], []
+    pages = processor.iter_process(
+        multiple_pages_file_name,
+        page_numbers=[0, 2, 4, 6],
+        on_page_stats=parsed.append,
+        prefetch=prefetch,
+        prefetch_process=prefetch_process,
+    )
+    texts = []
+    for page in pages:
+        texts.append(page.extract_text_from_bbox(0, 0, page.width, page.height))
+        ahead.append(len(parsed) - len(texts))
+    assert texts == expected
+    assert [stats.page_number for stats in parsed] == [0, 2, 4, 6]
+    # At most prefetch pages wait for the caller, plus the one the worker built last and is waiting to hand over.
+    assert max(ahead) <= prefetch + 1
+
+    pages = processor.iter_process(multiple_pages_file_name, prefetch=prefetch, prefetch_process=prefetch_process)
+    next(pages)
+    pages.close()
+    assert not any(thread.name == "hotpdf-prefetch" for thread in threading.enumerate())
+
+
+@pytest.mark.parametrize("prefetch_process", [False, True])
+def test_iter_process_prefetch_errors(non_existent_file_name, mock_hotpdf_bank_file_name, prefetch_process):
+    with pytest.raises(FileNotFoundError):
+        list(processor.iter_process(non_existent_file_name, prefetch=2, prefetch_process=prefetch_process))
+    with pytest.raises(ValueError, match="Invalid prefetch window"):
+        list(processor.iter_process(mock_hotpdf_bank_file_name, prefetch=-1, prefetch_process=prefetch_process))
+
+
+def test_iter_process_prefetch_process_options(mock_hotpdf_bank_file_name):
+    with pytest.raises(ValueError, match="Invalid prefetch"):
+        list(
+            processor.iter_process(
+                mock_hotpdf_bank_file_name, page_cache=PageCache(), prefetch=1, prefetch_process=True
+            )
+        )
+    with open(mock_hotpdf_bank_file_name, "rb") as pdf_file, pytest.raises(ValueError, match="Invalid source"):
+        list(processor.iter_process(pdf_file, prefetch=1, prefetch_process=True))
+    with open(mock_hotpdf_bank_file_name, "rb") as pdf_file:
+        assert len(list(processor.iter_process(pdf_file.read(), prefetch=1, prefetch_process=True))) == 1
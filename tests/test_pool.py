@@ -0,0 +1,99 @@
+import os
+import time
+from operator import methodcaller
+
+import pytest
+
+from hotpdf import HotPdf
+from hotpdf.pool import DocumentPool
+
+
+def page_count(hotpdf):
+    return len(hotpdf.pages)
+
+
+def process_id(hotpdf):
+    return os.getpid()
+
+
+def sleep(hotpdf):
+    time.sleep(60)
+
+
+def allocate(hotpdf):
+    ballast = b"x" * (200 << 20)
+    time.sleep(60)
+    return len(ballast)
+
+
+def crash(hotpdf):
+    os._exit(3)
+
+
+def unpicklable(hotpdf):
+    return lambda: None
+
+
+def test_pool_map(multiple_pages_file_name, mock_hotpdf_bank_file_name, non_existent_file_name):
+    sources = [multiple_pages_file_name, non_existent_file_name, mock_hotpdf_bank_file_name]
+    with DocumentPool(workers=2) as pool:
+        results = list(pool.map(page_count, sources))
+        assert [result.source for result in results] == sources
+        assert [result.index for result in results] == [0, 1, 2]
+        assert results[0].ok and results[0].value == len(HotPdf(multiple_pages_file_name).pages)
+        assert not results[1].ok and results[1].failure == "error"
+        assert results[1].error.startswith("FileNotFoundError")
+        assert results[2].value == 1
+
+        unordered = list(pool.map(page_count, sources, ordered=False))
+        assert sorted(result.index for result in unordered) == [0, 1, 2]
+
+        result = pool.run(methodcaller("extract_page_text", 0), mock_hotpdf_bank_file_name, {"page_numbers": [0]})
+        assert result.value == HotPdf(mock_hotpdf_bank_file_name).extract_page_text(0)
+        assert pool.run(unpicklable, mock_hotpdf_bank_file_name).failure == "error"
+
+
+@pytest.mark.parametrize(
+    "task, options, failure",
+    [(sleep, {"timeout": 1}, "timeout"), (allocate, {"max_rss_bytes": 100 << 20}, "memory"), (crash, {}, "crashed")],
+)
+def test_pool_failures(mock_hotpdf_bank_file_name, task, options, failure):
+    with DocumentPool(workers=1, **options) as pool:
+        result = pool.run(task, mock_hotpdf_bank_file_name)
+        assert not result.ok and result.failure == failure and result.value is None
+        # The worker was replaced, so the next document still runs.
+        assert pool.run(page_count, mock_hotpdf_bank_file_name).value == 1
+
+
+def test_pool_replaces_exited_idle_worker(mock_hotpdf_bank_file_name):
+    with DocumentPool(workers=1) as pool:
+        first = pool.run(process_id, mock_hotpdf_bank_file_name).value
+        # Workers can exit while idle (over the memory cap, or at their task limit).
+        (worker,) = pool._DocumentPool__workers
+        worker.process.kill()
+        worker.process.join()
+        results = list(pool.map(process_id, [mock_hotpdf_bank_file_name] * 2))
+        assert all(result.ok for result in results)
+        assert first not in {result.value for result in results}
+
+
+def test_pool_max_tasks_per_child(mock_hotpdf_bank_file_name):
+    with DocumentPool(workers=1, max_tasks_per_child=1) as pool:
+        results = list(pool.map(process_id, [mock_hotpdf_bank_file_name] * 3))
+    assert len({result.value for result in results}) == 3
+    with DocumentPool(workers=1) as pool:
+        results = list(pool.map(process_id, [mock_hotpdf_bank_file_name] * 3))
+    assert len({result.value for result in results}) == 1
+
+
+@pytest.mark.parametrize("options", [{"workers": 0}, {"timeout": 0}, {"max_rss_bytes": -1}, {"max_tasks_per_child": 0}])
+def test_pool_invalid_options(options):
+    with pytest.raises(ValueError, match="Invalid"):
+        DocumentPool(**options)
+
+
+def test_pool_closed(mock_hotpdf_bank_file_name):
+    pool = DocumentPool(workers=1)
+    pool.close()
+    with pytest.raises(ValueError, match="Invalid operation"):
+        pool.run(page_count, mock_hotpdf_bank_file_name)